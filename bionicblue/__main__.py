@@ -21,6 +21,8 @@ from .pygamesetup import SERVICES_NS, switch_mode
 
 from .pygamesetup.gamepaddirect import setup_gamepad_if_existent
 
+from .instrumentation import TIMERS_NS
+
 from .states import setup_states
 
 from .exceptions import (
@@ -52,9 +54,19 @@ def run_game():
 
                 SERVICES_NS.frame_checkups()
 
+                TIMERS_NS.start('control')
                 state.control()
+                TIMERS_NS.stop('control')
+
+                TIMERS_NS.start('update')
                 state.update()
+                TIMERS_NS.stop('update')
+
+                TIMERS_NS.start('draw')
                 state.draw()
+                TIMERS_NS.stop('draw')
+
+                TIMERS_NS.end_frame()
 
         except SwitchStateException as obj:
             state = obj.state
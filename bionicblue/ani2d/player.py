@@ -1,10 +1,12 @@
 
 ### standard library imports
 
-from copy import deepcopy
-
 from itertools import chain, cycle
 
+from functools import reduce
+
+from math import gcd
+
 
 ### third-party imports
 
@@ -15,9 +17,9 @@ from pygame.math import Vector2
 
 ### local imports
 
-from ..config import ANIM_DATA_MAP
+from ..config import ANIM_DATA_MAP, USE_ANIMATION_FRAME_TABLES
 
-from ..pygamesetup.constants import blit_on_screen
+from ..pygamesetup.constants import GENERAL_NS, blit_on_screen
 
 
 
@@ -25,6 +27,14 @@ DEFAULT_CYCLE_VALUES = ('default',)
 GET_DEFAULT = cycle(DEFAULT_CYCLE_VALUES).__next__
 
 
+def get_lcm(a, b):
+    """Return least common multiple of two positive integers.
+
+    Used instead of math.lcm(), which requires Python 3.9.
+    """
+    return a * b // gcd(a, b)
+
+
 
 class AnimationPlayer2D:
 
@@ -35,23 +45,55 @@ class AnimationPlayer2D:
         anim_name,
         pos_name='topleft',
         pos_value=(0, 0),
+        blit_surface=blit_on_screen,
+        use_frame_tables=USE_ANIMATION_FRAME_TABLES,
+        shared_clock=False,
     ):
 
         self.obj = obj
+        self.blit_surface = blit_surface
 
         anim_data = ANIM_DATA_MAP[anim_data_key]
+        anim_data['players'].add(self)
 
         self.structure = anim_data['structure']
         self.blending = anim_data['blending']
         self.values = anim_data['values']
         self.root_pos_exchange_map = anim_data['root_pos_exchange_map']
-        self.timing = deepcopy(anim_data['timing'])
+
+        ### timing data (tuples of surface/position indices) is never
+        ### changed, so it is shared by all players of the animation;
+        ### each player only counts the frames played, from which the
+        ### current indices are obtained
+        self.timing = anim_data['timing']
+        self.frame_count = 0
+
+        ### frame tables are shared as well; they are compiled the
+        ### first time each animation is drawn with each surface
+        ### version (see compile_frame_table())
+        self.all_frame_tables = anim_data['frame_tables']
+
+        ### whether the player draws the frames of a clock shared with
+        ### other players of the same animation, whenever its surfaces
+        ### cycle normally (see join_shared_clock())
+
+        self.uses_shared_clock = shared_clock
+        self.all_shared_clocks = anim_data['shared_clocks']
+        self.shared_clock = None
+
+        ### if frame tables aren't used, each object of the animation
+        ### is positioned and drawn on its own every frame
+
+        if not use_frame_tables:
+
+            self.walk_and_draw = self.walk_objects_and_draw
+            self.no_walk_draw = self.no_walk_objects_draw
 
         self.walking_data = []
         self.drawing_methods = []
 
         self.object_map = {
-            obj_name : AnimationObject2D(obj_data)
+            obj_name : AnimationObject2D(obj_data, blit_surface)
             for obj_name, obj_data in anim_data['objects'].items()
         }
 
@@ -73,8 +115,8 @@ class AnimationPlayer2D:
         ###
         self.anim_name = anim_name
 
-        ###
-        self.clear_rotations()
+        ### play animation from its beginning
+        self.frame_count = 0
 
         ###
         self.set_structure()
@@ -89,11 +131,15 @@ class AnimationPlayer2D:
         ###
         self.draw = self.no_walk_draw
 
-    def clear_rotations(self):
+        ###
+
+        self.shared_clock = None
 
-        for obj_timing in self.timing[self.anim_name].values():
-            for key in ('surface_indices', 'position_indices'):
-                obj_timing[key].restore_walking()
+        if (
+            self.uses_shared_clock
+            and self.cycle_values is DEFAULT_CYCLE_VALUES
+        ):
+            self.join_shared_clock()
 
     def set_structure(self):
 
@@ -134,6 +180,11 @@ class AnimationPlayer2D:
 
         for obj_name in self.updating_order:
 
+            obj_timing = anim_timing[obj_name]
+
+            surface_indices = obj_timing['surface_indices']
+            position_indices = obj_timing['position_indices']
+
             walking_data.append(
 
                 (
@@ -141,31 +192,33 @@ class AnimationPlayer2D:
                   obmap[obj_name],
 
                   anim_values[obj_name]['surface_collections_map'],
-                  anim_timing[obj_name]['surface_indices'],
+                  surface_indices,
+                  len(surface_indices),
 
                   anim_values[obj_name]['positions'],
-                  anim_timing[obj_name]['position_indices'],
+                  position_indices,
+                  len(position_indices),
 
                 )
 
             )
 
-        ###
+        ### the length of the longest sequence of indices is used to
+        ### tell how many times the animation looped
 
-        self.main_timing = max(
+        self.main_length = max(
 
             chain.from_iterable(
 
                 (
-                    (surface_indices, position_indices)
-                    for _, _, surface_indices, _, position_indices,
+                    (no_of_surface_indices, no_of_position_indices)
+                    for _, _, _, no_of_surface_indices,
+                    _, _, no_of_position_indices,
                     in walking_data
                 ),
 
             ),
 
-            key = lambda indices: len(indices)
-
         )
 
         ###
@@ -178,6 +231,12 @@ class AnimationPlayer2D:
             for obj_name in self.drawing_order
         )
 
+        ### frame tables of the animation, by surface version
+
+        self.frame_tables = (
+            self.all_frame_tables.setdefault(anim_name, {})
+        )
+
     def exchange_root_pos(self, previous_root, new_root):
 
         exchange_map = self.root_pos_exchange_map
@@ -217,56 +276,275 @@ class AnimationPlayer2D:
         self.cycle_values = DEFAULT_CYCLE_VALUES
         self.next_surf_version = GET_DEFAULT
 
+        if self.uses_shared_clock:
+            self.join_shared_clock()
+
     def set_custom_surface_cycling(self, cycle_values):
 
+        ### surfaces cycling differently from other players can't be
+        ### drawn from the shared clock
+
+        if self.shared_clock is not None:
+            self.leave_shared_clock()
+
         self.cycle_values = cycle_values
         self.next_surf_version = cycle(cycle_values).__next__
 
+    def join_shared_clock(self):
+        """Draw frames of clock shared by players of the animation.
+
+        The clock of the current animation is created by the first
+        player joining it. While in the clock, the player doesn't
+        advance its own frame count, so this is only meant for
+        animations whose progress isn't checked, like the looping
+        animations of enemies.
+        """
+        anim_name = self.anim_name
+
+        try:
+            clock = self.all_shared_clocks[anim_name]
+
+        except KeyError:
+
+            version = DEFAULT_CYCLE_VALUES[0]
+
+            try:
+                frame_table = self.frame_tables[version]
+
+            except KeyError:
+                frame_table = self.compile_frame_table(version)
+
+            clock = self.all_shared_clocks[anim_name] = (
+                SharedAnimationClock(frame_table)
+            )
+
+        self.shared_clock = clock
+        self.draw = self.draw_shared_frame
+
+    def leave_shared_clock(self):
+        """Go back to drawing frames from own frame count."""
+
+        ### keep playing from the frame last shown by the clock
+        self.frame_count = self.shared_clock.frame_count
+
+        self.shared_clock = None
+        self.draw = self.walk_and_draw
+
+    def peek_loops_no(self, steps):
+        """Return number of loops played after given number of steps.
+
+        That is, how many times the longest sequence of indices of
+        the animation would have been played if the animation
+        advanced the given number of frames; the result isn't
+        rounded, so it is a whole number only at the end of a loop.
+        """
+        return (self.frame_count + steps) / self.main_length
+
+    def get_main_index(self):
+        """Return current index in longest sequence of indices."""
+        return self.frame_count % self.main_length
+
+    def compile_frame_table(self, version):
+        """Compile, store and return frame table for surface version.
+
+        The table has an item for each frame of the current
+        animation, up to the point where the sequences of indices
+        of all objects loop together. Each item is a tuple with a
+        (surface, offset) pair for each object in drawing order,
+        the offset being the position where the surface is blitted
+        relative to the topleft of the root object.
+
+        The objects are positioned in each frame just like when
+        drawing them directly, with the root at the origin. The
+        result is the same wherever the root is, since offsets
+        of objects and their art are truncated to integers.
+        """
+        obmap = self.object_map
+        drawing_objects = [obmap[obj_name] for obj_name in self.drawing_order]
+
+        ### position root at the origin while compiling, so its
+        ### position can be restored afterwards
+
+        root_rect = self.root.rect
+        root_pos = root_rect.topleft
+        root_rect.topleft = (0, 0)
+
+        no_of_frames = reduce(
+
+            get_lcm,
+
+            chain.from_iterable(
+
+                (
+                    (no_of_surface_indices, no_of_position_indices)
+                    for _, _, _, no_of_surface_indices,
+                    _, _, no_of_position_indices,
+                    in self.walking_data
+                ),
+
+            ),
+
+            1,
+
+        )
+
+        frame_table = []
+
+        for frame_index in range(no_of_frames):
+
+            for (
+
+                obj,
+
+                surface_collections_map,
+                surface_indices,
+                no_of_surface_indices,
+
+                positions,
+                position_indices,
+                no_of_position_indices,
+
+            ) in self.walking_data:
+
+                obj.image = surface_collections_map[version][
+                    surface_indices[frame_index % no_of_surface_indices]
+                ]
+
+                obj.set_pos(
+                    positions[
+                        position_indices[frame_index % no_of_position_indices]
+                    ]
+                )
+
+            frame_table.append(
+                tuple(
+                    (obj.image, obj.art_rect.topleft)
+                    for obj in drawing_objects
+                )
+            )
+
+        root_rect.topleft = root_pos
+
+        frame_table = self.frame_tables[version] = tuple(frame_table)
+
+        return frame_table
+
     def walk_and_draw(self):
 
         version = self.next_surf_version()
 
+        self.frame_count = frame_count = self.frame_count + 1
+
+        try:
+            frame_table = self.frame_tables[version]
+
+        except KeyError:
+            frame_table = self.compile_frame_table(version)
+
+        root_rect = self.root.rect
+        blit_surface = self.blit_surface
+
+        for surface, offset in frame_table[frame_count % len(frame_table)]:
+            blit_surface(surface, root_rect.move(offset))
+
+    def no_walk_draw(self):
+
+        version = self.next_surf_version()
+
+        try:
+            frame_table = self.frame_tables[version]
+
+        except KeyError:
+            frame_table = self.compile_frame_table(version)
+
+        root_rect = self.root.rect
+        blit_surface = self.blit_surface
+
+        for surface, offset in frame_table[self.frame_count % len(frame_table)]:
+            blit_surface(surface, root_rect.move(offset))
+
+        ###
+        self.draw = self.walk_and_draw
+
+    def draw_shared_frame(self):
+
+        clock = self.shared_clock
+
+        ### only the first player drawn in each game frame advances
+        ### the clock
+
+        if clock.last_frame_index != GENERAL_NS.frame_index:
+            clock.advance()
+
+        root_rect = self.root.rect
+        blit_surface = self.blit_surface
+
+        for surface, offset in clock.frame:
+            blit_surface(surface, root_rect.move(offset))
+
+    def walk_objects_and_draw(self):
+
+        version = self.next_surf_version()
+
+        self.frame_count = frame_count = self.frame_count + 1
+
         for (
 
             obj,
 
             surface_collections_map,
             surface_indices,
+            no_of_surface_indices,
 
             positions,
             position_indices,
+            no_of_position_indices,
 
         ) in self.walking_data:
 
-            surface_indices.walk(1)
-            obj.image = surface_collections_map[version][surface_indices[0]]
+            obj.image = surface_collections_map[version][
+                surface_indices[frame_count % no_of_surface_indices]
+            ]
 
-            position_indices.walk(1)
-            obj.set_pos(positions[position_indices[0]])
+            obj.set_pos(
+                positions[
+                    position_indices[frame_count % no_of_position_indices]
+                ]
+            )
 
         ###
         for method in self.drawing_methods:
             method()
 
-    def no_walk_draw(self):
+    def no_walk_objects_draw(self):
 
         version = self.next_surf_version()
 
+        frame_count = self.frame_count
+
         for (
 
             obj,
 
             surface_collections_map,
             surface_indices,
+            no_of_surface_indices,
 
             positions,
             position_indices,
+            no_of_position_indices,
 
         ) in self.walking_data:
 
-            obj.image = surface_collections_map[version][surface_indices[0]]
+            obj.image = surface_collections_map[version][
+                surface_indices[frame_count % no_of_surface_indices]
+            ]
 
-            obj.set_pos(positions[position_indices[0]])
+            obj.set_pos(
+                positions[
+                    position_indices[frame_count % no_of_position_indices]
+                ]
+            )
 
         ###
 
@@ -274,13 +552,48 @@ class AnimationPlayer2D:
             method()
 
         ###
-        self.draw = self.walk_and_draw
+        self.draw = self.walk_objects_and_draw
+
+
+
+class SharedAnimationClock:
+    """Frame count shared by players of the same animation.
+
+    The clock advances at most once per frame of the game, no
+    matter how many players draw it, so the current frame of
+    the animation is only looked up once for all of them.
+    """
+
+    def __init__(self, frame_table):
+
+        self.frame_table = frame_table
+
+        ### the count is advanced before each frame is drawn, so
+        ### it starts before the first one
+        self.frame_count = -1
+
+        self.last_frame_index = None
+        self.frame = frame_table[0]
+
+    def advance(self):
+        """Advance to frame of the animation for current game frame."""
+
+        self.last_frame_index = GENERAL_NS.frame_index
+        self.frame_count = frame_count = self.frame_count + 1
+
+        frame_table = self.frame_table
+        self.frame = frame_table[frame_count % len(frame_table)]
 
 
 
 class AnimationObject2D:
 
-    def __init__(self, obj_data):
+    def __init__(self, obj_data, blit_surface=blit_on_screen):
+
+        ### operation used to blit the object's image (by default
+        ### blits directly on the screen, but it can be replaced
+        ### by one that takes a camera into account, for instance)
+        self.blit_surface = blit_surface
 
         size = obj_data['size']
         self.rect = Rect(0, 0, *size)
@@ -289,7 +602,7 @@ class AnimationObject2D:
         self.anchorage_offset = Vector2(obj_data.get('anchorage_offset', (0, 0)))
 
     def draw(self):
-        blit_on_screen(self.image, self.art_rect)
+        self.blit_surface(self.image, self.art_rect)
 
     def set_positioning(self):
 
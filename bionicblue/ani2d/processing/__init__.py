@@ -5,30 +5,61 @@ from collections import defaultdict
 
 from itertools import permutations
 
+from concurrent.futures import ThreadPoolExecutor
 
-### third-party imports
+from weakref import WeakSet
 
-from pygame import Surface
 
+### third-party import
 from pygame.math import Vector2
 
 
 ### local imports
 
-from ...ourstdlibs.pyl import load_pyl
+from ...config import (
+    ANIM_DATA_MAP,
+    ANIMATIONS_DIR,
+    LOAD_RESOURCES_IN_PARALLEL,
+    RESOURCE_LOADING_WORKERS,
+    CACHE_ANIMATION_SPRITES,
+    USE_NUMPY_FOR_SPRITES,
+    PACK_SPRITES_IN_ATLASES,
+    LAZY_SURFACE_VARIANTS,
+)
 
-from ...ourstdlibs.wdeque.main import WalkingDeque
+from ...atlasman import pack_surfaces
+
+from ...ourstdlibs.pyl import load_pyl
 
 from ...ourstdlibs.tree import get_tree_values
 
-from .constants import (
-    TRANSP_COLORKEY,
-    OBLIVIOUS_EMPTY_GETTER,
-)
+from .constants import OBLIVIOUS_EMPTY_GETTER
 
-from .recolor import get_recolored_sprites_data
 from .derived import process_derived_animations
 
+from .variants import SurfaceVariants, add_recolored_variants
+
+from .spritecache import (
+    get_source_hash,
+    read_pxa_cache,
+    load_cached_pxa_data,
+    save_cached_pxa_data,
+)
+
+## painting functions; the vectorized ones are used if enabled and
+## numpy is available
+
+if USE_NUMPY_FOR_SPRITES:
+
+    try:
+        from .vectorized import get_versions_data, paint_sprites
+
+    except ImportError:
+        from .painting import get_versions_data, paint_sprites
+
+else:
+    from .painting import get_versions_data, paint_sprites
+
 
 
 DEFAULT_VERSIONS = frozenset({'default', 'invisible'})
@@ -56,46 +87,110 @@ KEY_DEFAULT_PAIRS = (
 )
 
 
-def process_animation_data(animation_dir):
+def load_animation_data(name):
+    """Return processed data of animation with given name.
 
-    metadata_path = next(p for p in animation_dir.iterdir() if p.suffix.lower() == '.pyl')
-    metadata = load_pyl(str(metadata_path))
+    Used to load the animations of config.ANIM_DATA_MAP on
+    demand.
+    """
+    animation_dir = ANIMATIONS_DIR / name
 
-    ###
+    if not animation_dir.is_dir():
+        raise KeyError(name)
 
-    geometry_data = metadata['geometry']
+    return process_animation_data(animation_dir)
 
-    objects = {}
 
-    for obj_name, obj_data in metadata['objects'].items():
-        objects[obj_name] = geometry_data[obj_data['geometry']]
+def preload_animations(names):
+    """Process animations of config.ANIM_DATA_MAP not processed yet.
 
+    When resources are loaded in parallel, the sources of the
+    animations are read in worker threads, leaving only the
+    creation of surfaces to the main thread, like when loading
+    the game. Either way, the animations end up as the most
+    recently used ones.
+    """
+    names = tuple(names)
 
-    ###
-    existing_structures = metadata['existing_structures']
+    if LOAD_RESOURCES_IN_PARALLEL:
 
-    for struct_data in existing_structures.values():
+        missing_dirs = [
+            ANIMATIONS_DIR / name
+            for name in names
+            if name not in ANIM_DATA_MAP
+            if (ANIMATIONS_DIR / name).is_dir()
+        ]
 
-        ###
-        tree = struct_data['tree']
-        optional_order = tuple(get_tree_values(tree, 'name', 'children'))
+        ### sources are yielded in order as soon as they are read, so
+        ### each animation is processed while the next ones are read
 
-        ###
+        with ThreadPoolExecutor(RESOURCE_LOADING_WORKERS) as executor:
 
-        for key in ('updating_order', 'drawing_order'):
+            for animation_dir, sources in zip(
+                missing_dirs,
+                executor.map(load_animation_sources, missing_dirs),
+            ):
+                ANIM_DATA_MAP[animation_dir.name] = (
+                    process_animation_data(animation_dir, sources)
+                )
 
-            try: struct_data[key]
-            except KeyError:
-                struct_data[key] = optional_order
+    ### process animations left (if any) and mark all as recently used
+    ANIM_DATA_MAP.preload(names)
 
-        ###
-        struct_data['object_names'] = optional_order
 
-    structures = {
-        anim_name: existing_structures[anim_data['structure']]
-        for anim_name, anim_data in metadata['animations'].items()
+def is_animation_data_in_use(anim_data):
+    """Return whether animation players still use animation data.
+
+    Used so animation data isn't discarded from its map while in
+    use, since its surfaces wouldn't be freed anyway and, if the
+    animation was needed again, it would be processed as a copy.
+    """
+    return bool(anim_data['players'])
+
+
+def get_animation_data_size(anim_data):
+    """Return size in bytes of surfaces in animation data.
+
+    Surfaces shared by different animations or versions are
+    only counted once.
+    """
+    surfaces = {
+        id(surf): surf
+        for anim_values in anim_data['values'].values()
+        for obj_values in anim_values.values()
+        for surf_collection in (
+            obj_values['surface_collections_map'].values()
+        )
+        if isinstance(surf_collection, tuple)
+        for surf in surf_collection
     }
 
+    return sum(
+        surf.get_bytesize() * surf.get_width() * surf.get_height()
+        for surf in surfaces.values()
+    )
+
+
+def load_animation_sources(
+    animation_dir,
+    lazy_variants=LAZY_SURFACE_VARIANTS,
+):
+    """Return data read from animation dir needed to process it.
+
+    No surface is created here, so this function can be safely
+    used from worker threads, leaving only the creation of
+    surfaces to process_animation_data().
+
+    lazy_variants (boolean)
+        whether recolored and flipped surfaces are produced on
+        demand (see the variants module) rather than in advance;
+        in that case only the default sprites are painted, and
+        the sprite cache isn't used, since it holds the sprites
+        of all versions.
+    """
+    metadata_path = next(p for p in animation_dir.iterdir() if p.suffix.lower() == '.pyl')
+    metadata = load_pyl(str(metadata_path))
+
     ### prepare recoloring instructions if requested
 
     try:
@@ -130,153 +225,125 @@ def process_animation_data(animation_dir):
                     recolor_effects
                 )
 
-    ### pxa value grabbing
-
-    pxa_paths = [
-        path
-        for path in animation_dir.iterdir()
-        if path.suffix.lower() == '.pxa'
-    ]
-
-    all_pxa_values = {}
-    all_pxa_timing = {}
+    ### pxa source grabbing
 
-    for path in pxa_paths:
-
-        pxa_data = load_pyl(str(path))
-
-        stem = path.stem
-
-        pxa_values = all_pxa_values[stem] = {}
-        pxa_timing = all_pxa_timing[stem] = {}
-
-
-        ###
-        surfaces = []
-        append_surface = surfaces.append
-        clear_surfaces = surfaces.clear
-
-        for anim_name, anim_data in pxa_data['animations'].items():
+    if lazy_variants:
 
-            size = anim_data['size']
+        pxa_sources = get_pxa_sources(
+            animation_dir,
+            {},
+            use_cache=False,
+        )
 
-            anim_values = pxa_values[anim_name] = {}
-
-            ###
-            versions = list(DEFAULT_VERSIONS)
-
-            ###
-
-            sprites_identifier = f'{stem}.{anim_name}'
-
-            if sprites_identifier in recolor_instructions_map:
-
-                version_instructions_map = (
-                    recolor_instructions_map[sprites_identifier]
-                )
-
-                versions.extend(version_instructions_map)
-
-            ###
-
-            surfc_map = anim_values['surface_collections_map'] = {}
+    else:
+        pxa_sources = get_pxa_sources(animation_dir, recolor_instructions_map)
 
-            default_sprites_data = anim_data['sprites']
+    ### pos value grabbing
 
-            ###
-            base_surf = Surface((size, size)).convert()
-            base_surf.fill(TRANSP_COLORKEY)
-            base_surf.set_colorkey(TRANSP_COLORKEY)
-            ###
+    pos_paths = [
+        path
+        for path in animation_dir.iterdir()
+        if path.suffix.lower() == '.pos'
+    ]
 
-            for version in versions:
+    all_pos_values = {}
 
-                if version == 'invisible':
+    for path in pos_paths:
+        all_pos_values[path.stem] = load_pyl(str(path))
 
-                    surfc_map[version] = OBLIVIOUS_EMPTY_GETTER
-                    continue
+    ###
 
-                ###
+    return {
+        'metadata': metadata,
+        'non_default_versions': non_default_versions,
+        'recolor_instructions_map': recolor_instructions_map,
+        'lazy_variants': lazy_variants,
+        'pxa_sources': pxa_sources,
+        'all_pos_values': all_pos_values,
+    }
 
-                if version == 'default':
-                    sprites_data = default_sprites_data
 
-                else:
-                    sprites_data = (
-                        get_recolored_sprites_data(
-                            default_sprites_data,
-                            version_instructions_map[version],
-                        )
-                    )
+def process_animation_data(
+    animation_dir,
+    sources=None,
+    lazy_variants=LAZY_SURFACE_VARIANTS,
+):
+    """Return animation data processed from animation dir.
 
+    sources (dict or None)
+        data read from the animation dir, as returned by
+        load_animation_sources(); if not provided, it is read
+        here.
+    lazy_variants (boolean)
+        used when reading the sources here, as described in
+        load_animation_sources(); otherwise the value given
+        when the sources were read is used.
+    """
+    if sources is None:
+        sources = load_animation_sources(animation_dir, lazy_variants)
 
-                ###
-                for sprite_data in sprites_data:
+    lazy_variants = sources['lazy_variants']
 
-                    ## create and append surface
+    metadata = sources['metadata']
 
-                    surf = base_surf.copy()
-                    append_surface(surf)
+    ###
 
-                    ## paint surface
+    geometry_data = metadata['geometry']
 
-                    for color, points in sprite_data.items():
-                        for point in points:
-                            surf.set_at(tuple(map(int, point)), color)
+    objects = {}
 
-                surfc_map[version] = tuple(surfaces)
-                clear_surfaces()
+    for obj_name, obj_data in metadata['objects'].items():
+        objects[obj_name] = geometry_data[obj_data['geometry']]
 
-            ### set default surfaces as default for missing non-default
-            ### versions
 
-            default_surfaces = surfc_map['default']
-            for version in non_default_versions:
-                surfc_map.setdefault(version, default_surfaces)
+    ###
+    existing_structures = metadata['existing_structures']
 
-            ###
-            anim_values['positions'] = ((0, 0),)
+    for struct_data in existing_structures.values():
 
-            ###
+        ###
+        tree = struct_data['tree']
+        optional_order = tuple(get_tree_values(tree, 'name', 'children'))
 
-            anim_timing = pxa_timing[anim_name] = {}
+        ###
 
-            ###
+        for key in ('updating_order', 'drawing_order'):
 
-            no_of_frames = anim_data['number_of_frames']
-            sprite_placement = anim_data['sprite_placement']
+            try: struct_data[key]
+            except KeyError:
+                struct_data[key] = optional_order
 
-            surf_indices = []
+        ###
+        struct_data['object_names'] = optional_order
 
-            for frame_index in range(no_of_frames):
+    structures = {
+        anim_name: existing_structures[anim_data['structure']]
+        for anim_name, anim_data in metadata['animations'].items()
+    }
 
-                if frame_index in sprite_placement:
-                    sprite_index = sprite_placement[frame_index]
+    ### pxa value grabbing
 
-                surf_indices.append(sprite_index)
+    all_pxa_values, all_pxa_timing = get_pxa_values_and_timing(
+        animation_dir,
+        sources['pxa_sources'],
+        sources['non_default_versions'],
+    )
 
+    if lazy_variants:
 
-            anim_timing['surface_indices'] = tuple(surf_indices)
-            ###
-            anim_timing['position_indices'] = (0,)
+        add_recolored_variants(
+            all_pxa_values,
+            sources['recolor_instructions_map'],
+        )
 
     ### pos value grabbing
 
-    pos_paths = [
-        path
-        for path in animation_dir.iterdir()
-        if path.suffix.lower() == '.pos'
-    ]
+    all_pos_values = sources['all_pos_values']
 
-    all_pos_values = {}
-    all_pos_timing = {}
-
-    for path in pos_paths:
-
-        pos_data = load_pyl(str(path))
-
-        all_pos_values[path.stem] = pos_data
-        all_pos_timing[path.stem] = tuple(range(len(pos_data)))
+    all_pos_timing = {
+        stem: tuple(range(len(pos_data)))
+        for stem, pos_data in all_pos_values.items()
+    }
 
 
     ### storing grabbed values and timing
@@ -344,17 +411,22 @@ def process_animation_data(animation_dir):
 
                     if key == 'surface_indices':
                         stem, pxa_anim_name = raw_obj_timing[key].split('.')
-                        obj_timing[key] = WalkingDeque(all_pxa_timing[stem][pxa_anim_name][key])
+                        obj_timing[key] = tuple(all_pxa_timing[stem][pxa_anim_name][key])
 
                     else:
                         stem = raw_obj_timing[key]
-                        obj_timing[key] = WalkingDeque(all_pos_timing[stem])
+                        obj_timing[key] = tuple(all_pos_timing[stem])
 
                 else:
-                    obj_timing[key] = WalkingDeque((0,))
+                    obj_timing[key] = (0,)
+
+    ###
+    process_derived_animations(metadata, values, timing, lazy_variants)
 
     ###
-    process_derived_animations(metadata, values, timing)
+
+    if PACK_SPRITES_IN_ATLASES:
+        pack_animation_surfaces(values)
 
     ###
 
@@ -385,4 +457,263 @@ def process_animation_data(animation_dir):
       'values': values,
       'timing': timing,
       'root_pos_exchange_map': exchange_map,
+
+      ### frame tables compiled on demand by animation players, as
+      ### well as their shared clocks, kept here so they are discarded
+      ### along with the animation data
+      'frame_tables': {},
+      'shared_clocks': {},
+
+      ### animation players using the data, tracked so the data
+      ### isn't discarded while in use
+      'players': WeakSet(),
+    }
+
+
+def pack_animation_surfaces(values):
+    """Replace surfaces in values by ones packed in atlas pages.
+
+    Surface collections shared by different animations or
+    versions remain shared.
+    """
+    ### gather unique surface collections maps, since the same map
+    ### may be used by different animations
+
+    surfc_maps = list({
+        id(obj_values['surface_collections_map']): (
+            obj_values['surface_collections_map']
+        )
+        for anim_values in values.values()
+        for obj_values in anim_values.values()
+    }.values())
+
+    ### gather unique surface collections (tuples of surfaces; the
+    ### other collections are the invisible ones)
+
+    collections = {
+        id(surf_collection): surf_collection
+        for surfc_map in surfc_maps
+        for surf_collection in surfc_map.values()
+        if isinstance(surf_collection, tuple)
     }
+
+    ### pack their unique surfaces
+
+    surfaces = list({
+        id(surf): surf
+        for surf_collection in collections.values()
+        for surf in surf_collection
+    }.values())
+
+    packed_surface_map = {
+        id(surf): packed_surf
+        for surf, packed_surf in zip(surfaces, pack_surfaces(surfaces))
+    }
+
+    ### replace the collections with ones containing the packed surfaces
+
+    packed_collection_map = {
+        collection_id: tuple(
+            packed_surface_map[id(surf)]
+            for surf in surf_collection
+        )
+        for collection_id, surf_collection in collections.items()
+    }
+
+    for surfc_map in surfc_maps:
+
+        for version, surf_collection in surfc_map.items():
+
+            if isinstance(surf_collection, tuple):
+                surfc_map[version] = packed_collection_map[id(surf_collection)]
+
+            ### surface variants are produced from the packed surfaces
+            ### as well
+
+            elif isinstance(surf_collection, SurfaceVariants):
+
+                surf_collection.surfaces = (
+                    packed_collection_map[id(surf_collection.surfaces)]
+                )
+
+
+def get_pxa_sources(
+    animation_dir,
+    recolor_instructions_map,
+    use_cache=CACHE_ANIMATION_SPRITES,
+):
+    """Return data needed to produce sprites of .pxa files.
+
+    If enabled and up to date, the cached sprites are read.
+    Otherwise, the .pxa files are parsed and their recolored
+    sprites data is computed. No surface is created here.
+    """
+    if use_cache:
+
+        source_hash = get_source_hash(animation_dir)
+        cache = read_pxa_cache(animation_dir, source_hash)
+
+        if cache is not None:
+
+            return {
+                'source_hash': source_hash,
+                'cache': cache,
+            }
+
+    else:
+        source_hash = None
+
+    return {
+        'source_hash': source_hash,
+        'cache': None,
+        'parsed_pxa': parse_pxa_files(animation_dir, recolor_instructions_map),
+    }
+
+
+def get_pxa_values_and_timing(
+    animation_dir,
+    pxa_sources,
+    non_default_versions,
+):
+    """Return values and timing of .pxa files in animation dir.
+
+    Sprites are loaded from the cache when it was read in
+    get_pxa_sources(); otherwise they are rendered and, if
+    enabled, stored in the cache.
+    """
+    cache = pxa_sources['cache']
+
+    if cache is not None:
+        return load_cached_pxa_data(*cache, non_default_versions)
+
+    ###
+
+    all_pxa_values, all_pxa_timing = render_pxa_sprites(
+        pxa_sources['parsed_pxa'],
+        non_default_versions,
+    )
+
+    source_hash = pxa_sources['source_hash']
+
+    if source_hash is not None:
+
+        save_cached_pxa_data(
+            animation_dir,
+            source_hash,
+            all_pxa_values,
+            all_pxa_timing,
+        )
+
+    return all_pxa_values, all_pxa_timing
+
+
+def parse_pxa_files(animation_dir, recolor_instructions_map):
+    """Return sprites data and timing from .pxa files.
+
+    The sprites data of each version of each animation is
+    returned, including recolored versions, in the format used
+    by the painting functions in use.
+    """
+    pxa_paths = [
+        path
+        for path in animation_dir.iterdir()
+        if path.suffix.lower() == '.pxa'
+    ]
+
+    parsed_pxa = {}
+
+    for path in pxa_paths:
+
+        pxa_data = load_pyl(str(path))
+
+        stem = path.stem
+
+        parsed_anims = parsed_pxa[stem] = {}
+
+        for anim_name, anim_data in pxa_data['animations'].items():
+
+            ###
+
+            sprites_identifier = f'{stem}.{anim_name}'
+
+            versions_data = get_versions_data(
+                anim_data['size'],
+                anim_data['sprites'],
+                recolor_instructions_map.get(sprites_identifier, {}),
+            )
+
+            ###
+
+            no_of_frames = anim_data['number_of_frames']
+            sprite_placement = anim_data['sprite_placement']
+
+            surf_indices = []
+
+            for frame_index in range(no_of_frames):
+
+                if frame_index in sprite_placement:
+                    sprite_index = sprite_placement[frame_index]
+
+                surf_indices.append(sprite_index)
+
+            ###
+
+            parsed_anims[anim_name] = {
+                'size': anim_data['size'],
+                'versions_data': versions_data,
+                'surface_indices': tuple(surf_indices),
+            }
+
+    return parsed_pxa
+
+
+def render_pxa_sprites(parsed_pxa, non_default_versions):
+    """Return values and timing by painting parsed sprites data.
+
+    parsed_pxa (dict)
+        data returned by parse_pxa_files().
+    non_default_versions (iterable of strings)
+        names of recolored versions; those not present for an
+        animation use its default surfaces.
+    """
+    all_pxa_values = {}
+    all_pxa_timing = {}
+
+    for stem, parsed_anims in parsed_pxa.items():
+
+        pxa_values = all_pxa_values[stem] = {}
+        pxa_timing = all_pxa_timing[stem] = {}
+
+        for anim_name, parsed_anim in parsed_anims.items():
+
+            size = parsed_anim['size']
+
+            anim_values = pxa_values[anim_name] = {}
+
+            ###
+
+            surfc_map = anim_values['surface_collections_map'] = {
+                'invisible': OBLIVIOUS_EMPTY_GETTER,
+            }
+
+            for version, version_data in parsed_anim['versions_data'].items():
+                surfc_map[version] = paint_sprites(size, version_data)
+
+            ### set default surfaces as default for missing non-default
+            ### versions
+
+            default_surfaces = surfc_map['default']
+            for version in non_default_versions:
+                surfc_map.setdefault(version, default_surfaces)
+
+            ###
+            anim_values['positions'] = ((0, 0),)
+
+            ###
+
+            pxa_timing[anim_name] = {
+                'surface_indices': parsed_anim['surface_indices'],
+                'position_indices': (0,),
+            }
+
+    return all_pxa_values, all_pxa_timing
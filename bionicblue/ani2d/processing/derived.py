@@ -4,11 +4,11 @@ from pygame.transform import flip as flip_surface
 
 
 ### local import
-from ...ourstdlibs.wdeque.main import WalkingDeque
+from .variants import get_flipped_collection
 
 
 
-def process_derived_animations(metadata, values, timing):
+def process_derived_animations(metadata, values, timing, lazy_variants=False):
 
     sorted_derived_animations = sorted(
 
@@ -51,10 +51,21 @@ def process_derived_animations(metadata, values, timing):
                         surfc_map[version] = target_surf_collection
                         continue
 
-                    surfc_map[version] = tuple(
-                        flip_surface(surf, True, False)
-                        for surf in target_surf_collection
-                    )
+                    ### flipped surfaces are either produced on demand
+                    ### or right away
+
+                    if lazy_variants:
+
+                        surfc_map[version] = (
+                            get_flipped_collection(target_surf_collection)
+                        )
+
+                    else:
+
+                        surfc_map[version] = tuple(
+                            flip_surface(surf, True, False)
+                            for surf in target_surf_collection
+                        )
 
                 ## positions
                 obj_values['positions'] = target_obj_values['positions']
@@ -66,7 +77,7 @@ def process_derived_animations(metadata, values, timing):
                 obj_timing = anim_timing[obj_name] = {}
 
                 for key in ('surface_indices', 'position_indices'):
-                    obj_timing[key] = WalkingDeque(target_obj_timing[key])
+                    obj_timing[key] = target_obj_timing[key]
 
         elif operation_name == 'backwards':
 
@@ -91,4 +102,4 @@ def process_derived_animations(metadata, values, timing):
                 obj_timing = anim_timing[obj_name] = {}
 
                 for key in ('surface_indices', 'position_indices'):
-                    obj_timing[key] = WalkingDeque(reversed(target_obj_timing[key]))
+                    obj_timing[key] = tuple(reversed(target_obj_timing[key]))
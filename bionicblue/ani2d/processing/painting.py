@@ -0,0 +1,72 @@
+"""Facility for painting sprites from .pxa data in pure python.
+
+This is the fallback used when numpy isn't available, or when
+its usage is disabled (see the vectorized module).
+"""
+
+### third-party import
+from pygame import Surface
+
+
+### local imports
+
+from .constants import TRANSP_COLORKEY
+
+from .recolor import get_recolored_sprites_data
+
+
+
+def get_versions_data(size, default_sprites_data, version_instructions_map):
+    """Return map of sprites data for each version.
+
+    size (positive integer)
+        width and height of sprites; not needed here, but
+        accepted for compatibility with the vectorized module.
+    default_sprites_data (list of dicts)
+        sprites data of the default version, as found in the
+        .pxa file, that is, dicts mapping colors to points.
+    version_instructions_map (dict)
+        maps names of recolored versions to their recoloring
+        instructions.
+    """
+    versions_data = {'default': default_sprites_data}
+
+    for version, recolor_instructions in version_instructions_map.items():
+
+        versions_data[version] = get_recolored_sprites_data(
+            default_sprites_data,
+            recolor_instructions,
+        )
+
+    return versions_data
+
+
+def paint_sprites(size, sprites_data):
+    """Return tuple of surfaces painted from sprites data.
+
+    size (positive integer)
+        width and height of sprites.
+    sprites_data
+        sprites data of a version, as found in the map returned
+        by get_versions_data().
+    """
+    base_surf = Surface((size, size)).convert()
+    base_surf.fill(TRANSP_COLORKEY)
+    base_surf.set_colorkey(TRANSP_COLORKEY)
+
+    surfaces = []
+
+    for sprite_data in sprites_data:
+
+        ## create and append surface
+
+        surf = base_surf.copy()
+        surfaces.append(surf)
+
+        ## paint surface
+
+        for color, points in sprite_data.items():
+            for point in points:
+                surf.set_at(tuple(map(int, point)), color)
+
+    return tuple(surfaces)
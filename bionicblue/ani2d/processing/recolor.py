@@ -19,8 +19,6 @@ from ...ourstdlibs.color.conversion import (
 
 
 
-NEW_SPRITE_DATA = defaultdict(list)
-
 def get_recolored_sprites_data(sprites_data, recolor_instructions):
 
     ### get existing colors
@@ -45,6 +43,11 @@ def get_recolored_sprites_data(sprites_data, recolor_instructions):
     ## create list
     recolored_sprites_data = []
 
+    ## create map to hold the points of each new color; it is local
+    ## rather than global so this function can be used by different
+    ## threads at once
+    new_sprite_data = defaultdict(list)
+
     ## iterate over current sprites data
 
     for sprite_data in sprites_data:
@@ -65,7 +68,7 @@ def get_recolored_sprites_data(sprites_data, recolor_instructions):
         for color, points in sprite_data.items():
 
             new_color = recolor_map[color]
-            NEW_SPRITE_DATA[new_color].extend(points)
+            new_sprite_data[new_color].extend(points)
 
         ## now, before appending the new sprite data,
         ## convert it into a regular dict and the list
@@ -75,13 +78,13 @@ def get_recolored_sprites_data(sprites_data, recolor_instructions):
 
             {
                 new_color: tuple(points)
-                for new_color, points in NEW_SPRITE_DATA.items()
+                for new_color, points in new_sprite_data.items()
             }
 
         )
 
         ## clear the new sprite data
-        NEW_SPRITE_DATA.clear()
+        new_sprite_data.clear()
 
     ### finally, return the list of recolored sprites data
     return recolored_sprites_data
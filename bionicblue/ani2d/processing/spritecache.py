@@ -0,0 +1,252 @@
+"""Facility for caching rendered animation sprites on disk.
+
+Rendering the sprites of an animation means painting each
+pixel listed in its .pxa files, for each recolored version
+requested. Instead of doing so on every run, the rendered
+sprites are stored in a raw pixel buffer alongside a small
+index file, both keyed by a hash of the source files. Next
+runs just read both files, as long as the source files
+don't change.
+
+For each animation directory, the cache consists of:
+
+<name>.bin
+    raw RGB pixels of all sprites, one after the other;
+<name>.pyl
+    index with the hash of the source files and, for each
+    .pxa animation, the size of its sprites, its surface
+    indices and where in the buffer the sprites of each of
+    its versions are.
+"""
+
+### standard library import
+from hashlib import sha1
+
+
+### third-party imports
+
+from pygame.image import tobytes, frombytes
+
+
+### local imports
+
+from ...config import SPRITE_CACHE_DIR
+
+from ...ourstdlibs.pyl import load_pyl, save_pyl
+
+from .constants import TRANSP_COLORKEY, OBLIVIOUS_EMPTY_GETTER
+
+
+
+### must be incremented whenever the format of the cache changes,
+### so that existing caches are discarded
+CACHE_FORMAT_VERSION = 1
+
+### suffixes of files which affect the rendered sprites
+SOURCE_SUFFIXES = frozenset(('.pxa', '.pyl'))
+
+
+def get_source_hash(animation_dir):
+    """Return hash of files used to render the animation sprites."""
+
+    source_hash = sha1()
+
+    for path in sorted(animation_dir.iterdir()):
+
+        if path.suffix.lower() in SOURCE_SUFFIXES:
+
+            source_hash.update(path.name.encode('utf-8'))
+            source_hash.update(path.read_bytes())
+
+    return source_hash.hexdigest()
+
+
+def get_cache_paths(animation_dir):
+    """Return paths of index and buffer files for animation."""
+
+    name = animation_dir.name
+
+    return (
+        SPRITE_CACHE_DIR / f'{name}.pyl',
+        SPRITE_CACHE_DIR / f'{name}.bin',
+    )
+
+
+def read_pxa_cache(animation_dir, source_hash):
+    """Return index and buffer of cached sprites, if valid.
+
+    If the cache doesn't exist or is outdated, None is returned
+    instead. Since no surface is created here, this function
+    can be safely used from worker threads.
+
+    animation_dir (pathlib.Path)
+        directory of the animation.
+    source_hash (str)
+        hash of the source files of the animation, as returned
+        by get_source_hash().
+    """
+    index_path, buffer_path = get_cache_paths(animation_dir)
+
+    try:
+        index = load_pyl(index_path)
+
+    except Exception:
+        return
+
+    if (
+        index.get('format_version') != CACHE_FORMAT_VERSION
+        or index.get('source_hash') != source_hash
+    ):
+        return
+
+    try:
+        buffer = buffer_path.read_bytes()
+
+    except Exception:
+        return
+
+    if len(buffer) != index['buffer_size']:
+        return
+
+    return index, buffer
+
+
+def load_cached_pxa_data(index, buffer, non_default_versions):
+    """Return pxa values and timing from cached sprites.
+
+    index, buffer
+        cached data, as returned by read_pxa_cache().
+    non_default_versions (iterable of strings)
+        names of recolored versions; those not cached for an
+        animation use its default surfaces.
+    """
+    all_pxa_values = {}
+    all_pxa_timing = {}
+
+    for stem, pxa_index in index['pxa'].items():
+
+        pxa_values = all_pxa_values[stem] = {}
+        pxa_timing = all_pxa_timing[stem] = {}
+
+        for anim_name, anim_index in pxa_index.items():
+
+            size = anim_index['size']
+            sprite_size = (size, size)
+            no_of_bytes = size * size * 3
+
+            surfc_map = {'invisible': OBLIVIOUS_EMPTY_GETTER}
+
+            for version, (offset, count) in anim_index['versions'].items():
+
+                surfaces = []
+
+                for start in range(offset, offset + (count * no_of_bytes), no_of_bytes):
+
+                    surf = frombytes(
+                        buffer[start:start+no_of_bytes],
+                        sprite_size,
+                        'RGB',
+                    ).convert()
+
+                    surf.set_colorkey(TRANSP_COLORKEY)
+                    surfaces.append(surf)
+
+                surfc_map[version] = tuple(surfaces)
+
+            default_surfaces = surfc_map['default']
+
+            for version in non_default_versions:
+                surfc_map.setdefault(version, default_surfaces)
+
+            pxa_values[anim_name] = {
+                'surface_collections_map': surfc_map,
+                'positions': ((0, 0),),
+            }
+
+            pxa_timing[anim_name] = {
+                'surface_indices': anim_index['surface_indices'],
+                'position_indices': (0,),
+            }
+
+    return all_pxa_values, all_pxa_timing
+
+
+def save_cached_pxa_data(
+    animation_dir,
+    source_hash,
+    all_pxa_values,
+    all_pxa_timing,
+):
+    """Store rendered pxa sprites and timing in cache.
+
+    Failing to do so isn't an error, since the cache is just
+    an optimization, so any problem just causes the animation
+    to be rendered again next time.
+    """
+    index_path, buffer_path = get_cache_paths(animation_dir)
+
+    chunks = []
+    offset = 0
+
+    pxa_index_map = {}
+
+    for stem, pxa_values in all_pxa_values.items():
+
+        pxa_index = pxa_index_map[stem] = {}
+
+        for anim_name, anim_values in pxa_values.items():
+
+            surfc_map = anim_values['surface_collections_map']
+            default_surfaces = surfc_map['default']
+
+            versions = {}
+
+            for version, surfaces in surfc_map.items():
+
+                ### skip the invisible version and recolored versions
+                ### which just reuse the default surfaces
+
+                if (
+                    version == 'invisible'
+                    or (
+                        version != 'default'
+                        and surfaces is default_surfaces
+                    )
+                ):
+                    continue
+
+                versions[version] = (offset, len(surfaces))
+
+                for surf in surfaces:
+
+                    chunk = tobytes(surf, 'RGB')
+                    chunks.append(chunk)
+                    offset += len(chunk)
+
+            pxa_index[anim_name] = {
+                'size': default_surfaces[0].get_width(),
+                'surface_indices': (
+                    all_pxa_timing[stem][anim_name]['surface_indices']
+                ),
+                'versions': versions,
+            }
+
+    index = {
+        'format_version': CACHE_FORMAT_VERSION,
+        'source_hash': source_hash,
+        'buffer_size': offset,
+        'pxa': pxa_index_map,
+    }
+
+    try:
+
+        SPRITE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+        buffer_path.write_bytes(b''.join(chunks))
+
+        ### the index is written last, so an interrupted write
+        ### never leaves a valid index pointing to a bad buffer
+        save_pyl(index, index_path)
+
+    except Exception:
+        print("Couldn't store animation sprites in cache")
@@ -0,0 +1,183 @@
+"""Facility for producing flipped/recolored surfaces on demand.
+
+Normally, a full set of surfaces is painted for each recolored
+version of an animation, and flipped copies of all of them are
+created for each derived animation flipped horizontally, even
+though most of these surfaces are never shown.
+
+When lazy surface variants are enabled, only the default
+surfaces are painted. The other surface collections are
+SurfaceVariants instances, which behave like the tuples of
+surfaces they replace, but produce each flipped/recolored
+surface when it is first requested. The produced surfaces are
+kept in a mapping with a size budget, so the least recently
+used ones are discarded (to be produced again if needed).
+
+The budget only holds as long as nothing else keeps the produced
+surfaces, which is why animation frame tables (and the shared
+clocks drawn from them) are disabled in the config module when
+lazy surface variants are enabled.
+"""
+
+### standard library import
+from itertools import chain
+
+
+### third-party imports
+
+from pygame.image import tobytes, frombytes
+
+from pygame.transform import flip as flip_surface
+
+
+### local imports
+
+from ...config import SURFACE_VARIANTS_BUDGET
+
+from ...ourstdlibs.lazymap import LazyLRUMap
+
+from .constants import TRANSP_COLORKEY
+
+from .recolor import get_new_color
+
+
+
+def get_surface_variant(key):
+    """Return surface variant described by key.
+
+    key (tuple)
+        (surface, flip, effects) tuple, where flip tells whether the
+        surface is flipped horizontally and effects are recoloring
+        effects (as in the metadata of animations) or None.
+    """
+    surf, flip, effects = key
+
+    if flip:
+        surf = flip_surface(surf, True, False)
+
+    if effects is not None:
+        surf = get_recolored_surface(surf, effects)
+
+    return surf
+
+
+def get_recolored_surface(surf, effects):
+    """Return copy of surface recolored according to effects.
+
+    Each color of the surface is replaced by the one obtained
+    with recolor.get_new_color(), like when painting recolored
+    sprites, except for the transparent color.
+    """
+    data = tobytes(surf, 'RGB')
+
+    colors = list(zip(data[0::3], data[1::3], data[2::3]))
+
+    recolor_map = {
+        color: tuple(get_new_color(color, effects))
+        for color in set(colors)
+    }
+
+    recolor_map[TRANSP_COLORKEY] = TRANSP_COLORKEY
+
+    new_surf = frombytes(
+        bytes(chain.from_iterable(map(recolor_map.__getitem__, colors))),
+        surf.get_size(),
+        'RGB',
+    ).convert()
+
+    new_surf.set_colorkey(TRANSP_COLORKEY)
+
+    return new_surf
+
+
+def get_surface_size(surf):
+    """Return size in bytes of surface pixels."""
+    return surf.get_bytesize() * surf.get_width() * surf.get_height()
+
+
+### surface variants produced so far; they are keyed by the surface
+### itself rather than its id, so that a key can't refer to another
+### surface which reused the id of one already discarded
+
+SURFACE_VARIANTS = LazyLRUMap(
+    get_surface_variant,
+    get_surface_size,
+    SURFACE_VARIANTS_BUDGET,
+)
+
+
+class SurfaceVariants:
+    """Collection of surfaces flipped/recolored on demand.
+
+    Used in place of tuples of surfaces, since it can be indexed
+    the same way.
+    """
+
+    def __init__(self, surfaces, flip=False, effects=None):
+        """Store surfaces and how to change them.
+
+        surfaces (tuple of pygame.Surface instances)
+            default surfaces from which variants are produced.
+        flip (boolean)
+            whether surfaces are flipped horizontally.
+        effects (tuple of tuples or None)
+            recoloring effects, as described in the metadata of
+            animations.
+        """
+        self.surfaces = surfaces
+        self.flip = flip
+        self.effects = effects
+
+    def __getitem__(self, index):
+        return SURFACE_VARIANTS[(self.surfaces[index], self.flip, self.effects)]
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def get_flipped(self):
+        """Return variants of the same surfaces, but flipped."""
+        return SurfaceVariants(self.surfaces, not self.flip, self.effects)
+
+
+def get_flipped_collection(surf_collection):
+    """Return variants of surface collection, flipped horizontally.
+
+    surf_collection (tuple or SurfaceVariants instance)
+        surfaces to be flipped.
+    """
+    if isinstance(surf_collection, SurfaceVariants):
+        return surf_collection.get_flipped()
+
+    return SurfaceVariants(surf_collection, flip=True)
+
+
+def add_recolored_variants(all_pxa_values, recolor_instructions_map):
+    """Replace recolored surface collections by surface variants.
+
+    all_pxa_values (dict)
+        values of .pxa files, wherein only default surfaces were
+        painted (that is, recolored versions use them as well).
+    recolor_instructions_map (dict)
+        maps identifiers of surface collections ('stem.anim_name')
+        to maps of versions and their recoloring effects.
+    """
+    for sprites_identifier, version_effects in (
+        recolor_instructions_map.items()
+    ):
+
+        stem, pxa_anim_name = sprites_identifier.split('.')
+
+        surfc_map = (
+            all_pxa_values
+            [stem][pxa_anim_name]
+            ['surface_collections_map']
+        )
+
+        default_surfaces = surfc_map['default']
+
+        for version, effects in version_effects.items():
+
+            surfc_map[version] = SurfaceVariants(
+                default_surfaces,
+                effects=tuple(map(tuple, effects)),
+            )
@@ -0,0 +1,349 @@
+"""Facility for painting sprites from .pxa data using numpy.
+
+Works just like the painting module, but instead of painting
+one pixel at a time, the color index of each pixel of all
+sprites of an animation is stored in a single array, built
+from coordinate arrays in one assignment. The pixels are
+then obtained by a single lookup in a palette.
+
+Recoloring is also much cheaper: all versions of an animation
+share the same color indices, each version just having its
+own palette, which is recolored with array operations,
+rather than color by color.
+
+Importing this module raises ImportError if numpy isn't
+installed.
+"""
+
+### standard library imports
+
+from colorsys import ONE_THIRD, ONE_SIXTH, TWO_THIRD
+
+from functools import lru_cache
+
+from itertools import repeat
+
+
+### third-party imports
+
+from numpy import (
+    array,
+    zeros,
+    full_like,
+    concatenate,
+    rint,
+    where,
+    clip,
+    maximum,
+    minimum,
+    column_stack,
+    errstate,
+    float64,
+    intp,
+    uint8,
+    uint16,
+)
+
+from pygame.surfarray import make_surface
+
+
+### local imports
+
+from ...ourstdlibs.color.constants import (
+    RGBA_FACTOR,
+    HLS_NAMES,
+    HLS_FACTORS,
+    HUE_MID_POINTS_MAP,
+)
+
+from .constants import TRANSP_COLORKEY
+
+
+
+def get_versions_data(size, default_sprites_data, version_instructions_map):
+    """Return map of palette and sprite indices for each version.
+
+    size (positive integer)
+        width and height of sprites.
+    default_sprites_data (list of dicts)
+        sprites data of the default version, as found in the
+        .pxa file, that is, dicts mapping colors to points.
+    version_instructions_map (dict)
+        maps names of recolored versions to their recoloring
+        instructions.
+    """
+    ### list all colors used, so each one is identified by its index
+    ### in the palette; index 0 is reserved for the transparent color
+
+    colors = sorted({
+        color
+        for sprite_data in default_sprites_data
+        for color in sprite_data
+    })
+
+    color_to_index = {
+        color: index
+        for index, color in enumerate(colors, 1)
+    }
+
+    ### list points of all sprites alongside the index of their
+    ### sprite and color
+
+    points = []
+    sprite_indices = []
+    color_indices = []
+
+    for sprite_index, sprite_data in enumerate(default_sprites_data):
+
+        for color, color_points in sprite_data.items():
+
+            points.extend(color_points)
+
+            no_of_points = len(color_points)
+
+            sprite_indices.extend(repeat(sprite_index, no_of_points))
+            color_indices.extend(repeat(color_to_index[color], no_of_points))
+
+    ### create array with the color index of each pixel of each
+    ### sprite (indexed by x first, then y, like surfarray arrays)
+
+    index_dtype = uint8 if len(colors) < 256 else uint16
+
+    sprites_indices = zeros(
+        (len(default_sprites_data), size, size),
+        dtype=index_dtype,
+    )
+
+    if points:
+
+        xs, ys = array(points, dtype=float64).astype(intp).T
+        sprite_indices = array(sprite_indices, dtype=intp)
+        color_indices = array(color_indices, dtype=index_dtype)
+
+        ### ignore points out of the sprite, just like
+        ### Surface.set_at() does
+
+        inside = (xs >= 0) & (xs < size) & (ys >= 0) & (ys < size)
+
+        sprites_indices[
+            sprite_indices[inside],
+            xs[inside],
+            ys[inside],
+        ] = color_indices[inside]
+
+    ### create palettes, sharing the sprite indices among all versions
+
+    palette_colors = tuple(tuple(color[:3]) for color in colors)
+
+    versions_data = {
+
+        'default': (
+            array((TRANSP_COLORKEY,) + palette_colors, dtype=uint8),
+            sprites_indices,
+        )
+
+    }
+
+    for version, recolor_instructions in version_instructions_map.items():
+
+        versions_data[version] = (
+
+            get_recolored_palette(
+                palette_colors,
+                tuple(map(tuple, recolor_instructions)),
+            ),
+
+            sprites_indices,
+
+        )
+
+    return versions_data
+
+
+def paint_sprites(size, version_data):
+    """Return tuple of surfaces painted from palette and indices.
+
+    size (positive integer)
+        width and height of sprites.
+    version_data
+        palette and sprite indices of a version, as found in the
+        map returned by get_versions_data().
+    """
+    palette, sprites_indices = version_data
+
+    surfaces = []
+
+    ### a single lookup in the palette gives the pixels of all
+    ### sprites
+
+    for pixels in palette[sprites_indices]:
+
+        surf = make_surface(pixels).convert()
+        surf.set_colorkey(TRANSP_COLORKEY)
+
+        surfaces.append(surf)
+
+    return tuple(surfaces)
+
+
+### palette recoloring
+
+## animations of the same object usually share the same colors and
+## recoloring instructions, so recolored palettes are reused
+
+@lru_cache(maxsize=None)
+def get_recolored_palette(palette_colors, recolor_instructions):
+    """Return palette array recolored according to instructions.
+
+    Equivalent to applying recolor.get_new_color() to each color
+    of the palette, including the rounding to full values after
+    each step, so the resulting colors are exactly the same.
+
+    palette_colors (tuple of tuples)
+        RGB colors with values from 0 to 255; the transparent
+        color is inserted at the beginning of the returned
+        palette.
+    recolor_instructions (tuple of tuples)
+        recoloring effects, as described in the metadata of
+        animations.
+    """
+    colors = array(palette_colors, dtype=float64).reshape(-1, 3)
+
+    for name, *args in recolor_instructions:
+
+        if name not in HLS_NAMES:
+            continue
+
+        h, l, s = full_rgb_to_hls(colors)
+
+        if name == 'hue':
+
+            operation, *remaining_args = args
+
+            if operation == 'set':
+                h = full_like(h, remaining_args[0])
+
+            elif operation == 'increment':
+                h = h + remaining_args[0]
+
+            elif operation == 'set_from_basic':
+
+                basic_hue_name, increment = remaining_args
+                h = full_like(h, HUE_MID_POINTS_MAP[basic_hue_name] + increment)
+
+            h %= HLS_FACTORS[0]
+
+        elif name == 'lightness':
+
+            operation, value = args
+
+            l = (l + value) if operation == 'increment' else full_like(l, value)
+            l = clip(l, 0, HLS_FACTORS[1])
+
+        elif name == 'saturation':
+
+            operation, value = args
+
+            s = (s + value) if operation == 'increment' else full_like(s, value)
+
+            ### the modulo operation reproduces the behaviour of
+            ### recolor.get_new_color()
+            s = clip(s, 0, HLS_FACTORS[2]) % HLS_FACTORS[2]
+
+        colors = full_hls_to_rgb(h, l, s)
+
+    palette = concatenate(
+        (array((TRANSP_COLORKEY,), dtype=uint8), colors.astype(uint8))
+    )
+
+    ### the palette is shared, so prevent it from being changed
+    palette.flags.writeable = False
+
+    return palette
+
+
+def full_rgb_to_hls(colors):
+    """Return full hls arrays from array of full rgb colors.
+
+    Follows colorsys.rgb_to_hls() step by step.
+    """
+    r, g, b = (colors / RGBA_FACTOR).T
+
+    maxc = maximum(maximum(r, g), b)
+    minc = minimum(minimum(r, g), b)
+
+    sumc = maxc + minc
+    rangec = maxc - minc
+
+    l = sumc / 2.0
+
+    ### gray colors cause divisions by zero, but their hue and
+    ### saturation are replaced by 0 afterwards anyway
+
+    with errstate(divide='ignore', invalid='ignore'):
+
+        s = where(l <= 0.5, rangec / sumc, rangec / (2.0 - maxc - minc))
+
+        rc = (maxc - r) / rangec
+        gc = (maxc - g) / rangec
+        bc = (maxc - b) / rangec
+
+        h = where(
+            r == maxc,
+            bc - gc,
+            where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc),
+        )
+
+        h = (h / 6.0) % 1.0
+
+    is_gray = minc == maxc
+
+    h = where(is_gray, 0.0, h)
+    s = where(is_gray, 0.0, s)
+
+    h_factor, l_factor, s_factor = HLS_FACTORS
+
+    return rint(h * h_factor), rint(l * l_factor), rint(s * s_factor)
+
+
+def full_hls_to_rgb(h, l, s):
+    """Return array of full rgb colors from full hls arrays.
+
+    Follows colorsys.hls_to_rgb() step by step.
+    """
+    h_factor, l_factor, s_factor = HLS_FACTORS
+
+    h = h / h_factor
+    l = l / l_factor
+    s = s / s_factor
+
+    m2 = where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+    m1 = 2.0 * l - m2
+
+    rgb = column_stack(
+        [
+            where(s == 0.0, l, _v(m1, m2, hue))
+            for hue in (h + ONE_THIRD, h, h - ONE_THIRD)
+        ]
+    )
+
+    return rint(rgb * RGBA_FACTOR)
+
+
+def _v(m1, m2, hue):
+
+    hue = hue % 1.0
+
+    return where(
+        hue < ONE_SIXTH,
+        m1 + (m2 - m1) * hue * 6.0,
+        where(
+            hue < 0.5,
+            m2,
+            where(
+                hue < TWO_THIRD,
+                m1 + (m2 - m1) * (TWO_THIRD - hue) * 6.0,
+                m1,
+            ),
+        ),
+    )
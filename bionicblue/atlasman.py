@@ -0,0 +1,167 @@
+"""Facility for packing surfaces into texture atlases.
+
+Many small surfaces are packed into a few large surfaces
+(the pages of the atlas) using a shelf packer. Each packed
+surface is replaced by a subsurface of its page, which is
+still a regular surface for all purposes, but shares the
+pixels of the page. That is, blitting it blits the area of
+the page it occupies, and since the pixels of related
+surfaces (like the frames of an animation) end up close to
+each other in memory, blitting them is friendlier to the
+cache.
+"""
+
+### third-party import
+from pygame import Surface
+
+
+
+### pages are never wider than this, so that surfaces stack in
+### several shelves instead of a long row
+MAX_PAGE_WIDTH = 512
+
+### pages are also kept under this height; when surfaces don't
+### fit, new pages are created
+MAX_PAGE_HEIGHT = 2048
+
+
+def pack_surfaces(
+    surfaces,
+    max_page_width=MAX_PAGE_WIDTH,
+    max_page_height=MAX_PAGE_HEIGHT,
+):
+    """Return list of surfaces packed into texture atlas pages.
+
+    The returned list contains a subsurface of an atlas page
+    for each given surface, in the same order. Pages have the
+    same colorkey as the surfaces packed in them, so surfaces
+    with different colorkeys (or without one) are packed into
+    different pages.
+
+    surfaces (iterable of pygame.Surface instances)
+        surfaces to pack; they must not have per-pixel alpha.
+    max_page_width, max_page_height (positive integers)
+        maximum dimensions of each page; surfaces larger than
+        that are still packed, making their pages larger.
+    """
+    surfaces = list(surfaces)
+
+    ### group indices of surfaces by their colorkey
+
+    colorkey_to_indices = {}
+
+    for index, surf in enumerate(surfaces):
+        colorkey_to_indices.setdefault(surf.get_colorkey(), []).append(index)
+
+    ### pack each group
+
+    packed_surfaces = [None] * len(surfaces)
+
+    for colorkey, indices in colorkey_to_indices.items():
+
+        for page_size, placements in get_shelf_placements(
+
+            [surfaces[index].get_size() for index in indices],
+            max_page_width,
+            max_page_height,
+
+        ):
+
+            page = Surface(page_size).convert()
+
+            ### when there's a colorkey, the page is filled with it, so
+            ### areas not covered by surfaces (as well as transparent
+            ### pixels of the surfaces, which aren't blitted) remain
+            ### transparent
+
+            if colorkey is not None:
+
+                page.fill(colorkey)
+                page.set_colorkey(colorkey)
+
+            for item_index, pos in placements:
+
+                index = indices[item_index]
+                surf = surfaces[index]
+
+                page.blit(surf, pos)
+
+                subsurf = page.subsurface((pos, surf.get_size()))
+
+                if colorkey is not None:
+                    subsurf.set_colorkey(colorkey)
+
+                packed_surfaces[index] = subsurf
+
+    return packed_surfaces
+
+
+def get_shelf_placements(sizes, max_page_width, max_page_height):
+    """Return list of pages with the placement of each size.
+
+    Each page is represented by a (page_size, placements) pair,
+    where placements is a list of (size_index, topleft) pairs.
+
+    Sizes are placed from the tallest to the shortest, left to
+    right, in horizontal shelves; a new shelf is started below
+    when the current one is full, and a new page is started
+    when there is no vertical room left.
+    """
+    order = sorted(
+        range(len(sizes)),
+        key=lambda index: (-sizes[index][1], -sizes[index][0], index),
+    )
+
+    pages = []
+
+    ### placements of the current page, if any
+    placements = None
+
+    page_width = used_width = used_height = 0
+    shelf_x = shelf_y = shelf_height = 0
+
+    for index in order:
+
+        width, height = sizes[index]
+
+        if placements is not None:
+
+            ### start new shelf if current one is full
+
+            if shelf_x + width > page_width:
+
+                shelf_x = 0
+                shelf_y += shelf_height
+                shelf_height = height
+
+            ### start new page if there's no vertical room left
+
+            if shelf_y + height > max_page_height:
+                placements = None
+
+        if placements is None:
+
+            placements = []
+
+            page_width = max(max_page_width, width)
+            used_width = used_height = 0
+
+            shelf_x = shelf_y = 0
+            shelf_height = height
+
+            ### since the page size is only known once it is full,
+            ### the page is stored as a list to be updated
+            page = [None, placements]
+            pages.append(page)
+
+        placements.append((index, (shelf_x, shelf_y)))
+
+        shelf_x += width
+
+        used_width = max(used_width, shelf_x)
+        used_height = max(used_height, shelf_y + height)
+
+        page[0] = (used_width, used_height)
+
+    return [tuple(page) for page in pages]
+
@@ -0,0 +1,6 @@
+"""Benchmarks for measuring the performance of the game.
+
+Each module in this package can be run directly, for instance:
+
+    python -m bionicblue.benchmarks.pylloading
+"""
@@ -0,0 +1,231 @@
+"""Benchmark comparing ways of drawing animations.
+
+Draws animation players on the screen, measuring the average time
+of each frame when each object of the animation is positioned and
+drawn on its own (the objects path) and when each frame is drawn
+from the frame table compiled for the animation (the frame tables
+path), where each object is just a surface blitted at an offset
+from the root object.
+
+Both the single-object animations of the player character and
+the multi-object animation of its death rings are measured.
+
+Crowds of growing numbers of identical enemies are measured as
+well, with each enemy advancing its own animation and with all
+of them sharing a single animation clock.
+
+Usage:
+
+    python -m bionicblue.benchmarks.animation [frames [players]]
+"""
+
+### standard library imports
+
+from sys import argv
+
+from time import perf_counter
+
+from random import Random
+
+
+### local imports; the headless benchmark is imported first, since
+### it sets the dummy video/audio drivers before pygame is initialized
+
+from .headless import load_resources
+
+from ..pygamesetup.constants import (
+    GENERAL_NS,
+    SCREEN,
+    SCREEN_RECT,
+    blit_on_screen,
+)
+
+from ..config import ANIM_DATA_MAP
+
+from ..states import setup_states
+
+from ..ani2d.player import AnimationPlayer2D
+
+
+
+### (animation data key, animation name) pairs measured
+ANIMATIONS = (
+    ('blue_shooter_man', 'idle_right'),
+    ('blue_shooter_man', 'walk_right'),
+    ('death_rings', 'expanding'),
+)
+
+### animation of identical enemies and sizes of the crowds measured
+CROWD_ANIMATION = ('grunt_bot', 'idle_left')
+CROWD_SIZES = (12, 50, 200, 1000)
+
+
+def get_players(
+    anim_data_key,
+    anim_name,
+    count,
+    use_frame_tables=True,
+    shared_clock=False,
+    blit_surface=blit_on_screen,
+):
+    """Return animation players scattered over the screen.
+
+    A random generator with a fixed seed is used, so both paths
+    draw exactly the same animations.
+    """
+    rng = Random(count)
+
+    width, height = SCREEN_RECT.size
+
+    return [
+
+        AnimationPlayer2D(
+            type('Object', (), {})(),
+            anim_data_key,
+            anim_name,
+            'center',
+            (rng.randrange(width), rng.randrange(height)),
+            blit_surface=blit_surface,
+            use_frame_tables=use_frame_tables,
+            shared_clock=shared_clock,
+        )
+
+        for _ in range(count)
+
+    ]
+
+
+def skip_blit(surf, rect):
+    """Do nothing; used to measure animation costs without blitting."""
+
+
+def time_frames(players, frames):
+    """Return average time in seconds to draw all players."""
+
+    SCREEN.fill('black')
+
+    start = perf_counter()
+
+    for _ in range(frames):
+
+        ### the draw operation of each player is retrieved every
+        ### frame, since players swap it after the first frame
+
+        for player in players:
+            player.draw()
+
+        ### shared animation clocks advance once per game frame
+        GENERAL_NS.frame_index += 1
+
+    return (perf_counter() - start) / frames
+
+
+def run_benchmark(frames=500, players=50):
+    """Print frame times of each way of drawing animations."""
+
+    setup_states()
+    load_resources()
+
+    print(f"Average time per frame over {frames} frames, {players} players")
+
+    print(
+        f"{'animation':<32}"
+        f" {'objects':>10} {'tables':>10} {'speedup':>8}"
+    )
+
+    for anim_data_key, anim_name in ANIMATIONS:
+
+        ### objects path
+
+        objects_time = time_frames(
+            get_players(anim_data_key, anim_name, players, False),
+            frames,
+        )
+
+        objects_pixels = SCREEN.copy()
+
+        ### frame tables path
+
+        tables_time = time_frames(
+            get_players(anim_data_key, anim_name, players, True),
+            frames,
+        )
+
+        ### make sure both paths produce the same frame
+
+        if SCREEN.get_view('2').raw != objects_pixels.get_view('2').raw:
+            raise RuntimeError(f"Frame tables differ for {anim_name}")
+
+        print(
+            f"{anim_data_key + '.' + anim_name:<32}"
+            f" {objects_time * 1000:>7.3f} ms"
+            f" {tables_time * 1000:>7.3f} ms"
+            f" {objects_time / tables_time:>7.2f}x"
+        )
+
+    ### crowds of identical enemies; besides the time of each frame,
+    ### the time per enemy spent on the animation alone is measured,
+    ### by drawing them again without blitting
+
+    print()
+    print(f"Crowds of {'.'.join(CROWD_ANIMATION)}")
+
+    print(
+        f"{'enemies':>8}"
+        f" {'private':>10} {'shared':>10}"
+        f" {'animation per enemy':>24}"
+    )
+
+    for count in CROWD_SIZES:
+
+        times = []
+
+        for shared_clock in (False, True):
+
+            for blit_surface in (blit_on_screen, skip_blit):
+
+                ### start shared clock anew, like the animations of
+                ### enemies with their own clock
+                ANIM_DATA_MAP[CROWD_ANIMATION[0]]['shared_clocks'].clear()
+
+                players = get_players(
+                    *CROWD_ANIMATION,
+                    count,
+                    shared_clock=shared_clock,
+                    blit_surface=blit_surface,
+                )
+
+                times.append(time_frames(players, frames))
+
+                if blit_surface is blit_on_screen:
+
+                    if not shared_clock:
+                        private_pixels = SCREEN.copy()
+
+                    ### make sure both produce the same frame
+
+                    elif (
+                        SCREEN.get_view('2').raw
+                        != private_pixels.get_view('2').raw
+                    ):
+                        raise RuntimeError(
+                            f"Shared clock frame differs for {count} enemies"
+                        )
+
+        (
+            private_time,
+            private_animation_time,
+            shared_time,
+            shared_animation_time,
+        ) = times
+
+        print(
+            f"{count:>8}"
+            f" {private_time * 1000:>7.3f} ms"
+            f" {shared_time * 1000:>7.3f} ms"
+            f" {private_animation_time / count * 1e9:>8.1f} ns"
+            f" -> {shared_animation_time / count * 1e9:>6.1f} ns"
+        )
+
+if __name__ == '__main__':
+    run_benchmark(*map(int, argv[1:3]))
@@ -0,0 +1,150 @@
+"""Report comparing memory used by animations in each resource mode.
+
+Each animation in the animations directory is processed twice:
+once creating all recolored and flipped surfaces in advance (the
+default) and once with lazy surface variants, which produces
+them only when first needed.
+
+For each animation, the report lists the size of the surfaces
+created in advance in each mode, as well as the size of the
+surfaces produced on demand if every variant was needed, which
+is the worst case for the lazy mode. It also checks that both
+modes produce exactly the same pixels.
+
+Usage:
+
+    python -m bionicblue.benchmarks.animationmemory
+"""
+
+### third-party import
+from pygame.image import tobytes
+
+
+### local imports
+
+from ..config import ANIMATIONS_DIR
+
+## imported so the screen is set up, since processing animations
+## requires converting surfaces
+from .. import pygamesetup
+
+from ..ani2d.processing import process_animation_data, get_animation_data_size
+
+from ..ani2d.processing.variants import SurfaceVariants, SURFACE_VARIANTS
+
+
+
+def get_variants_size(anim_data):
+    """Return size in bytes of all surface variants of animation.
+
+    All variants are produced, so they are measured as well.
+    """
+    SURFACE_VARIANTS.clear()
+
+    for anim_values in anim_data['values'].values():
+
+        for obj_values in anim_values.values():
+
+            for surf_collection in (
+                obj_values['surface_collections_map'].values()
+            ):
+
+                if isinstance(surf_collection, SurfaceVariants):
+
+                    for index in range(len(surf_collection)):
+                        surf_collection[index]
+
+    return SURFACE_VARIANTS.total_cost
+
+
+def have_same_pixels(eager_data, lazy_data):
+    """Return whether animation data of both modes show the same."""
+
+    for anim_name, anim_values in eager_data['values'].items():
+
+        for obj_name, obj_values in anim_values.items():
+
+            lazy_surfc_map = (
+                lazy_data['values'][anim_name][obj_name]
+                ['surface_collections_map']
+            )
+
+            for version, surf_collection in (
+                obj_values['surface_collections_map'].items()
+            ):
+
+                if version == 'invisible':
+                    continue
+
+                lazy_collection = lazy_surfc_map[version]
+
+                if len(surf_collection) != len(lazy_collection):
+                    return False
+
+                for index, surf in enumerate(surf_collection):
+
+                    lazy_surf = lazy_collection[index]
+
+                    if (
+                        surf.get_size() != lazy_surf.get_size()
+                        or tobytes(surf, 'RGB') != tobytes(lazy_surf, 'RGB')
+                    ):
+                        return False
+
+    return True
+
+
+def print_report():
+    """Print memory used by each animation in each mode."""
+
+    ### measure all variants, without discarding any
+    SURFACE_VARIANTS.budget = None
+
+    print(
+        f"{'animation':<24}"
+        f" {'eager':>10} {'lazy':>10} {'lazy (all)':>11} {'same':>5}"
+    )
+
+    totals = [0, 0, 0]
+
+    animation_dirs = sorted(
+        path
+        for path in ANIMATIONS_DIR.iterdir()
+        if path.is_dir()
+    )
+
+    for animation_dir in animation_dirs:
+
+        eager_data = process_animation_data(animation_dir, lazy_variants=False)
+        lazy_data = process_animation_data(animation_dir, lazy_variants=True)
+
+        sizes = (
+            get_animation_data_size(eager_data),
+            get_animation_data_size(lazy_data),
+            get_animation_data_size(lazy_data) + get_variants_size(lazy_data),
+        )
+
+        for index, size in enumerate(sizes):
+            totals[index] += size
+
+        same_pixels = have_same_pixels(eager_data, lazy_data)
+
+        print(
+            f"{animation_dir.name:<24}"
+            + ''.join(f" {size / 1024:>7.1f} KiB" for size in sizes)
+            + f" {'yes' if same_pixels else 'NO':>5}"
+        )
+
+    print(
+        f"{'total':<24}"
+        + ''.join(f" {size / 1024:>7.1f} KiB" for size in totals)
+    )
+
+    print()
+    print("eager: surfaces created in advance (the default mode)")
+    print("lazy: surfaces created in advance with lazy surface variants")
+    print("lazy (all): the same plus every variant produced on demand")
+
+
+if __name__ == '__main__':
+    print_report()
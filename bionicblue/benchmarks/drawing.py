@@ -0,0 +1,162 @@
+"""Benchmark comparing immediate and batched level drawing.
+
+Draws growing numbers of sprites scattered over the screen,
+the way level objects are drawn, measuring the average time
+of each frame when each sprite is blitted as soon as it is
+drawn (Camera.blit) and when sprites are queued and blitted
+in a single call (Camera.queue_blit plus Camera.flush).
+
+Usage:
+
+    python -m bionicblue.benchmarks.drawing [frames]
+"""
+
+### standard library imports
+
+from sys import argv
+
+from time import perf_counter
+
+from random import Random
+
+
+### third-party import
+from pygame import Surface, Rect
+
+
+### local imports
+
+from ..config import COLORKEY
+
+from ..pygamesetup.constants import SCREEN, SCREEN_RECT
+
+from ..atlasman import pack_surfaces
+
+from ..states.levelmanager.camera import Camera
+
+
+
+### numbers of sprites drawn in each frame
+SPRITE_COUNTS = (10, 100, 1000, 5000)
+
+### size of sprites, similar to the one of level tiles and actors
+SPRITE_SIZE = (16, 16)
+
+
+class Sprite:
+    """Object drawn like level objects, with a given blit function."""
+
+    def __init__(self, image, rect, blit):
+
+        self.image = image
+        self.rect = rect
+        self.blit = blit
+
+    def draw(self):
+        self.blit(self.image, self.rect)
+
+
+def get_sprite_surfaces(quantity=8):
+    """Return surfaces with colorkey, packed into an atlas page."""
+
+    surfaces = []
+
+    for index in range(quantity):
+
+        surf = Surface(SPRITE_SIZE).convert()
+
+        surf.fill(COLORKEY)
+        surf.set_colorkey(COLORKEY)
+
+        surf.fill((index * 30, 100, 200), (2, 2, 12, 12))
+
+        surfaces.append(surf)
+
+    return pack_surfaces(surfaces)
+
+
+def get_sprites(count, blit, surfaces):
+    """Return sprites scattered over the screen.
+
+    A random generator with a fixed seed is used, so each
+    approach draws exactly the same sprites.
+    """
+    rng = Random(count)
+
+    width, height = SCREEN_RECT.size
+    sprite_width, sprite_height = SPRITE_SIZE
+
+    return [
+
+        Sprite(
+            rng.choice(surfaces),
+            Rect(
+                (
+                    rng.randrange(width - sprite_width),
+                    rng.randrange(height - sprite_height),
+                ),
+                SPRITE_SIZE,
+            ),
+            blit,
+        )
+
+        for _ in range(count)
+
+    ]
+
+
+def time_frames(sprites, flush, frames):
+    """Return average time in seconds to draw all sprites."""
+
+    SCREEN.fill('black')
+
+    start = perf_counter()
+
+    for _ in range(frames):
+
+        for sprite in sprites:
+            sprite.draw()
+
+        flush()
+
+    return (perf_counter() - start) / frames
+
+
+def run_benchmark(frames=200):
+    """Print frame times of immediate and batched drawing."""
+
+    camera = Camera()
+    surfaces = get_sprite_surfaces()
+
+    print(f"Average time per frame over {frames} frames")
+    print(f"{'sprites':>8} {'immediate':>12} {'batched':>12} {'speedup':>8}")
+
+    for count in SPRITE_COUNTS:
+
+        ### immediate drawing
+
+        sprites = get_sprites(count, camera.blit, surfaces)
+        immediate_time = time_frames(sprites, camera.flush, frames)
+
+        immediate_pixels = SCREEN.copy()
+
+        ### batched drawing
+
+        sprites = get_sprites(count, camera.queue_blit, surfaces)
+        batched_time = time_frames(sprites, camera.flush, frames)
+
+        ### make sure both approaches produce the same frame
+
+        if SCREEN.get_view('2').raw != immediate_pixels.get_view('2').raw:
+            raise RuntimeError(f"Batched frame differs for {count} sprites")
+
+        print(
+            f"{count:>8}"
+            f" {immediate_time * 1000:>9.3f} ms"
+            f" {batched_time * 1000:>9.3f} ms"
+            f" {immediate_time / batched_time:>7.2f}x"
+        )
+
+
+if __name__ == '__main__':
+    run_benchmark(*map(int, argv[1:2]))
@@ -0,0 +1,201 @@
+"""Benchmark measuring simulation throughput of the level.
+
+Runs the level with no window, no sound and no frame cap, as
+fast as the CPU allows, using the services of the headless
+mode. The player is driven by a simple scripted input, which
+is the same in every run, so results are comparable.
+
+Reports frames per second and percentiles of the time taken
+by each frame (control, update and draw of the level).
+
+Usage:
+
+    python -m bionicblue.benchmarks.headless [frames [warmup_frames]]
+
+Warm-up frames are run before measuring, so that animations
+processed on demand don't distort the results.
+"""
+
+### standard library imports
+
+from os import environ
+
+from sys import argv
+
+from time import perf_counter
+
+
+### use dummy video/audio drivers, so no display or sound device is
+### needed; this must be done before pygame is initialized, which
+### happens when the pygamesetup package is imported
+
+environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+
+### third-party import
+from pygame.locals import KEYDOWN, KEYUP, KMOD_NONE
+
+
+### local imports
+
+from ..config import REFS
+
+from ..userprefsman.main import KEYBOARD_CONTROLS
+
+from ..pygamesetup import SERVICES_NS
+
+from ..pygamesetup.services import headless
+
+from ..pygamesetup.gamepaddirect import setup_gamepad_if_existent
+
+from ..states import setup_states
+
+from ..exceptions import SwitchStateException
+
+
+
+### percentiles of frame times reported
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def get_input_script(no_of_frames):
+    """Return maps with events and pressed keys for each frame.
+
+    The player walks right and left in cycles of 300 frames,
+    shooting every 7 frames and jumping every 45 frames.
+    """
+    right, left, shoot, jump = (
+        KEYBOARD_CONTROLS[action]
+        for action in ('right', 'left', 'shoot', 'jump')
+    )
+
+    frame_to_events = {}
+    frame_to_pressed_keys = {}
+
+    for frame_index in range(no_of_frames):
+
+        cycle_index = frame_index % 300
+
+        if 60 < cycle_index < 250:
+            frame_to_pressed_keys[frame_index] = (right,)
+
+        elif cycle_index > 260:
+            frame_to_pressed_keys[frame_index] = (left,)
+
+        events = []
+
+        if frame_index % 7 == 0:
+            events.append((KEYDOWN, get_key_event_dict(shoot)))
+
+        elif frame_index % 7 == 3:
+            events.append((KEYUP, get_key_event_dict(shoot)))
+
+        if frame_index % 45 == 0:
+            events.append((KEYDOWN, get_key_event_dict(jump)))
+
+        if events:
+            frame_to_events[frame_index] = events
+
+    return frame_to_events, frame_to_pressed_keys
+
+
+def get_key_event_dict(key):
+    """Return attributes of a key event for the given key."""
+    return {'key': key, 'mod': KMOD_NONE, 'unicode': '', 'scancode': 0}
+
+
+def load_resources():
+    """Load resources of the game like the resource loader state does."""
+
+    resource_loader = REFS.states.resource_loader
+
+    try:
+
+        while True:
+            resource_loader.update()
+
+    except SwitchStateException:
+        pass
+
+
+def get_percentile(sorted_values, percentile):
+    """Return value at percentile of sorted values (nearest rank)."""
+
+    index = round(percentile / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+def run_benchmark(frames=3000, warmup_frames=100):
+    """Print throughput and frame time percentiles of the level."""
+
+    setup_states()
+    setup_gamepad_if_existent()
+
+    headless.set_behaviour(SERVICES_NS)
+    headless.set_input_script(*get_input_script(warmup_frames + frames))
+
+    ### load resources and prepare level
+
+    start = perf_counter()
+    load_resources()
+    loading_time = perf_counter() - start
+
+    level_manager = REFS.states.level_manager
+    level_manager.prepare()
+
+    ### run frames, measuring the time of each one after the warm-up
+
+    frame_checkups = SERVICES_NS.frame_checkups
+
+    control = level_manager.control
+    update = level_manager.update
+    draw = level_manager.draw
+
+    for _ in range(warmup_frames):
+
+        frame_checkups()
+
+        control()
+        update()
+        draw()
+
+    frame_times = []
+    append_time = frame_times.append
+
+    start = perf_counter()
+
+    for _ in range(frames):
+
+        frame_start = perf_counter()
+
+        frame_checkups()
+
+        control()
+        update()
+        draw()
+
+        append_time(perf_counter() - frame_start)
+
+    total_time = perf_counter() - start
+
+    ### report
+
+    frame_times.sort()
+
+    print(f"Resources loaded in {loading_time:.3f} s")
+    print(f"Simulated {frames} frames (after {warmup_frames} warm-up frames)")
+    print(f"in {total_time:.3f} s: {frames / total_time:.1f} frames per second")
+    print()
+    print("Frame time:")
+
+    for percentile in PERCENTILES:
+
+        value = get_percentile(frame_times, percentile)
+        print(f"  p{percentile:<5} {value * 1000:8.3f} ms")
+
+    print(f"  max    {frame_times[-1] * 1000:8.3f} ms")
+
+
+if __name__ == '__main__':
+    run_benchmark(*map(int, argv[1:3]))
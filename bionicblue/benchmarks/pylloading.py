@@ -0,0 +1,110 @@
+"""Benchmark comparing ways of loading python literal files.
+
+Compares parsing each python literal file in the data directory
+with ast.literal_eval() against loading it from its marshal
+sidecar file. Sidecar files are stored in a temporary
+directory, so the cache of the game isn't touched.
+
+Usage:
+
+    python -m bionicblue.benchmarks.pylloading [repetitions]
+"""
+
+### standard library imports
+
+from sys import argv
+
+from time import perf_counter
+
+from pathlib import Path
+
+from tempfile import TemporaryDirectory
+
+
+### local imports
+
+from ..config import DATA_DIR
+
+from ..ourstdlibs.pyl import (
+    set_sidecar_dir,
+    load_pyl,
+    load_pyl_from_source,
+)
+
+
+
+### suffixes of data files containing python literals
+PYL_SUFFIXES = frozenset(('.pyl', '.pxa', '.pos', '.lvl'))
+
+
+def get_pyl_paths():
+    """Return sorted paths of python literal files in data dir."""
+
+    return sorted(
+        path
+        for path in DATA_DIR.rglob('*')
+        if path.suffix.lower() in PYL_SUFFIXES
+    )
+
+
+def time_loading(load, paths, repetitions):
+    """Return average time in seconds to load all paths."""
+
+    start = perf_counter()
+
+    for _ in range(repetitions):
+
+        for path in paths:
+            load(path)
+
+    return (perf_counter() - start) / repetitions
+
+
+def run_benchmark(repetitions=10):
+    """Print time taken to load data files with each approach."""
+
+    paths = get_pyl_paths()
+    total_size = sum(path.stat().st_size for path in paths)
+
+    print(
+        f"Loading {len(paths)} files ({total_size / 1024:.1f} KiB),"
+        f" average of {repetitions} repetitions"
+    )
+
+    with TemporaryDirectory() as temp_dir:
+
+        set_sidecar_dir(Path(temp_dir), DATA_DIR)
+
+        try:
+
+            ### generate sidecars, timing it as well, since it is
+            ### what happens on the first run of the game
+
+            first_load_time = time_loading(load_pyl, paths, 1)
+
+            source_time = time_loading(
+                load_pyl_from_source,
+                paths,
+                repetitions,
+            )
+
+            sidecar_time = time_loading(load_pyl, paths, repetitions)
+
+            ### make sure both approaches produce the same data
+
+            for path in paths:
+
+                if load_pyl(path) != load_pyl_from_source(path):
+                    raise RuntimeError(f"Sidecar data differs for {path}")
+
+        finally:
+            set_sidecar_dir(None)
+
+    print(f"literal_eval:             {source_time * 1000:9.2f} ms")
+    print(f"marshal sidecar (first):  {first_load_time * 1000:9.2f} ms")
+    print(f"marshal sidecar:          {sidecar_time * 1000:9.2f} ms")
+    print(f"speedup:                  {source_time / sidecar_time:9.1f}x")
+
+
+if __name__ == '__main__':
+    run_benchmark(*map(int, argv[1:2]))
@@ -0,0 +1,490 @@
+"""Benchmark replaying recorded sessions of the level.
+
+Each recorded session (file saved by the record mode) in
+the given directory is played with the services of the play
+mode, with no window and no frame cap, starting from the
+beginning of the level. Since the level is prepared the same
+way every time, sessions must have been recorded from the
+beginning of the level for the gameplay to be reproduced.
+
+Each session is played in a separate process, so sessions
+don't affect each other (objects left in the level, memory
+peaks, etc.). For each session, the time taken by the control,
+update and draw phases of each frame is measured, as well as
+the number of objects in the level, the usage of object pools
+and the memory peak of the process.
+
+The results are written in a JSON report. If a baseline report
+is given, the results are compared with it, and phases whose
+average time grew more than the threshold are reported as
+regressions (the exit status is 1 in that case).
+
+Usage:
+
+    python -m bionicblue.benchmarks.replay SESSIONS_DIR
+        [--output REPORT] [--baseline BASELINE]
+        [--update-baseline] [--threshold FRACTION]
+"""
+
+### standard library imports
+
+from sys import argv, executable, exit as exit_with_status
+
+from time import perf_counter
+
+from pathlib import Path
+
+from json import dumps, loads
+
+from argparse import ArgumentParser, SUPPRESS
+
+from subprocess import run
+
+from tempfile import TemporaryDirectory
+
+from platform import python_version
+
+try:
+    from resource import getrusage, RUSAGE_SELF
+
+### the resource module isn't available on Windows
+except ImportError:
+    getrusage = None
+
+
+### local imports; the headless benchmark is imported first, since
+### it sets the dummy video/audio drivers before pygame is initialized
+
+from .headless import load_resources, get_percentile
+
+from ..config import (
+    REFS,
+    BACK_PROPS_ON_SCREEN,
+    MIDDLE_PROPS_ON_SCREEN,
+    BLOCKS_ON_SCREEN,
+    ACTORS,
+    ACTORS_ON_SCREEN,
+    PROJECTILES,
+    FRONT_PROPS,
+)
+
+from ..ourstdlibs.behaviour import do_nothing
+
+from ..pygamesetup import SERVICES_NS
+
+from ..pygamesetup.services import play
+
+from ..pygamesetup.sessionfile import SESSION_SUFFIXES
+
+from ..pygamesetup.gamepaddirect import setup_gamepad_if_existent
+
+from ..states import setup_states
+
+from ..states.levelmanager import get_pool_stats
+
+from ..exceptions import SwitchStateException, SwitchModeException
+
+
+
+### must be incremented whenever the format of the report changes
+REPORT_FORMAT_VERSION = 1
+
+### phases of each frame which are timed
+PHASE_NAMES = ('control', 'update', 'draw')
+
+### percentiles of phase times reported
+PERCENTILES = (50, 90, 99)
+
+### collections of level objects whose sizes are sampled every frame
+COUNTED_COLLECTIONS = (
+    ('back_props_on_screen', BACK_PROPS_ON_SCREEN),
+    ('middle_props_on_screen', MIDDLE_PROPS_ON_SCREEN),
+    ('blocks_on_screen', BLOCKS_ON_SCREEN),
+    ('actors', ACTORS),
+    ('actors_on_screen', ACTORS_ON_SCREEN),
+    ('projectiles', PROJECTILES),
+    ('front_props', FRONT_PROPS),
+)
+
+### fraction by which an average phase time may grow before being
+### reported as a regression
+DEFAULT_THRESHOLD = 0.1
+
+
+### session replaying (done in a child process)
+
+def replay_session(session_path):
+    """Return results of replaying session from start of level."""
+
+    setup_states()
+    setup_gamepad_if_existent()
+
+    load_resources()
+
+    state = REFS.states.level_manager
+    state.prepare()
+
+    rss_after_loading = get_max_rss()
+
+    ### play session as fast as possible, without showing anything;
+    ### snapshots for seeking frames aren't taken, so only the work of
+    ### the game itself is measured
+
+    play.set_behaviour(
+        SERVICES_NS,
+        session_path=session_path,
+        playback_speed=0,
+        take_snapshots=False,
+    )
+    SERVICES_NS.update_screen = do_nothing
+
+    phase_times = {name: [] for name in PHASE_NAMES}
+
+    append_control_time, append_update_time, append_draw_time = (
+        phase_times[name].append
+        for name in PHASE_NAMES
+    )
+
+    counts = {name: [] for name, _ in COUNTED_COLLECTIONS}
+
+    count_appending_pairs = [
+        (counts[name].append, collection)
+        for name, collection in COUNTED_COLLECTIONS
+    ]
+
+    frame_checkups = SERVICES_NS.frame_checkups
+
+    start = perf_counter()
+
+    try:
+
+        while True:
+
+            try:
+
+                while True:
+
+                    frame_checkups()
+
+                    t0 = perf_counter()
+                    state.control()
+
+                    t1 = perf_counter()
+                    state.update()
+
+                    t2 = perf_counter()
+                    state.draw()
+
+                    t3 = perf_counter()
+
+                    append_control_time(t1 - t0)
+                    append_update_time(t2 - t1)
+                    append_draw_time(t3 - t2)
+
+                    for append_count, collection in count_appending_pairs:
+                        append_count(len(collection))
+
+            except SwitchStateException as obj:
+                state = obj.state
+
+    ### the play mode switches back to the normal mode once the last
+    ### frame of the session is reached
+    except SwitchModeException:
+        pass
+
+    total_time = perf_counter() - start
+
+    ### gather results
+
+    frame_times = [sum(times) for times in zip(*phase_times.values())]
+
+    return {
+        'frames': len(frame_times),
+        'total_s': total_time,
+        'frame': get_time_stats(frame_times),
+        'phases': {
+            name: get_time_stats(times)
+            for name, times in phase_times.items()
+        },
+        'object_counts': {
+            name: {
+                'max': max(values, default=0),
+                'mean': sum(values) / len(values) if values else 0,
+            }
+            for name, values in counts.items()
+        },
+        ### final position of the player, so changes in the gameplay
+        ### (which make timings incomparable) can be noticed
+        'player_rect': tuple(REFS.states.level_manager.player.rect),
+
+        'object_pools': get_pool_stats(),
+
+        'max_rss_kib_after_loading': rss_after_loading,
+        'max_rss_kib': get_max_rss(),
+    }
+
+
+def get_time_stats(times):
+    """Return map with statistics of times, in milliseconds."""
+
+    if not times:
+        return {}
+
+    sorted_times = sorted(times)
+
+    stats = {
+        'mean_ms': sum(times) / len(times) * 1000,
+        'total_ms': sum(times) * 1000,
+        'max_ms': sorted_times[-1] * 1000,
+    }
+
+    for percentile in PERCENTILES:
+        stats[f'p{percentile}_ms'] = (
+            get_percentile(sorted_times, percentile) * 1000
+        )
+
+    return stats
+
+
+def get_max_rss():
+    """Return memory peak of the process in KiB, if available."""
+
+    if getrusage is None:
+        return None
+
+    ### on Linux ru_maxrss is already in KiB
+    return getrusage(RUSAGE_SELF).ru_maxrss
+
+
+### report generation (done in the parent process)
+
+def get_report(sessions_dir):
+    """Return report with results of replaying each session."""
+
+    session_paths = sorted(
+        path
+        for path in Path(sessions_dir).iterdir()
+        if path.suffix in SESSION_SUFFIXES
+    )
+
+    if not session_paths:
+        raise FileNotFoundError(f"No recorded sessions in {sessions_dir}")
+
+    sessions = {}
+
+    with TemporaryDirectory() as temp_dir:
+
+        for session_path in session_paths:
+
+            print(f"Replaying {session_path.name}...")
+
+            result_path = Path(temp_dir) / 'result.json'
+
+            run(
+                [
+                    executable,
+                    '-m', __spec__.name,
+                    '--replay-session', str(session_path.resolve()),
+                    '--result', str(result_path),
+                ],
+                cwd=Path(__file__).parents[2],
+                check=True,
+            )
+
+            sessions[session_path.name] = loads(result_path.read_text())
+
+    return {
+        'format_version': REPORT_FORMAT_VERSION,
+        'python_version': python_version(),
+        'sessions': sessions,
+    }
+
+
+def compare_with_baseline(report, baseline, threshold):
+    """Print comparison between report and baseline.
+
+    Returns list of (session, phase) pairs whose average time
+    grew more than the threshold (a fraction).
+    """
+    regressions = []
+
+    print()
+    print(
+        f"{'session':<40} {'phase':<8}"
+        f" {'baseline':>10} {'current':>10} {'change':>8}"
+    )
+
+    for session_name, results in report['sessions'].items():
+
+        try:
+            baseline_results = baseline['sessions'][session_name]
+
+        except KeyError:
+
+            print(f"{session_name:<40} (not in baseline)")
+            continue
+
+        if results['player_rect'] != baseline_results['player_rect']:
+            print(f"{session_name:<40} (gameplay differs from baseline)")
+
+        for phase_name in ('frame', *PHASE_NAMES):
+
+            if phase_name == 'frame':
+
+                current = results['frame']
+                previous = baseline_results['frame']
+
+            else:
+
+                current = results['phases'][phase_name]
+                previous = baseline_results['phases'][phase_name]
+
+            if not current or not previous:
+                continue
+
+            current_ms = current['mean_ms']
+            previous_ms = previous['mean_ms']
+
+            change = (current_ms - previous_ms) / previous_ms
+
+            regressed = change > threshold
+
+            if regressed:
+                regressions.append((session_name, phase_name))
+
+            print(
+                f"{session_name:<40} {phase_name:<8}"
+                f" {previous_ms:>7.3f} ms {current_ms:>7.3f} ms"
+                f" {change:>+7.1%}"
+                + (" REGRESSION" if regressed else "")
+            )
+
+    return regressions
+
+
+def print_summary(report):
+    """Print main results of each session in report."""
+
+    for session_name, results in report['sessions'].items():
+
+        print()
+        print(f"{session_name}: {results['frames']} frames")
+
+        for phase_name in ('frame', *PHASE_NAMES):
+
+            stats = (
+                results['frame']
+                if phase_name == 'frame'
+                else results['phases'][phase_name]
+            )
+
+            if stats:
+
+                print(
+                    f"  {phase_name:<8}"
+                    f" mean {stats['mean_ms']:7.3f} ms"
+                    f"  p99 {stats['p99_ms']:7.3f} ms"
+                )
+
+        print(f"  max rss  {results['max_rss_kib']} KiB")
+
+
+def main(args):
+    """Run benchmark according to command line arguments."""
+
+    parser = ArgumentParser(
+        prog='python -m bionicblue.benchmarks.replay',
+        description="Replay recorded sessions and report timings.",
+    )
+
+    parser.add_argument('sessions_dir', nargs='?', type=Path)
+
+    parser.add_argument(
+        '--output',
+        type=Path,
+        default=Path('replay_report.json'),
+        help="path wherein to write the JSON report",
+    )
+
+    parser.add_argument(
+        '--baseline',
+        type=Path,
+        help="path of JSON report to compare results with",
+    )
+
+    parser.add_argument(
+        '--update-baseline',
+        action='store_true',
+        help="write the report on the baseline path as well",
+    )
+
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="growth of average times reported as regression",
+    )
+
+    ### arguments used to replay a single session in a child process
+
+    parser.add_argument('--replay-session', type=Path, help=SUPPRESS)
+    parser.add_argument('--result', type=Path, help=SUPPRESS)
+
+    options = parser.parse_args(args)
+
+    if options.replay_session is not None:
+
+        options.result.write_text(
+            dumps(replay_session(options.replay_session))
+        )
+
+        return 0
+
+    if options.sessions_dir is None:
+        parser.error("the sessions directory is required")
+
+    ### replay sessions and write report
+
+    report = get_report(options.sessions_dir)
+    report_text = dumps(report, indent=2)
+
+    options.output.write_text(report_text)
+
+    print_summary(report)
+    print()
+    print(f"Report written in {options.output}")
+
+    ### compare with baseline, if there's one
+
+    regressions = []
+
+    if options.baseline is not None:
+
+        if options.update_baseline:
+
+            options.baseline.write_text(report_text)
+            print(f"Baseline updated in {options.baseline}")
+
+        elif options.baseline.exists():
+
+            baseline = loads(options.baseline.read_text())
+
+            if baseline.get('format_version') != REPORT_FORMAT_VERSION:
+                print(f"Baseline {options.baseline} has another format, skipping comparison")
+
+            else:
+
+                regressions = compare_with_baseline(
+                    report,
+                    baseline,
+                    options.threshold,
+                )
+
+        else:
+            print(f"Baseline {options.baseline} not found, skipping comparison")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    exit_with_status(main(argv[1:]))
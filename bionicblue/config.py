@@ -1,6 +1,9 @@
 """General configuration for game."""
 
-### standard library import
+### standard library imports
+
+from os import cpu_count
+
 from pathlib import Path
 
 
@@ -11,9 +14,18 @@ from pygame import quit as quit_pygame
 from pygame.system import get_pref_path
 
 
-### local import
+### local imports
+
 from .appinfo import ORG_DIR_NAME, APP_DIR_NAME 
 
+from .ourstdlibs.spatialgrid import SpatialGrid
+
+from .ourstdlibs.pyl import set_sidecar_dir, discard_stale_sidecars
+
+from .ourstdlibs.lazymap import LazyLRUMap
+
+from .ourstdlibs.timerwheel import TimerWheel
+
 
 ###
 COLORKEY = (192, 192, 192)
@@ -63,14 +75,33 @@ BLOCKS_ON_SCREEN = set()
 ACTORS_ON_SCREEN = set()
 MIDDLE_PROPS_ON_SCREEN = set()
 
+### grids indexing the objects of each layer by their position in
+### level coordinates, used to find which ones are on the screen
+
+BACK_PROPS_GRID = SpatialGrid()
+MIDDLE_PROPS_GRID = SpatialGrid()
+BLOCKS_GRID = SpatialGrid()
+ACTORS_GRID = SpatialGrid()
+
 ###
 
 TASKS = []
 append_task = TASKS.append
 clear_tasks = TASKS.clear
 
+### scheduler for callbacks to be called a number of frames ahead
+### (see the timerwheel module); it ticks once per frame of the
+### level, when tasks are executed
+
+FRAME_SCHEDULER = TimerWheel()
+schedule_callback = FRAME_SCHEDULER.schedule
+
 def execute_tasks():
 
+    ### call callbacks due in this frame first, since they may
+    ### append tasks as well
+    FRAME_SCHEDULER.tick()
+
     if TASKS:
 
         for task in TASKS:
@@ -97,7 +128,10 @@ ALPHA_IMAGES_DIR = IMAGES_DIR  / 'alpha'
 ###
 
 SURF_MAP = {}
-ANIM_DATA_MAP = {}
+
+## animations missing from this map are processed when requested
+ANIM_DATA_MAP = LazyLRUMap()
+
 SOUND_MAP = {}
 
 ###
@@ -114,6 +148,149 @@ if not SAVE_SLOTS_DIR.exists():
     except Exception as err:
         print("Couldn't create folder for save slots")
 
+### cached data derived from the game files, which can be safely
+### deleted, since it is regenerated as needed
+
+CACHE_DIR = WRITEABLE_PATH / 'cache'
+SPRITE_CACHE_DIR = CACHE_DIR / 'sprites'
+PYL_CACHE_DIR = CACHE_DIR / 'pyl'
+
+### samples of frame timers (see the instrumentation module) are
+### saved here
+INSTRUMENTATION_DIR = WRITEABLE_PATH / 'instrumentation'
+
+### profiles captured during gameplay (see the profiling module) are
+### saved here
+PROFILES_DIR = WRITEABLE_PATH / 'profiles'
+
+### sessions recorded by the record mode are saved here, along with
+### an index of them (see the pygamesetup/recordings.py module)
+RECORDINGS_DIR = WRITEABLE_PATH / 'recordings'
+
+
+### performance options
+
+## whether to store the sprites rendered from .pxa files on disk,
+## so they don't need to be rendered again on the next runs
+CACHE_ANIMATION_SPRITES = True
+
+## whether to store python literals loaded from data files in marshal
+## format, which is much quicker to load than parsing the files again;
+## only files of the game data are cached, rather than files saved by
+## the game (like user preferences or recordings)
+CACHE_PYL_FILES = True
+
+if CACHE_PYL_FILES:
+
+    set_sidecar_dir(PYL_CACHE_DIR, DATA_DIR)
+    discard_stale_sidecars()
+
+## whether to paint and recolor animation sprites using numpy arrays,
+## which is much quicker; only used if numpy is installed
+USE_NUMPY_FOR_SPRITES = True
+
+## whether to pack the sprites of each animation (and the surfaces of
+## level tiles) into a few large surfaces, rather than keeping each
+## one as a separate surface
+PACK_SPRITES_IN_ATLASES = True
+
+## whether to process animations only when first needed (or preloaded
+## by the level), instead of processing all of them when the game starts
+LAZY_ANIMATION_LOADING = True
+
+## maximum size in bytes of the surfaces of the animations kept in
+## memory; when exceeded, the least recently used animations are
+## discarded (to be processed again if needed); animations used by
+## existing animation players are never discarded, so the budget may
+## be exceeded while they exist; None means no limit
+ANIMATION_DATA_BUDGET = None
+
+ANIM_DATA_MAP.budget = ANIMATION_DATA_BUDGET
+
+## whether to read and parse resource files in worker threads while
+## loading the game (and animations preloaded by levels, which is how
+## animations are loaded when LAZY_ANIMATION_LOADING is on), and how
+## many threads to use
+LOAD_RESOURCES_IN_PARALLEL = True
+RESOURCE_LOADING_WORKERS = min(8, cpu_count() or 1)
+
+## whether level objects submit their surfaces to a render queue which
+## blits each layer of the level at once, instead of blitting each
+## surface as soon as it is drawn
+BATCH_LEVEL_DRAWING = True
+
+## whether animation players draw each frame from a table compiled once
+## per animation and surface version, with the surface of each object
+## and its position relative to the root object, instead of positioning
+## each object of the animation every frame
+USE_ANIMATION_FRAME_TABLES = True
+
+## whether identical enemies share a single animation clock, so their
+## animations are advanced once per frame for all of them, rather than
+## once per enemy; enemies then animate in sync (even those which were
+## off-screen) except while their surfaces cycle differently (like when
+## whitened by damage)
+SHARE_ENEMY_ANIMATION_CLOCKS = False
+
+## whether surfaces of recolored versions of animations and flipped
+## surfaces of derived animations are produced only when first needed,
+## instead of creating all of them when processing each animation
+LAZY_SURFACE_VARIANTS = False
+
+## maximum size in bytes of the surfaces produced on demand which are
+## kept in memory; when exceeded, the least recently used ones are
+## discarded (to be produced again if needed); None means no limit
+SURFACE_VARIANTS_BUDGET = 8 * 1024 * 1024
+
+## frame tables keep the surfaces they were compiled with for as long
+## as the animation data is loaded, so surfaces produced on demand and
+## discarded by the budget above would never be freed (and would be
+## produced again as copies); the budget only applies without frame
+## tables, so they are disabled along with shared clocks (which are
+## drawn from frame tables) when surfaces are produced on demand
+
+if LAZY_SURFACE_VARIANTS:
+
+    USE_ANIMATION_FRAME_TABLES = False
+    SHARE_ENEMY_ANIMATION_CLOCKS = False
+
+## number of objects of each kind (per type of charged shot) created
+## in advance when a level starts, to be reused during gameplay instead
+## of creating new ones; more are created if needed
+DEFAULT_PROJECTILE_POOL_CAPACITY = 8
+CHARGED_SHOT_POOL_CAPACITY = 2
+EXPLOSION_POOL_CAPACITY = 4
+
+## maximum number of recorded frames waiting to be written in the
+## session file by the record mode; once reached, recording waits for
+## frames to be written, so memory used doesn't grow when the disk is
+## slower than the game
+RECORDING_BUFFER_FRAMES = 256
+
+## maximum number of frames whose records are grouped in each chunk of
+## session files (at most 65536), and the compression used for chunks
+## (None, 'zlib' or 'lzma')
+RECORDING_CHUNK_FRAMES = 900
+RECORDING_COMPRESSION = 'zlib'
+
+## number of frames between snapshots of the game state taken by the
+## play mode, from which it can seek frames of the session quickly
+PLAYBACK_SNAPSHOT_INTERVAL = 300
+
+## maximum number of snapshots kept by the play mode; whenever it is
+## exceeded, every other snapshot is discarded and the interval between
+## them is doubled, so they keep covering the whole session evenly while
+## their memory usage stays bounded
+PLAYBACK_MAX_SNAPSHOTS = 64
+
+## number of frames ahead of the one being played which the play mode
+## decodes from the session file at once
+PLAYBACK_LOOKAHEAD_FRAMES = 30
+
+## number of most recent frames whose timings are kept when frame
+## timers are enabled (see the instrumentation module)
+FRAME_TIMING_SAMPLES = 1800
+
 
 ###
 
@@ -0,0 +1,225 @@
+"""Facility for measuring where the time of each frame goes.
+
+Named timers are started and stopped around parts of the frame
+(the control, update and draw phases of the current state, the
+layers of the level, etc.) using the functions stored in the
+TIMERS_NS namespace:
+
+    TIMERS_NS.start('update.actors')
+    ...
+    TIMERS_NS.stop('update.actors')
+
+At the end of each frame, the time measured by each timer is
+stored as a sample in a ring buffer, which only keeps the most
+recent frames.
+
+Timers are disabled by default, in which case the functions in
+the namespace do nothing, so the overhead is just that of
+calling them. They can be toggled with the F10 key while playing
+in normal mode. When they are disabled again, the samples are
+saved in CSV and JSON formats in the instrumentation directory.
+"""
+
+### standard library imports
+
+from collections import deque
+
+from time import perf_counter
+
+from datetime import datetime
+
+from csv import writer as csv_writer
+
+from json import dumps
+
+
+### third-party imports
+
+from pygame.locals import K_F10
+
+from pygame.key import get_pressed
+
+
+### local imports
+
+from .config import INSTRUMENTATION_DIR, FRAME_TIMING_SAMPLES
+
+from .ourstdlibs.behaviour import do_nothing
+
+from .pygamesetup.constants import GENERAL_NS
+
+
+
+### key used to toggle the timers
+TOGGLING_KEY = K_F10
+
+### ring buffer of samples; each sample is a (frame_index, timings)
+### pair, where timings maps names of timers to seconds elapsed
+SAMPLES = deque(maxlen=FRAME_TIMING_SAMPLES)
+
+### times wherein timers were started and timings of the current frame
+START_TIMES = {}
+CURRENT_TIMINGS = {}
+
+### namespace holding the functions used to operate the timers, as
+### well as whether they are enabled and whether their key was pressed
+TIMERS_NS = type('Object', (), {})()
+TIMERS_NS.enabled = False
+TIMERS_NS.key_was_pressed = False
+
+
+
+### timer operations
+
+def ignore_timer(name):
+    """Do nothing; used in place of timer operations when disabled."""
+
+
+def start_timer(name):
+    """Start timer with given name."""
+    START_TIMES[name] = perf_counter()
+
+def stop_timer(name):
+    """Stop timer with given name, adding elapsed time to the frame.
+
+    The same timer may be started and stopped several times in a
+    frame, in which case the time elapsed is accumulated.
+    """
+    elapsed = perf_counter() - START_TIMES[name]
+    CURRENT_TIMINGS[name] = CURRENT_TIMINGS.get(name, 0.0) + elapsed
+
+def end_frame():
+    """Store timings of the frame as a sample and reset them."""
+    SAMPLES.append((GENERAL_NS.frame_index, CURRENT_TIMINGS.copy()))
+    CURRENT_TIMINGS.clear()
+
+
+### enabling/disabling timers
+
+def enable_timers():
+    """Make timers measure time and store samples."""
+
+    SAMPLES.clear()
+    START_TIMES.clear()
+    CURRENT_TIMINGS.clear()
+
+    TIMERS_NS.start = start_timer
+    TIMERS_NS.stop = stop_timer
+    TIMERS_NS.end_frame = end_frame
+
+    TIMERS_NS.enabled = True
+
+def disable_timers():
+    """Make timers do nothing."""
+
+    TIMERS_NS.start = TIMERS_NS.stop = ignore_timer
+    TIMERS_NS.end_frame = do_nothing
+
+    TIMERS_NS.enabled = False
+
+def toggle_timers():
+    """Enable timers or disable them, saving the samples."""
+
+    if TIMERS_NS.enabled:
+
+        disable_timers()
+
+        if SAMPLES:
+
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+            save_samples_as_csv(
+                INSTRUMENTATION_DIR / f'frame_timers.{timestamp}.csv'
+            )
+
+            save_samples_as_json(
+                INSTRUMENTATION_DIR / f'frame_timers.{timestamp}.json'
+            )
+
+    else:
+        enable_timers()
+
+def check_toggling_key():
+    """Toggle timers when their key is pressed.
+
+    Meant to be called once per frame. Uses the state of the
+    key rather than events, so that events are left untouched
+    for the states of the game.
+    """
+    pressed = get_pressed()[TOGGLING_KEY]
+
+    if pressed and not TIMERS_NS.key_was_pressed:
+        toggle_timers()
+
+    TIMERS_NS.key_was_pressed = pressed
+
+### timers start disabled
+disable_timers()
+
+
+### saving samples
+
+def get_timer_names():
+    """Return names of timers in samples, in order of appearance."""
+
+    names = {}
+
+    for _, timings in SAMPLES:
+        names.update(dict.fromkeys(timings))
+
+    return list(names)
+
+def save_samples_as_csv(filepath):
+    """Save samples in CSV file, with times in milliseconds.
+
+    Each row has the frame index followed by the time of each
+    timer; timers not used in a frame are left empty.
+    """
+    names = get_timer_names()
+
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(str(filepath), mode='w', encoding='utf-8', newline='') as f:
+
+        write_row = csv_writer(f).writerow
+
+        write_row(['frame_index', *names])
+
+        for frame_index, timings in SAMPLES:
+
+            write_row([
+                frame_index,
+                *(
+                    (
+                        f'{timings[name] * 1000:.4f}'
+                        if name in timings
+                        else ''
+                    )
+                    for name in names
+                ),
+            ])
+
+def save_samples_as_json(filepath):
+    """Save samples in JSON file, with times in milliseconds."""
+
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    filepath.write_text(
+        dumps(
+            {
+                'timer_names': get_timer_names(),
+                'samples': [
+                    {
+                        'frame_index': frame_index,
+                        'timings_ms': {
+                            name: seconds * 1000
+                            for name, seconds in timings.items()
+                        },
+                    }
+                    for frame_index, timings in SAMPLES
+                ],
+            },
+            indent=1,
+        ),
+        encoding='utf-8',
+    )
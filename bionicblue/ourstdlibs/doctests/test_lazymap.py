@@ -0,0 +1,111 @@
+"""Facility for lazymap module doctests.
+
+LazyLRUMap usage
+****************
+
+The LazyLRUMap class works like a dict whose values are
+loaded on demand. Let's create one which loads the length
+of the keys, printing a message whenever it does so.
+
+>>> from ..lazymap import LazyLRUMap
+
+>>> def load_length(key):
+...     print(f'loading {key}')
+...     return len(key)
+
+>>> lengths = LazyLRUMap(load_length)
+>>> lengths['abc']
+loading abc
+3
+
+Values already loaded are just returned.
+
+>>> lengths['abc']
+3
+
+If a budget is provided, the least recently used values are
+discarded whenever the total cost of the values exceeds it.
+Here each value costs as much as the value itself.
+
+>>> lengths = LazyLRUMap(load_length, get_cost=lambda value: value, budget=6)
+>>> lengths.preload(('aa', 'bb'))
+loading aa
+loading bb
+>>> lengths.total_cost
+4
+
+Accessing "aa" makes it the most recently used value, so
+loading "ccc" discards "bb" instead.
+
+>>> lengths['aa']
+2
+>>> lengths['ccc']
+loading ccc
+3
+>>> list(lengths), lengths.total_cost
+(['aa', 'ccc'], 5)
+
+Discarded values are loaded again when needed.
+
+>>> lengths['bb']
+loading bb
+2
+>>> list(lengths)
+['ccc', 'bb']
+
+The most recently used value is kept even if it alone
+exceeds the budget.
+
+>>> lengths['abcdefgh']
+loading abcdefgh
+8
+>>> list(lengths), lengths.total_cost
+(['abcdefgh'], 8)
+
+Values still in use aren't discarded, even when least recently
+used. Here a set tells which values are in use.
+
+>>> in_use = {2}
+>>> lengths = LazyLRUMap(
+...     load_length,
+...     get_cost=lambda value: value,
+...     budget=6,
+...     is_in_use=in_use.__contains__,
+... )
+>>> lengths.preload(('aa', 'bbb', 'cc'))
+loading aa
+loading bbb
+loading cc
+>>> list(lengths), lengths.total_cost
+(['aa', 'cc'], 4)
+
+Once no longer in use, they are discarded as usual.
+
+>>> in_use.clear()
+>>> lengths['dddd']
+loading dddd
+4
+>>> list(lengths), lengths.total_cost
+(['cc', 'dddd'], 6)
+
+Without a loader, missing keys raise KeyError as usual.
+
+>>> LazyLRUMap()['missing']
+Traceback (most recent call last):
+...
+KeyError: 'missing'
+"""
+
+from doctest import DocTestSuite
+
+
+def load_tests(loader, tests, pattern):
+    """Return a test suite.
+
+    This function is used for test discovery and its name,
+    signature and return value are defined by the load_tests
+    protocol described in the standard library unittest
+    module online documentation.
+    """
+    ### return a test suite from the doctests in this module
+    return DocTestSuite()
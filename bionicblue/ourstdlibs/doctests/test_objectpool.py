@@ -0,0 +1,68 @@
+"""Facility for objectpool module doctests.
+
+ObjectPool usage
+****************
+
+Pooled objects are created by a factory and prepared for each
+use by their reset() method.
+
+>>> from ..objectpool import ObjectPool
+
+>>> class Shot:
+...     def __init__(self):
+...         print('creating shot')
+...     def reset(self, speed):
+...         self.speed = speed
+
+>>> pool = ObjectPool(Shot, capacity=2)
+
+Objects can be created in advance, up to the capacity.
+
+>>> pool.fill()
+creating shot
+creating shot
+>>> pool.fill()
+
+Acquiring objects reuses available ones and resets them.
+
+>>> first = pool.acquire(10)
+>>> second = pool.acquire(speed=-10)
+>>> first.speed, second.speed
+(10, -10)
+
+When no object is available, a new one is created, even if
+the capacity was reached.
+
+>>> third = pool.acquire(5)
+creating shot
+
+Released objects are reused.
+
+>>> pool.release(first)
+>>> pool.acquire(7) is first
+True
+>>> first.speed
+7
+
+Statistics show how the pool was used.
+
+>>> stats = pool.get_stats()
+>>> stats['created'], stats['acquired'], stats['misses']
+(3, 4, 1)
+>>> stats['in_use'], stats['peak_in_use'], stats['free']
+(3, 3, 0)
+"""
+
+from doctest import DocTestSuite
+
+
+def load_tests(loader, tests, pattern):
+    """Return a test suite.
+
+    This function is used for test discovery and its name,
+    signature and return value are defined by the load_tests
+    protocol described in the standard library unittest
+    module online documentation.
+    """
+    ### return a test suite from the doctests in this module
+    return DocTestSuite()
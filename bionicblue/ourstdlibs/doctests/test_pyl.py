@@ -0,0 +1,111 @@
+"""Facility for pyl module doctests.
+
+Sidecar files
+*************
+
+Once a sidecar directory is set, python literals loaded from
+files in the given source directory are also stored there in
+marshal format. Let's create temporary directories for the
+source files and sidecars.
+
+>>> from tempfile import TemporaryDirectory
+>>> from pathlib import Path
+>>> from ..pyl import (
+...     load_pyl,
+...     save_pyl,
+...     set_sidecar_dir,
+...     get_sidecar_path,
+...     discard_stale_sidecars,
+... )
+
+>>> source_dir = TemporaryDirectory()
+>>> sidecar_dir = TemporaryDirectory()
+>>> set_sidecar_dir(Path(sidecar_dir.name), Path(source_dir.name))
+
+Loading a file creates its sidecar file.
+
+>>> filepath = Path(source_dir.name) / 'data.pyl'
+>>> save_pyl({'a': [1, 2], 'b': (3.5, None)}, filepath)
+>>> get_sidecar_path(filepath).exists()
+False
+>>> load_pyl(filepath)
+{'a': [1, 2], 'b': (3.5, None)}
+>>> get_sidecar_path(filepath).exists()
+True
+
+Next loads use the sidecar, which produces the same data.
+
+>>> load_pyl(filepath)
+{'a': [1, 2], 'b': (3.5, None)}
+
+When the source file changes, its sidecar is ignored and
+replaced.
+
+>>> save_pyl({'a': [1, 2, 3]}, filepath)
+>>> load_pyl(filepath)
+{'a': [1, 2, 3]}
+
+Broken sidecars are also ignored.
+
+>>> _ = get_sidecar_path(filepath).write_bytes(b'garbage')
+>>> load_pyl(filepath)
+{'a': [1, 2, 3]}
+
+Sidecars mirror the layout of the source directory.
+
+>>> subdir = Path(source_dir.name) / 'subdir'
+>>> subdir.mkdir()
+>>> other_filepath = subdir / 'other.pyl'
+>>> save_pyl([1, 2], other_filepath)
+>>> load_pyl(other_filepath)
+[1, 2]
+>>> sidecar_path = get_sidecar_path(other_filepath)
+>>> sidecar_path.relative_to(sidecar_dir.name).as_posix()
+'subdir/other.pyl.marshal'
+>>> sidecar_path.exists()
+True
+
+Files out of the source directory don't have sidecars.
+
+>>> outer_dir = TemporaryDirectory()
+>>> outer_filepath = Path(outer_dir.name) / 'outer.pyl'
+>>> save_pyl({'c': 4}, outer_filepath)
+>>> load_pyl(outer_filepath)
+{'c': 4}
+>>> get_sidecar_path(outer_filepath) is None
+True
+>>> outer_dir.cleanup()
+
+Sidecars whose source files no longer exist can be discarded,
+along with any other files in the sidecar directory.
+
+>>> other_filepath.unlink()
+>>> _ = (Path(sidecar_dir.name) / 'stray_file').write_bytes(b'')
+>>> discard_stale_sidecars()
+>>> sorted(
+...     path.relative_to(sidecar_dir.name).as_posix()
+...     for path in Path(sidecar_dir.name).rglob('*')
+...     if path.is_file()
+... )
+['data.pyl.marshal']
+
+Finally, let's stop using sidecars and clean up.
+
+>>> set_sidecar_dir(None)
+>>> source_dir.cleanup()
+>>> sidecar_dir.cleanup()
+"""
+
+from doctest import DocTestSuite
+
+
+def load_tests(loader, tests, pattern):
+    """Return a test suite.
+
+    This function is used for test discovery and its name,
+    signature and return value are defined by the load_tests
+    protocol described in the standard library unittest
+    module online documentation.
+    """
+    ### return a test suite from the doctests in this module
+    return DocTestSuite()
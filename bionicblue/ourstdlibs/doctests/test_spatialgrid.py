@@ -0,0 +1,126 @@
+"""Facility for spatialgrid module doctests.
+
+SpatialGrid usage
+*****************
+
+The SpatialGrid class indexes objects by the cells of a
+uniform grid touched by their rects. Let's import it.
+
+>>> from ..spatialgrid import SpatialGrid
+
+The grid only needs the left, top, right and bottom values
+of rects, so instead of pygame.Rect we use a minimal rect
+class here.
+
+>>> class Rect:
+...     def __init__(self, x, y, w, h):
+...         self.x, self.y, self.w, self.h = x, y, w, h
+...     left = property(lambda self: self.x)
+...     top = property(lambda self: self.y)
+...     right = property(lambda self: self.x + self.w)
+...     bottom = property(lambda self: self.y + self.h)
+
+We also need a simple class whose instances have a rect.
+
+>>> class Obj:
+...     def __init__(self, name, *rect_args):
+...         self.name = name
+...         self.rect = Rect(*rect_args)
+...     def __repr__(self):
+...         return self.name
+
+Now let's create a grid whose cells are 100x100 pixels wide
+and register some objects in it.
+
+>>> grid = SpatialGrid(100)
+>>> a = Obj('a', 0, 0, 20, 20)
+>>> b = Obj('b', 90, 90, 20, 20)
+>>> c = Obj('c', 500, 0, 20, 20)
+>>> for obj in (a, b, c):
+...     grid.add(obj)
+
+Objects are registered in all cells their rects touch. The
+"b" object, for instance, sits on the corner of 4 cells.
+
+>>> grid.get_cell_keys(b.rect)
+((0, 0), (0, 1), (1, 0), (1, 1))
+>>> len(grid)
+3
+
+Querying an area returns the objects in the cells touched
+by that area. Only the cells overlapping the area are
+visited, so the "c" object, which is far away, isn't even
+considered.
+
+>>> sorted(grid.query(Rect(0, 0, 50, 50)), key=repr)
+[a, b]
+>>> sorted(grid.query(Rect(150, 150, 10, 10)), key=repr)
+[b]
+>>> grid.query(Rect(300, 300, 10, 10))
+set()
+
+Note that the query doesn't check collision between the
+objects and the area, just whether they share cells. Here
+"a" is returned even though it doesn't touch the area
+(which starts at (50, 50)), because both are inside the
+same cell.
+
+>>> a in grid.query(Rect(50, 50, 10, 10))
+True
+
+The grid keeps the cells computed when an object is
+registered, so moving the rect of an object doesn't change
+the cells it is in until we notify the grid with the move()
+method. This is what allows us to register objects using
+different coordinates than the ones in their rects (by
+providing an explicit rect).
+
+>>> c.rect.x = 0
+>>> c in grid.query(Rect(0, 0, 10, 10))
+False
+>>> grid.move(c)
+>>> c in grid.query(Rect(0, 0, 10, 10))
+True
+
+>>> grid.move(c, Rect(1000, 1000, 20, 20))
+>>> c in grid.query(Rect(0, 0, 10, 10))
+False
+>>> c in grid.query(Rect(1010, 1010, 10, 10))
+True
+
+Removing objects also removes cells left empty.
+
+>>> grid.remove(c)
+>>> c in grid
+False
+>>> sorted(grid.cells)
+[(0, 0), (0, 1), (1, 0), (1, 1)]
+
+Negative coordinates and rects without width or height are
+supported as well.
+
+>>> grid.get_cell_keys(Rect(-10, -10, 0, 0))
+((-1, -1),)
+>>> grid.get_cell_keys(Rect(-150, 0, 100, 10))
+((-2, 0), (-1, 0))
+
+Finally, the grid can be cleared.
+
+>>> grid.clear()
+>>> len(grid), grid.cells
+(0, {})
+"""
+
+from doctest import DocTestSuite
+
+
+def load_tests(loader, tests, pattern):
+    """Return a test suite.
+
+    This function is used for test discovery and its name,
+    signature and return value are defined by the load_tests
+    protocol described in the standard library unittest
+    module online documentation.
+    """
+    ### return a test suite from the doctests in this module
+    return DocTestSuite()
@@ -0,0 +1,115 @@
+"""Facility for statesnapshot module doctests.
+
+StateSnapshot usage
+*******************
+
+Snapshots store the state of the objects reachable from the
+given roots and put it back in the very same objects.
+
+>>> from collections import deque
+>>> from ..statesnapshot import StateSnapshot
+
+>>> class Actor:
+...     def __init__(self, name):
+...         self.name = name
+...         self.pos = [0, 0]
+...         self.history = deque(maxlen=3)
+...     def move(self, dx):
+...         self.pos[0] += dx
+...         self.history.append(dx)
+
+>>> actor = Actor('bot')
+>>> actors = {actor}
+>>> pos = actor.pos
+
+>>> snapshot = StateSnapshot([actors])
+
+>>> actor.move(5)
+>>> actor.name = 'robot'
+>>> actor.extra = 'value'
+>>> actors.add(Actor('other'))
+
+>>> snapshot.restore()
+>>> actors == {actor}
+True
+>>> actor.name, actor.pos, actor.history
+('bot', [0, 0], deque([], maxlen=3))
+>>> hasattr(actor, 'extra')
+False
+
+Objects are restored in place, so references to them remain
+valid.
+
+>>> actor.pos is pos
+True
+
+Bound methods lead to their objects, which is what allows methods
+stored as attributes to be restored as well.
+
+>>> holder = type('Object', (), {})()
+>>> holder.move = actor.move
+>>> snapshot = StateSnapshot([holder])
+>>> holder.move(3)
+>>> actor.pos
+[3, 0]
+>>> snapshot.restore()
+>>> actor.pos
+[0, 0]
+
+Excluded objects are neither stored nor restored.
+
+>>> cache = {}
+>>> actor.cache = cache
+>>> snapshot = StateSnapshot([actor], excluded=[cache])
+>>> cache['key'] = 'value'
+>>> snapshot.restore()
+>>> actor.cache is cache, cache
+(True, {'key': 'value'})
+
+Objects with slots are supported as well.
+
+>>> class Point:
+...     __slots__ = ('x', 'y')
+
+>>> point = Point()
+>>> point.x = 1
+>>> snapshot = StateSnapshot([point])
+>>> point.x = 2
+>>> point.y = 3
+>>> snapshot.restore()
+>>> point.x, hasattr(point, 'y')
+(1, False)
+
+Other types whose state can be changed in place must be registered.
+
+>>> from ..statesnapshot import register_type
+
+>>> from array import array
+
+>>> def set_array_state(obj, state):
+...     obj[:] = array(obj.typecode, state)
+
+>>> register_type(array, tuple, set_array_state)
+
+>>> values = array('i', (1, 2, 3))
+>>> snapshot = StateSnapshot([values])
+>>> values.append(4)
+>>> values[0] = 0
+>>> snapshot.restore()
+>>> values
+array('i', [1, 2, 3])
+"""
+
+from doctest import DocTestSuite
+
+
+def load_tests(loader, tests, pattern):
+    """Return a test suite.
+
+    This function is used for test discovery and its name,
+    signature and return value are defined by the load_tests
+    protocol described in the standard library unittest
+    module online documentation.
+    """
+    ### return a test suite from the doctests in this module
+    return DocTestSuite()
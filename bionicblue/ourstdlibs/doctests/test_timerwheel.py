@@ -0,0 +1,75 @@
+"""Facility for timerwheel module doctests.
+
+TimerWheel usage
+****************
+
+Callbacks are scheduled a number of ticks ahead and called
+when the wheel ticks.
+
+>>> from ..timerwheel import TimerWheel
+
+>>> wheel = TimerWheel(slot_bits=2, no_of_levels=2)
+
+>>> def get_callback(name):
+...     def callback():
+...         print(name, 'at tick', wheel.now - 1)
+...     return callback
+
+>>> scheduled = wheel.schedule(0, get_callback('first'))
+>>> _ = wheel.schedule(2, get_callback('second'))
+
+With no delay, callbacks are called on the next tick.
+
+>>> wheel.tick()
+first at tick 0
+>>> scheduled.is_pending()
+False
+>>> wheel.tick()
+>>> wheel.tick()
+second at tick 2
+
+Callbacks scheduled further ahead than the wheels can hold
+(here, 16 ticks) are still called on time.
+
+>>> _ = wheel.schedule(5, get_callback('third'))
+>>> _ = wheel.schedule(20, get_callback('fourth'))
+>>> for _ in range(25):
+...     wheel.tick()
+third at tick 8
+fourth at tick 23
+
+Cancelled callbacks are never called.
+
+>>> scheduled = wheel.schedule(3, get_callback('fifth'))
+>>> scheduled.cancel()
+>>> scheduled.is_pending()
+False
+>>> for _ in range(5):
+...     wheel.tick()
+
+Callbacks can schedule other ones.
+
+>>> def schedule_another():
+...     print('scheduling at tick', wheel.now - 1)
+...     _ = wheel.schedule(1, get_callback('sixth'))
+
+>>> _ = wheel.schedule(0, schedule_another)
+>>> for _ in range(3):
+...     wheel.tick()
+scheduling at tick 33
+sixth at tick 35
+"""
+
+from doctest import DocTestSuite
+
+
+def load_tests(loader, tests, pattern):
+    """Return a test suite.
+
+    This function is used for test discovery and its name,
+    signature and return value are defined by the load_tests
+    protocol described in the standard library unittest
+    module online documentation.
+    """
+    ### return a test suite from the doctests in this module
+    return DocTestSuite()
@@ -0,0 +1,153 @@
+"""Facility for lazily loaded mapping with a size budget.
+
+Values are only loaded when their keys are first accessed.
+Optionally, the mapping is given a budget and a function to
+measure the cost of each value (its size in bytes, for
+instance). Whenever the total cost exceeds the budget, the
+least recently used values are discarded, to be loaded again
+if needed. Values still in use (as told by an optional function)
+are never discarded, though, since discarding them wouldn't
+free anything and they would just be loaded again as copies.
+"""
+
+### standard library import
+from collections import OrderedDict
+
+
+
+class LazyLRUMap(OrderedDict):
+    """Mapping loading values on demand and discarding old ones.
+
+    Values are ordered from least to most recently used.
+    """
+
+    def __init__(
+        self,
+        load_value=None,
+        get_cost=None,
+        budget=None,
+        is_in_use=None,
+    ):
+        """Store loading/measuring functions and budget.
+
+        load_value (callable or None)
+            receives a missing key and returns its value; it
+            may raise KeyError for keys which can't be loaded;
+            can also be set later with set_value_loader().
+        get_cost (callable or None)
+            receives a value and returns its cost (a number);
+            if not provided, every value costs 1.
+        budget (number or None)
+            maximum total cost of the values kept; if None, no
+            value is ever discarded.
+        is_in_use (callable or None)
+            receives a value and returns whether it is still in
+            use, in which case it isn't discarded; if not
+            provided, no value is considered in use.
+        """
+        super().__init__()
+
+        self.load_value = load_value
+        self.get_cost = get_cost or get_unit_cost
+        self.budget = budget
+        self.is_in_use = is_in_use or is_never_in_use
+
+        self.costs = {}
+        self.total_cost = 0
+
+    def set_value_loader(self, load_value, get_cost=None, is_in_use=None):
+        """Set functions used to load, measure and check values.
+
+        Should be called before any value is stored, since the
+        cost of values already stored isn't measured again.
+        """
+        self.load_value = load_value
+
+        if get_cost is not None:
+            self.get_cost = get_cost
+
+        if is_in_use is not None:
+            self.is_in_use = is_in_use
+
+    def __missing__(self, key):
+
+        if self.load_value is None:
+            raise KeyError(key)
+
+        value = self[key] = self.load_value(key)
+        return value
+
+    def __getitem__(self, key):
+
+        value = super().__getitem__(key)
+
+        ### mark key as the most recently used; note that if the
+        ### value was just loaded by __missing__(), it is already
+        ### at the end
+        self.move_to_end(key)
+
+        return value
+
+    def __setitem__(self, key, value):
+
+        if key in self:
+            del self[key]
+
+        super().__setitem__(key, value)
+
+        cost = self.costs[key] = self.get_cost(value)
+        self.total_cost += cost
+
+        self.discard_least_recently_used()
+
+    def __delitem__(self, key):
+
+        super().__delitem__(key)
+        self.total_cost -= self.costs.pop(key)
+
+    def clear(self):
+
+        super().clear()
+
+        self.costs.clear()
+        self.total_cost = 0
+
+    def preload(self, keys):
+        """Load values of given keys, if not loaded yet.
+
+        Also marks them as the most recently used.
+        """
+        for key in keys:
+            self[key]
+
+    def discard_least_recently_used(self):
+        """Discard least recently used values while over budget.
+
+        The most recently used value is always kept, even if
+        it alone exceeds the budget, and so are values in use.
+        """
+        budget = self.budget
+
+        if budget is None:
+            return
+
+        is_in_use = self.is_in_use
+
+        ### the list of items leaves out the most recently used one
+
+        for key, value in list(self.items())[:-1]:
+
+            if self.total_cost <= budget:
+                break
+
+            if not is_in_use(value):
+                del self[key]
+
+
+def get_unit_cost(value):
+    """Return 1, the default cost of each value."""
+    return 1
+
+def is_never_in_use(value):
+    """Return False, so values are discarded whenever needed."""
+    return False
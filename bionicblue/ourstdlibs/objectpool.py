@@ -0,0 +1,102 @@
+"""Facility for pools of reusable objects.
+
+Objects which are created and discarded very often (like
+projectiles and explosions) can instead be acquired from a
+pool and released back to it when no longer needed, so they
+are reused rather than created again.
+
+Pooled objects are created by calling a factory without
+arguments, and must have a reset() method, which is called
+with the arguments given to ObjectPool.acquire(), to prepare
+the object for each use.
+"""
+
+
+class ObjectPool:
+    """Pool of reusable objects, with usage statistics."""
+
+    def __init__(self, factory, capacity=0):
+        """Store factory and capacity.
+
+        factory (callable)
+            called without arguments to create new objects.
+        capacity (non-negative integer)
+            number of objects created in advance by fill(); the
+            pool still grows beyond it if more objects are
+            needed at once.
+        """
+        self.factory = factory
+        self.capacity = capacity
+
+        ### objects available for reuse
+        self.free_objects = []
+
+        ### statistics
+        self.created = 0
+        self.acquired = 0
+        self.misses = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+    def fill(self):
+        """Create objects until the capacity is reached."""
+
+        missing = self.capacity - self.created
+
+        for _ in range(missing):
+            self.free_objects.append(self.create())
+
+    def create(self):
+        """Return new object from the factory."""
+
+        self.created += 1
+        return self.factory()
+
+    def acquire(self, *args, **kwargs):
+        """Return object reset with the given arguments.
+
+        The object is reused if there's one available, otherwise
+        a new one is created.
+        """
+        free_objects = self.free_objects
+
+        if free_objects:
+            obj = free_objects.pop()
+
+        else:
+
+            obj = self.create()
+            self.misses += 1
+
+        obj.reset(*args, **kwargs)
+
+        self.acquired += 1
+        self.in_use += 1
+
+        if self.in_use > self.peak_in_use:
+            self.peak_in_use = self.in_use
+
+        return obj
+
+    def release(self, obj):
+        """Make object available for reuse."""
+
+        self.in_use -= 1
+        self.free_objects.append(obj)
+
+    def get_stats(self):
+        """Return map with usage statistics of the pool.
+
+        Misses are acquisitions which required a new object to
+        be created, because none was available.
+        """
+
+        return {
+            'capacity': self.capacity,
+            'created': self.created,
+            'acquired': self.acquired,
+            'misses': self.misses,
+            'in_use': self.in_use,
+            'peak_in_use': self.peak_in_use,
+            'free': len(self.free_objects),
+        }
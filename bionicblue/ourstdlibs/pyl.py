@@ -1,4 +1,17 @@
-"""Facility for python literal loading/saving."""
+"""Facility for python literal loading/saving.
+
+Parsing python literals with ast.literal_eval() requires the
+whole abstract syntax tree of the file to be built before the
+literal itself, which is slow for big files. Because of that,
+once a sidecar directory is set with set_sidecar_dir(), literals
+loaded from files in a given source directory are also stored
+there in marshal format, which is used in next loads for as
+long as the source file doesn't change.
+
+Sidecar files mirror the layout of the source directory, so
+those whose source files no longer exist can be found and
+deleted with discard_stale_sidecars().
+"""
 
 ### standard library imports
 
@@ -6,10 +19,158 @@ from ast import literal_eval
 
 from pprint import pformat
 
+from marshal import dumps, loads
+
+from pathlib import Path
+
+
+
+### must be incremented whenever the format of the sidecar files
+### changes, so that existing ones are discarded
+SIDECAR_FORMAT_VERSION = 1
+
+### suffix of sidecar files
+SIDECAR_SUFFIX = '.marshal'
+
+### namespace holding the directory wherein to store sidecar files and
+### the directory of the source files which have them; when None,
+### sidecar files aren't used
+
+SIDECAR_NS = type('Object', (), {})()
+SIDECAR_NS.dirpath = None
+SIDECAR_NS.source_dirpath = None
+
+
+def set_sidecar_dir(dirpath, source_dirpath=None):
+    """Set directory wherein to store sidecar files.
+
+    dirpath (pathlib.Path or None)
+        directory for sidecar files; it is created when needed;
+        if None, sidecar files are no longer used.
+    source_dirpath (pathlib.Path or None)
+        only files in this directory (or its subdirectories)
+        have sidecar files; meant to be a directory of data
+        which is only read, like the data of the game, rather
+        than files which are saved often, whose sidecars would
+        just pile up.
+    """
+    SIDECAR_NS.dirpath = dirpath
+    SIDECAR_NS.source_dirpath = (
+        None
+        if dirpath is None or source_dirpath is None
+        else Path(source_dirpath).resolve()
+    )
+
+
+def get_sidecar_path(filepath):
+    """Return path of sidecar file for given source file.
+
+    If sidecar files aren't used or the source file is out of
+    the source directory, None is returned.
+    """
+    if SIDECAR_NS.source_dirpath is None:
+        return None
+
+    try:
+        relative_path = (
+            Path(filepath).resolve().relative_to(SIDECAR_NS.source_dirpath)
+        )
+
+    except ValueError:
+        return None
+
+    return SIDECAR_NS.dirpath / f'{relative_path}{SIDECAR_SUFFIX}'
+
+
+def discard_stale_sidecars():
+    """Delete sidecar files whose source files no longer exist.
+
+    Any other files in the sidecar directory are deleted as well,
+    so the directory must be used for sidecar files only.
+    """
+
+    dirpath = SIDECAR_NS.dirpath
+
+    if SIDECAR_NS.source_dirpath is None or not dirpath.is_dir():
+        return
+
+    for sidecar_path in dirpath.rglob('*'):
+
+        if not sidecar_path.is_file():
+            continue
+
+        relative_path = sidecar_path.relative_to(dirpath)
+
+        ### files without the sidecar suffix aren't sidecars (or were
+        ### created by an older version), so they are deleted as well
+
+        if (
+            relative_path.suffix == SIDECAR_SUFFIX
+            and (
+                SIDECAR_NS.source_dirpath
+                / relative_path.with_suffix('')
+            ).is_file()
+        ):
+            continue
+
+        try:
+            sidecar_path.unlink()
+
+        ### failing to delete a sidecar isn't an error, it just
+        ### remains in the directory
+        except OSError:
+            pass
+
 
 def load_pyl(filepath):
     """Return python literal from file in filepath."""
 
+    sidecar_path = get_sidecar_path(filepath)
+
+    if sidecar_path is None:
+        return load_pyl_from_source(filepath)
+
+    ### the sidecar is only valid if it was generated from a source
+    ### file with the same modification time and size
+
+    stat_result = Path(filepath).stat()
+    source_key = (
+        SIDECAR_FORMAT_VERSION,
+        stat_result.st_mtime_ns,
+        stat_result.st_size,
+    )
+
+    try:
+        sidecar_key, python_literal = loads(sidecar_path.read_bytes())
+
+    except Exception:
+        pass
+
+    else:
+
+        if sidecar_key == source_key:
+            return python_literal
+
+    ###
+
+    python_literal = load_pyl_from_source(filepath)
+
+    try:
+
+        sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+        sidecar_path.write_bytes(dumps((source_key, python_literal)))
+
+    ### failing to store the sidecar isn't an error, it just means
+    ### the source file will be parsed again next time
+    except Exception:
+        pass
+
+    return python_literal
+
+
+def load_pyl_from_source(filepath):
+    """Return python literal parsed from source file in filepath."""
+
     with open(str(filepath), mode="r", encoding="utf-8") as f:
 
         try:
@@ -0,0 +1,139 @@
+"""Facility for uniform grid spatial indexing.
+
+The grid maps each registered object to the cells its rect
+touches, so that querying which objects are near a given
+area only requires visiting the cells overlapping that area,
+regardless of how many objects exist elsewhere.
+
+Objects are expected to have a "rect" attribute with the
+"left", "top", "right" and "bottom" attributes of a
+pygame.Rect, unless a rect is provided explicitly when
+registering them.
+"""
+
+### standard library import
+from itertools import product
+
+
+
+class SpatialGrid:
+    """Uniform grid indexing objects by the cells they touch."""
+
+    def __init__(self, cell_size=128):
+        """Store cell size and create maps.
+
+        cell_size (positive integer)
+            width and height of each cell of the grid.
+        """
+        self.cell_size = cell_size
+
+        ### map each cell (a (column, row) pair) to the set
+        ### of objects touching it
+        self.cells = {}
+
+        ### map each object to the cells it touches
+        self.obj_to_cells = {}
+
+    def get_cell_keys(self, rect):
+        """Return keys of cells touched by the given rect."""
+
+        cell_size = self.cell_size
+
+        left = rect.left // cell_size
+        top = rect.top // cell_size
+
+        ### right and bottom are exclusive boundaries, so we
+        ### subtract 1 from them; we also make sure rects with
+        ### no width/height still touch the cell where they are
+
+        right = max(left, (rect.right - 1) // cell_size)
+        bottom = max(top, (rect.bottom - 1) // cell_size)
+
+        return tuple(
+            product(
+                range(left, right + 1),
+                range(top, bottom + 1),
+            )
+        )
+
+    def add(self, obj, rect=None):
+        """Register object in the cells its rect touches.
+
+        obj (hashable object)
+            object to be registered.
+        rect (pygame.Rect or None)
+            rect representing the area occupied by the object;
+            if not provided, the object's own rect is used.
+        """
+        cell_keys = self.get_cell_keys(obj.rect if rect is None else rect)
+
+        self.obj_to_cells[obj] = cell_keys
+
+        cells = self.cells
+
+        for key in cell_keys:
+
+            try:
+                cells[key].add(obj)
+
+            except KeyError:
+                cells[key] = {obj}
+
+    def remove(self, obj):
+        """Unregister object from the grid."""
+
+        cells = self.cells
+
+        for key in self.obj_to_cells.pop(obj):
+
+            cell = cells[key]
+            cell.remove(obj)
+
+            if not cell:
+                del cells[key]
+
+    def move(self, obj, rect=None):
+        """Update cells of registered object after it moved.
+
+        Works just like the add() method, but for an object
+        already registered.
+        """
+        new_cell_keys = self.get_cell_keys(obj.rect if rect is None else rect)
+
+        ### if object still touches the same cells, there's
+        ### nothing to do
+        if new_cell_keys == self.obj_to_cells[obj]:
+            return
+
+        self.remove(obj)
+        self.add(obj, rect)
+
+    def query(self, rect):
+        """Return set of objects in cells touched by rect.
+
+        Note that objects are not guaranteed to collide with
+        the given rect, just to be close to it (since they are
+        in the same cells). Callers must perform any further
+        collision checks needed.
+        """
+        objs = set()
+
+        cells = self.cells
+
+        for key in self.get_cell_keys(rect):
+
+            if key in cells:
+                objs.update(cells[key])
+
+        return objs
+
+    def clear(self):
+        """Unregister all objects."""
+        self.cells.clear()
+        self.obj_to_cells.clear()
+
+    def __contains__(self, obj):
+        return obj in self.obj_to_cells
+
+    def __len__(self):
+        return len(self.obj_to_cells)
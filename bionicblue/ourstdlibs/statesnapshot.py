@@ -0,0 +1,293 @@
+"""Facility for capturing and restoring the state of objects in place.
+
+A snapshot visits every object reachable from the given roots
+and stores a shallow copy of the state of each mutable one: the
+items of lists, dicts, sets and deques, plus the attributes of
+other objects. Restoring the snapshot puts those states back in
+the very same objects, rather than in copies of them, so any
+references to them (like module-level collections imported by
+other modules, or bound methods stored as attributes) remain
+valid.
+
+Objects of other types are considered immutable (like numbers,
+strings and functions) and are neither visited nor copied.
+That includes objects of third-party types without attributes,
+like pygame surfaces; types whose state can be changed in place
+must be registered with register_type().
+"""
+
+### standard library imports
+
+from collections import deque
+
+from functools import partial
+
+from types import (
+    ModuleType,
+    FunctionType,
+    MethodType,
+    BuiltinMethodType,
+    MethodWrapperType,
+)
+
+
+
+### map of types whose state is stored and restored in place to
+### pairs of functions: one returning a copy of the state of an
+### object and one putting a state back in an object
+
+STATE_OPERATIONS_MAP = {}
+
+
+def register_type(cls, get_state, set_state):
+    """Register operations to store/restore state of cls instances.
+
+    get_state (callable)
+        receives an object and returns a copy of its state.
+    set_state (callable)
+        receives an object and a state returned by get_state()
+        and puts the state back in the object.
+
+    Subclasses of cls are handled as well, along with their
+    attributes.
+    """
+    STATE_OPERATIONS_MAP[cls] = (get_state, set_state)
+
+
+def set_list_state(obj, state):
+    obj[:] = state
+
+def set_dict_state(obj, state):
+
+    ### sets are left untouched if their items didn't change, so
+    ### they keep iterating in the same order
+
+    if obj != state:
+
+        obj.clear()
+        obj.update(state)
+
+def set_deque_state(obj, state):
+    obj.clear()
+    obj.extend(state)
+
+register_type(list, tuple, set_list_state)
+register_type(bytearray, bytes, set_list_state)
+register_type(dict, dict.copy, set_dict_state)
+register_type(set, frozenset, set_dict_state)
+register_type(deque, tuple, set_deque_state)
+
+
+### types of values which never change and hold no other objects,
+### so they are skipped right away
+ATOMIC_TYPES = frozenset((
+    int, float, complex, bool, str, bytes, type(None), range,
+))
+
+### immutable types whose items are visited, since they may be
+### mutable
+IMMUTABLE_CONTAINER_TYPES = frozenset((tuple, frozenset))
+
+### bound methods (including those of builtin objects, like the
+### append method of a list) keep their object alive, so the
+### object is visited in their place
+METHOD_TYPES = frozenset((MethodType, BuiltinMethodType, MethodWrapperType))
+
+### types whose instances are never visited, despite having attributes
+UNVISITED_TYPES = (ModuleType, type)
+
+
+def get_operations(cls):
+    """Return state operations for class or one of its bases."""
+
+    for base in cls.__mro__:
+
+        if base in STATE_OPERATIONS_MAP:
+            return STATE_OPERATIONS_MAP[base]
+
+
+def get_slot_names(cls):
+    """Return names of slots of class and its bases."""
+
+    return tuple(
+
+        name
+
+        for base in cls.__mro__
+
+        for name in (
+
+            (base.__dict__['__slots__'],)
+            if type(base.__dict__.get('__slots__')) is str
+            else base.__dict__.get('__slots__', ())
+
+        )
+
+        if name not in ('__dict__', '__weakref__')
+
+    )
+
+
+class StateSnapshot:
+    """States of objects reachable from roots, restorable in place."""
+
+    def __init__(self, roots, excluded=()):
+        """Store states of objects reachable from roots.
+
+        roots (iterable)
+            objects whose state (and the state of all objects
+            reachable from them) is stored.
+        excluded (iterable)
+            objects which are neither visited nor restored, like
+            data shared with other objects which never changes.
+        """
+        ### list of (object, state setter, state) triplets
+        self.states = states = []
+        append_state = states.append
+
+        visited_ids = {id(obj) for obj in excluded}
+        add_visited_id = visited_ids.add
+
+        ### keep excluded objects alive, so their ids aren't reused
+        ### while the snapshot is taken
+        self.excluded = tuple(excluded)
+
+        objs_to_visit = list(roots)
+        pop_obj = objs_to_visit.pop
+        append_obj = objs_to_visit.append
+        extend_objs = objs_to_visit.extend
+
+        ### map each class visited to its state operations (or None)
+        ### and slot names, so they are only looked up once
+        class_data_map = {}
+
+        while objs_to_visit:
+
+            obj = pop_obj()
+            cls = type(obj)
+
+            if cls in ATOMIC_TYPES or id(obj) in visited_ids:
+                continue
+
+            add_visited_id(id(obj))
+
+            if cls in IMMUTABLE_CONTAINER_TYPES:
+
+                extend_objs(obj)
+                continue
+
+            if cls in METHOD_TYPES:
+
+                append_obj(obj.__self__)
+                continue
+
+            if isinstance(obj, UNVISITED_TYPES):
+                continue
+
+            ### partial objects can't be changed, but the objects
+            ### they hold may; the same goes for the cells of the
+            ### closures of functions
+
+            if cls is partial:
+
+                append_obj(obj.func)
+                extend_objs(obj.args)
+                extend_objs(obj.keywords.values())
+
+            elif cls is FunctionType and obj.__closure__:
+
+                for cell in obj.__closure__:
+
+                    try:
+                        append_obj(cell.cell_contents)
+
+                    ### empty cell
+                    except ValueError:
+                        pass
+
+            ###
+
+            try:
+                operations, slot_names = class_data_map[cls]
+
+            except KeyError:
+
+                operations, slot_names = class_data_map[cls] = (
+                    get_operations(cls),
+                    get_slot_names(cls),
+                )
+
+            ### store state of types registered
+
+            if operations is not None:
+
+                get_state, set_state = operations
+                state = get_state(obj)
+
+                append_state((obj, set_state, state))
+
+                if isinstance(obj, dict):
+
+                    extend_objs(obj.keys())
+                    extend_objs(obj.values())
+
+                else:
+                    extend_objs(state)
+
+            ### store attributes
+
+            attributes = getattr(obj, '__dict__', None)
+
+            if type(attributes) is dict:
+
+                attributes = attributes.copy()
+                append_state((obj, set_attributes, attributes))
+
+                extend_objs(attributes.values())
+
+            ### store slots
+
+            if slot_names:
+
+                slot_values = tuple(
+                    getattr(obj, name, UNSET)
+                    for name in slot_names
+                )
+
+                append_state((obj, set_slots, (slot_names, slot_values)))
+
+                extend_objs(slot_values)
+
+    def restore(self):
+        """Put stored states back in their objects."""
+
+        for obj, set_state, state in self.states:
+            set_state(obj, state)
+
+    def __len__(self):
+        """Return number of objects whose state is stored."""
+        return len(self.states)
+
+
+### value of slots not set
+UNSET = object()
+
+
+def set_attributes(obj, attributes):
+
+    current_attributes = obj.__dict__
+
+    current_attributes.clear()
+    current_attributes.update(attributes)
+
+def set_slots(obj, slot_names_and_values):
+
+    for name, value in zip(*slot_names_and_values):
+
+        if value is UNSET:
+
+            if hasattr(obj, name):
+                delattr(obj, name)
+
+        else:
+            setattr(obj, name, value)
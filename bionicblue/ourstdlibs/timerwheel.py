@@ -0,0 +1,180 @@
+"""Facility for scheduling callbacks a number of ticks ahead.
+
+A hierarchical timer wheel keeps scheduled callbacks in slots
+of a few wheels (levels). The first wheel has a slot for each
+of the next ticks; each wheel above it has slots covering as
+many ticks as the whole wheel below it. Callbacks scheduled far
+ahead are kept in the upper wheels and moved down to the lower
+ones as their time approaches (cascading).
+
+Ticking the wheel only touches the callbacks due in the current
+tick (plus the occasional cascade), no matter how many callbacks
+are scheduled, so objects waiting for something to happen cost
+nothing while waiting, instead of checking every tick whether
+enough time has passed.
+"""
+
+
+class ScheduledCallback:
+    """Callback scheduled to be called on a given tick.
+
+    Returned by TimerWheel.schedule(), so it can be cancelled.
+    """
+
+    __slots__ = ('due', 'callback')
+
+    def __init__(self, due, callback):
+
+        self.due = due
+        self.callback = callback
+
+    def cancel(self):
+        """Prevent callback from being called.
+
+        The callback is just discarded, so cancelling costs
+        nothing; its slot in the wheel is emptied once reached.
+        Cancelling a callback already called does nothing.
+        """
+        self.callback = None
+
+    def is_pending(self):
+        """Return whether callback wasn't called nor cancelled yet."""
+        return self.callback is not None
+
+
+class TimerWheel:
+    """Hierarchical timer wheel for scheduling callbacks."""
+
+    def __init__(self, slot_bits=8, no_of_levels=3):
+        """Create the wheels.
+
+        slot_bits (positive integer)
+            each wheel has 2 ** slot_bits slots.
+        no_of_levels (positive integer)
+            number of wheels; callbacks scheduled further ahead
+            than the wheels can hold are kept in a separate list,
+            checked whenever the uppermost wheel goes around.
+        """
+        self.slot_bits = slot_bits
+        self.no_of_levels = no_of_levels
+
+        self.slot_mask = (1 << slot_bits) - 1
+
+        self.wheels = [
+            [[] for _ in range(1 << slot_bits)]
+            for _ in range(no_of_levels)
+        ]
+
+        self.overflow = []
+
+        ### number of ticks so far
+        self.now = 0
+
+    def schedule(self, delay, callback):
+        """Schedule callback and return a ScheduledCallback for it.
+
+        delay (non-negative integer)
+            number of ticks skipped before calling the callback;
+            if 0, it is called on the next tick.
+        callback (callable)
+            called without arguments.
+        """
+        scheduled = ScheduledCallback(self.now + delay, callback)
+        self.insert(scheduled)
+
+        return scheduled
+
+    def insert(self, scheduled):
+        """Put scheduled callback in slot wherein it is due."""
+
+        due = scheduled.due
+        delta = due - self.now
+
+        slot_bits = self.slot_bits
+
+        for level, wheel in enumerate(self.wheels):
+
+            shift = slot_bits * level
+
+            ### the callback goes in the lowest wheel which covers
+            ### its time
+
+            if delta >> (shift + slot_bits) == 0:
+
+                wheel[(due >> shift) & self.slot_mask].append(scheduled)
+                return
+
+        self.overflow.append(scheduled)
+
+    def tick(self):
+        """Call callbacks due on the current tick and advance."""
+
+        now = self.now
+
+        slot_bits = self.slot_bits
+        slot_mask = self.slot_mask
+
+        ### whenever lower wheels go around, move the callbacks of
+        ### the current slot of the upper wheels down, starting from
+        ### the uppermost one, so callbacks can cascade all the way
+
+        if not now & ((1 << (slot_bits * self.no_of_levels)) - 1):
+
+            overflow = self.overflow
+            self.overflow = []
+
+            for scheduled in overflow:
+                if scheduled.callback is not None:
+                    self.insert(scheduled)
+
+        for level in range(self.no_of_levels - 1, 0, -1):
+
+            shift = slot_bits * level
+
+            if now & ((1 << shift) - 1):
+                continue
+
+            wheel = self.wheels[level]
+            slot_index = (now >> shift) & slot_mask
+
+            cascading = wheel[slot_index]
+            wheel[slot_index] = []
+
+            for scheduled in cascading:
+                if scheduled.callback is not None:
+                    self.insert(scheduled)
+
+        ### take callbacks due now and advance before calling them,
+        ### so callbacks they schedule with no delay are called on
+        ### the next tick
+
+        wheel = self.wheels[0]
+        slot_index = now & slot_mask
+
+        due_callbacks = wheel[slot_index]
+
+        if not due_callbacks:
+
+            self.now = now + 1
+            return
+
+        wheel[slot_index] = []
+        self.now = now + 1
+
+        for scheduled in due_callbacks:
+
+            callback = scheduled.callback
+
+            if callback is not None:
+
+                scheduled.callback = None
+                callback()
+
+    def clear(self):
+        """Discard all scheduled callbacks."""
+
+        for wheel in self.wheels:
+            for slot in wheel:
+                slot.clear()
+
+        self.overflow.clear()
@@ -0,0 +1,146 @@
+"""Facility for capturing profiles of stretches of gameplay.
+
+While playing in normal mode, pressing F11 starts profiling the
+game with cProfile, and pressing it again stops it. The profile
+is then saved in the profiles directory, with the range of
+frames profiled in the name of the file, so it can be matched
+with the frame timers of the instrumentation module.
+
+Two files are saved for each profile: a .prof file, which can
+be loaded with the pstats module or visualization tools like
+snakeviz, and a .txt file listing the functions which took the
+most time.
+"""
+
+### standard library imports
+
+from cProfile import Profile
+
+from pstats import Stats, SortKey
+
+from datetime import datetime
+
+
+### third-party import
+from pygame.locals import KEYDOWN, K_F11
+
+
+### local imports
+
+from .config import PROFILES_DIR
+
+from .pygamesetup.constants import GENERAL_NS
+
+
+
+### key used to start/stop profiling
+PROFILING_KEY = K_F11
+
+### number of functions listed in the text summary of each profile
+SUMMARY_LENGTH = 60
+
+### namespace holding the profiler in use (if any) and the index of
+### the frame wherein it started
+PROFILING_NS = type('Object', (), {})()
+PROFILING_NS.profiler = None
+PROFILING_NS.first_frame_index = None
+
+
+def toggle_profiling():
+    """Start profiling or stop it, saving the profile."""
+
+    if PROFILING_NS.profiler is None:
+        start_profiling()
+
+    else:
+        stop_profiling()
+
+
+def start_profiling():
+    """Start profiling the game."""
+
+    profiler = Profile()
+
+    ### only one profiler can be active at a time, so it may fail
+    ### if the game itself is being profiled
+
+    try:
+        profiler.enable()
+
+    except ValueError:
+
+        print("Couldn't start profiling, another profiler is active")
+        return
+
+    PROFILING_NS.profiler = profiler
+    PROFILING_NS.first_frame_index = GENERAL_NS.frame_index
+
+
+def stop_profiling():
+    """Stop profiling the game and save profile."""
+
+    profiler = PROFILING_NS.profiler
+    profiler.disable()
+
+    PROFILING_NS.profiler = None
+
+    ### name files after the frames profiled
+
+    first_frame_index = PROFILING_NS.first_frame_index
+    last_frame_index = GENERAL_NS.frame_index
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    stem = f'frames_{first_frame_index}-{last_frame_index}.{timestamp}'
+
+    ### save profile and its summary
+
+    try:
+
+        PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+
+        profiler.dump_stats(str(PROFILES_DIR / f'{stem}.prof'))
+
+        with open(
+            str(PROFILES_DIR / f'{stem}.txt'),
+            mode='w',
+            encoding='utf-8',
+        ) as f:
+
+            (
+                Stats(profiler, stream=f)
+                .sort_stats(SortKey.CUMULATIVE)
+                .print_stats(SUMMARY_LENGTH)
+            )
+
+    except Exception as err:
+        print(f"Couldn't save profile: {err}")
+
+
+def filter_profiling_key_events(events):
+    """Return events, handling and removing those of profiling key.
+
+    events (list of pygame.event.Event instances)
+        events obtained from pygame.event.get(); the list itself
+        is returned if it has no events of the profiling key.
+    """
+    filtered_events = None
+
+    for index, event in enumerate(events):
+
+        if getattr(event, 'key', None) == PROFILING_KEY:
+
+            if filtered_events is None:
+                filtered_events = events[:index]
+
+            ### toggle profiling on KEYDOWN events only, but KEYUP
+            ### events are removed as well, since the key isn't part
+            ### of the game controls
+
+            if event.type == KEYDOWN:
+                toggle_profiling()
+
+        elif filtered_events is not None:
+            filtered_events.append(event)
+
+    return events if filtered_events is None else filtered_events
@@ -13,7 +13,7 @@ from .constants import (
 )
 
 ## custom services
-from .services import normal, record, play
+from .services import normal, record, play, headless
 
 
 ### create a namespace to store the services in use
@@ -48,3 +48,6 @@ def switch_mode(mode_info_ns):
 
     elif mode == 'normal':
         normal.set_behaviour(SERVICES_NS)
+
+    elif mode == 'headless':
+        headless.set_behaviour(SERVICES_NS)
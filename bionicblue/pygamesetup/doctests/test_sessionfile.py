@@ -0,0 +1,304 @@
+"""Facility for sessionfile module doctests.
+
+Writing sessions
+****************
+
+The record mode hands the data of each frame to a SessionWriter,
+along with a function returning the record of the frame, if there's
+anything worth recording. Let's record a session wherein the right
+arrow key is held for 1000 frames, the shift key is held in the
+first two, text is typed, the "a" key is pressed and released and
+the mouse is requested, using the frame index as the data of each
+frame.
+
+>>> from tempfile import TemporaryDirectory
+>>> from pathlib import Path
+>>> from ..sessionfile import (
+...     SessionWriter,
+...     load_session,
+...     open_session,
+...     convert_session,
+...     read_footer,
+... )
+
+>>> temp_dir = TemporaryDirectory()
+>>> dirpath = Path(temp_dir.name)
+
+>>> events_map = {
+...     3: [['ti', {'t': 'hello!'}]],
+...     1000: [['kd', {'k': 'K_a', 's': 'KSCAN_A', 'u': 'a'}]],
+...     1001: [
+...         ['ku', {'k': 'K_a', 's': 'KSCAN_A'}],
+...         ['mbd', {'p': (5, 6), 'b': 3}],
+...     ],
+... }
+
+>>> def get_record(frame_index):
+...
+...     key_names = (
+...         ('K_RIGHT',) if frame_index < 1000
+...         else ('K_a',) if frame_index == 1000
+...         else ()
+...     )
+...
+...     mod_key_names = ('KMOD_LSHIFT',) if frame_index < 2 else ()
+...
+...     events = events_map.get(frame_index, [])
+...
+...     mouse_positions = [(10, 20)] if frame_index == 0 else []
+...     mouse_pressed_tuples = (
+...         [(True, False, True)] if frame_index == 0 else []
+...     )
+...
+...     if (
+...         events
+...         or key_names
+...         or mod_key_names
+...         or mouse_positions
+...         or mouse_pressed_tuples
+...     ):
+...
+...         return (
+...             frame_index,
+...             events,
+...             key_names,
+...             mod_key_names,
+...             mouse_positions,
+...             mouse_pressed_tuples,
+...         )
+
+>>> session_path = dirpath / 'session.bbrec'
+>>> header = {'recording_title': 'test', 'recording_size': (320, 180)}
+
+>>> writer = SessionWriter(session_path, header, get_record)
+>>> for frame_index in range(1002):
+...     writer.add_frame(frame_index)
+>>> writer.finish(1010)
+
+Only the frames wherein keys are pressed or released are stored,
+so the session fits in two chunks, one for frames 0 to 899 and
+another one for the frames after that.
+
+>>> reader = open_session(session_path)
+>>> len(reader.chunk_offsets)
+2
+>>> reader.last_frame_index
+1010
+
+Reading sessions
+****************
+
+Loading the session produces the same data stored in .pyl files
+by earlier versions of the record mode, with the frames wherein
+each key was pressed.
+
+>>> session_data = load_session(session_path)
+
+>>> session_data['key_name_to_frames_map']['K_RIGHT'] == list(range(1000))
+True
+>>> session_data['key_name_to_frames_map']['K_a']
+[1000]
+>>> session_data['mod_key_name_to_frames_map']
+{'KMOD_LSHIFT': [0, 1], 'KMOD_SHIFT': [0, 1]}
+>>> session_data['events_map'] == events_map
+True
+>>> session_data['mouse_pos_requests']
+((10, 20),)
+>>> session_data['mouse_key_state_requests']
+((True, False, True),)
+>>> session_data['last_frame_index']
+1010
+>>> session_data['recording_title'], session_data['recording_size']
+('test', (320, 180))
+
+For playing, frames are decoded on demand in order. Frames
+without records produce None.
+
+>>> reader.pop_frame(0)
+(0, frozenset({1073741903}), 1, (), ((10, 20),), ((True, False, True),))
+>>> reader.pop_frame(1) is None
+True
+>>> reader.pop_frame(2)
+(2, frozenset({1073741903}), 0, (), (), ())
+>>> reader.pop_frame(3)
+(3, frozenset({1073741903}), 0, ((771, (('window', None), ('text', 'hello!'))),), (), ())
+
+Frames skipped are discarded.
+
+>>> frame_index, keys, mods_bitmask, events, *_ = reader.pop_frame(1001)
+>>> frame_index, keys, mods_bitmask
+(1001, frozenset(), 0)
+>>> [event_type for event_type, _ in events]
+[769, 1025]
+>>> dict(events[1][1])['pos'], dict(events[1][1])['button']
+((5, 6), 3)
+>>> reader.close()
+
+Converting sessions
+*******************
+
+Sessions can be converted into .pyl files and back without
+changing their data.
+
+>>> pyl_path = dirpath / 'session.pyl'
+>>> convert_session(session_path, pyl_path)
+>>> load_session(pyl_path) == session_data
+True
+
+>>> converted_path = dirpath / 'converted.bbrec'
+>>> convert_session(pyl_path, converted_path)
+>>> load_session(converted_path) == session_data
+True
+
+The .pyl file can also be played directly.
+
+>>> reader = open_session(pyl_path)
+>>> reader.last_frame_index
+1010
+>>> reader.pop_frame(1000)[:3]
+(1000, frozenset({97}), 0)
+>>> reader.close()
+
+Chunks can be compressed in other ways, or not at all.
+
+>>> for compression in (None, 'lzma'):
+...
+...     path = dirpath / f'{compression}.bbrec'
+...
+...     writer = SessionWriter(path, header, get_record, compression)
+...     for frame_index in range(1002):
+...         writer.add_frame(frame_index)
+...     writer.finish(1010)
+...
+...     print(load_session(path) == session_data)
+True
+True
+
+File layout
+***********
+
+Changing how sessions are stored makes existing files unreadable,
+so let's check the layout of an uncompressed session file byte
+by byte, without using the structs of the module.
+
+>>> from struct import Struct
+>>> from marshal import loads
+
+>>> layout_path = dirpath / 'layout.bbrec'
+>>> writer = SessionWriter(layout_path, header, lambda record: record, None)
+>>> writer.add_frame((0, [['ti', {'t': 'hello!'}]], ('K_a',), (), [(10, 20)], []))
+>>> writer.finish(5)
+>>> data = layout_path.read_bytes()
+
+The header has the magic bytes, the format version and the
+marshalled header data preceded by its length.
+
+>>> data[:5], Struct('<H').unpack_from(data, 5)
+(b'BBREC', (2,))
+>>> (length,) = Struct('<I').unpack_from(data, 7)
+>>> loads(data[11:11+length])
+{'recording_title': 'test', 'recording_size': (320, 180), 'compression': None}
+
+Then comes the only chunk, with its first frame index, size and
+number of records. Records have the frame index relative to the
+chunk, kind, flags and four arguments; the text of an event is
+stored in the records following it, four characters per record.
+
+>>> offset = 11 + length
+>>> Struct('<qII').unpack_from(data, offset)
+(0, 120, 6)
+>>> records_offset = offset + 16
+>>> for record in Struct('<HBBiiii').iter_unpack(
+...     data[records_offset:records_offset+120]
+... ):
+...     print(record)
+(0, 0, 0, 97, 0, 0, 0)
+(0, 10, 0, 0, 0, 0, 6)
+(0, 11, 0, 104, 101, 108, 108)
+(0, 11, 0, 111, 33, 0, 0)
+(0, 3, 0, 10, 20, 0, 0)
+(1, 1, 0, 97, 0, 0, 0)
+
+The index has the first frame indices of chunks followed by their
+offsets, and the footer has the index offset, the number of chunks,
+the last frame index and the footer magic bytes.
+
+>>> index_offset = records_offset + 120
+>>> Struct('<qq').unpack_from(data, index_offset) == (0, offset)
+True
+>>> footer = Struct('<QQq5s').unpack_from(data, index_offset + 16)
+>>> footer == (index_offset, 1, 5, b'BBEND')
+True
+>>> len(data) == index_offset + 16 + 29
+True
+
+Unfinished sessions
+*******************
+
+Files lacking the index and footer, which are only written when
+the recording finishes, can still be read. The session ends after
+the last frame recorded.
+
+>>> data = session_path.read_bytes()
+>>> index_offset, no_of_chunks, last_frame_index = read_footer(data)
+
+>>> unfinished_path = dirpath / 'unfinished.bbrec'
+>>> _ = unfinished_path.write_bytes(data[:index_offset])
+>>> read_footer(unfinished_path.read_bytes()) is None
+True
+
+>>> unfinished_data = load_session(unfinished_path)
+>>> unfinished_data['last_frame_index']
+1002
+>>> unfinished_data == {**session_data, 'last_frame_index': 1002}
+True
+
+>>> reader = open_session(unfinished_path)
+>>> reader.last_frame_index
+1002
+>>> reader.close()
+
+If the file ends before its last chunk is complete, as if the app
+was closed while writing it, the incomplete chunk is ignored and
+keys still pressed in the last frame recorded are released after
+it.
+
+>>> reader = open_session(session_path)
+>>> second_chunk_offset = reader.chunk_offsets[1]
+>>> reader.close()
+
+>>> _ = unfinished_path.write_bytes(data[:second_chunk_offset + 10])
+
+>>> unfinished_data = load_session(unfinished_path)
+>>> unfinished_data['last_frame_index']
+4
+>>> unfinished_data['key_name_to_frames_map']
+{'K_RIGHT': [0, 1, 2, 3]}
+>>> unfinished_data['events_map']
+{3: [['ti', {'t': 'hello!'}]]}
+
+>>> reader = open_session(unfinished_path)
+>>> reader.last_frame_index
+4
+>>> reader.pop_frame(3)[:3]
+(3, frozenset({1073741903}), 0)
+>>> reader.pop_frame(4) is None
+True
+>>> reader.close()
+
+>>> temp_dir.cleanup()
+"""
+
+from doctest import DocTestSuite
+
+
+def load_tests(loader, tests, pattern):
+    """Return a test suite.
+
+    This function is used for test discovery and its name,
+    signature and return value are defined by the load_tests
+    protocol described in the standard library unittest
+    module online documentation.
+    """
+    ### return a test suite from the doctests in this module
+    return DocTestSuite()
@@ -0,0 +1,246 @@
+"""Facility for the library of recorded sessions.
+
+Sessions recorded by the record mode are saved in the recordings
+directory, along with an index file caching data about each of
+them (title, size, last frame index, duration and checksum), so
+listing recordings and choosing one to play only requires listing
+the directory, rather than opening the recordings themselves.
+
+The index is updated whenever the record mode saves a session.
+Files added to (or removed from) the directory by other means are
+noticed when the recordings are listed: only files which aren't
+in the index yet, or whose size or modification time changed, are
+read to be indexed.
+
+Recordings can be listed with:
+
+    python -m bionicblue.pygamesetup.recordings
+"""
+
+### standard library imports
+
+from zlib import crc32
+
+
+### local imports
+
+from ..config import RECORDINGS_DIR
+
+from ..ourstdlibs.pyl import load_pyl_from_source, save_pyl
+
+from .constants import FPS
+
+from .sessionfile import SESSION_SUFFIXES, open_session
+
+
+
+### path of the index file
+INDEX_PATH = RECORDINGS_DIR / 'index.pyl'
+
+### must be incremented whenever the data stored in the index changes,
+### so that existing indices are rebuilt
+INDEX_FORMAT_VERSION = 1
+
+
+### index operations
+
+def load_index():
+    """Return map of recording file names to their data.
+
+    If there's no index or it can't be used, an empty map is
+    returned, so all recordings are indexed again.
+    """
+    try:
+        index_data = load_pyl_from_source(INDEX_PATH)
+
+    except Exception:
+        return {}
+
+    if index_data.get('format_version') != INDEX_FORMAT_VERSION:
+        return {}
+
+    return index_data['recordings']
+
+
+def save_index(recordings):
+    """Save map of recording file names to their data as the index.
+
+    The index is saved in a temporary file first, which then
+    replaces the current one, so the index is never left half
+    written.
+    """
+    RECORDINGS_DIR.mkdir(parents=True, exist_ok=True)
+
+    temp_path = INDEX_PATH.with_suffix('.tmp')
+
+    save_pyl(
+        {
+            'format_version': INDEX_FORMAT_VERSION,
+            'recordings': recordings,
+        },
+        temp_path,
+    )
+
+    temp_path.replace(INDEX_PATH)
+
+
+def get_recording_data(
+    filepath,
+    recording_title,
+    recording_size,
+    last_frame_index,
+    checksum,
+):
+    """Return data about recording stored in the index."""
+
+    stat_result = filepath.stat()
+
+    return {
+        'recording_title': recording_title,
+        'recording_size': tuple(recording_size),
+        'last_frame_index': last_frame_index,
+        'duration': last_frame_index / FPS,
+        'checksum': checksum,
+        'file_size': stat_result.st_size,
+        'modified_ns': stat_result.st_mtime_ns,
+    }
+
+
+def read_recording_data(filepath):
+    """Return data about recording to be stored in the index.
+
+    Only used for files not saved by the record mode.
+    """
+    reader = open_session(filepath)
+
+    try:
+
+        return get_recording_data(
+            filepath,
+            reader.header['recording_title'],
+            reader.header['recording_size'],
+            reader.last_frame_index,
+            crc32(filepath.read_bytes()),
+        )
+
+    finally:
+        reader.close()
+
+
+def add_recording(
+    filepath,
+    recording_title,
+    recording_size,
+    last_frame_index,
+    checksum,
+):
+    """Add recording just saved in the recordings directory to index."""
+
+    recordings = load_index()
+
+    recordings[filepath.name] = get_recording_data(
+        filepath,
+        recording_title,
+        recording_size,
+        last_frame_index,
+        checksum,
+    )
+
+    save_index(recordings)
+
+
+def update_index():
+    """Return index updated with changes in the recordings directory.
+
+    That is, recordings removed are left out of the index and
+    recordings which weren't indexed or changed since then are
+    (re)indexed; the index is only saved if it changed.
+    """
+    recordings = load_index()
+
+    if not RECORDINGS_DIR.exists():
+        return {}
+
+    updated_recordings = {}
+
+    for path in RECORDINGS_DIR.iterdir():
+
+        if (
+            path.suffix not in SESSION_SUFFIXES
+            or path.name.startswith('.')
+            or path == INDEX_PATH
+        ):
+            continue
+
+        recording_data = recordings.get(path.name)
+        stat_result = path.stat()
+
+        if (
+            recording_data is None
+            or recording_data['file_size'] != stat_result.st_size
+            or recording_data['modified_ns'] != stat_result.st_mtime_ns
+        ):
+
+            ### files which can't be read aren't indexed
+
+            try:
+                recording_data = read_recording_data(path)
+
+            except Exception as err:
+
+                print(f"Couldn't index recording {path.name}: {err}")
+                continue
+
+        updated_recordings[path.name] = recording_data
+
+    if updated_recordings != recordings:
+        save_index(updated_recordings)
+
+    return updated_recordings
+
+
+def get_recordings():
+    """Return list of (path, data) pairs of recordings, newest first."""
+
+    return sorted(
+
+        (
+            (RECORDINGS_DIR / filename, recording_data)
+            for filename, recording_data in update_index().items()
+        ),
+
+        key=lambda item: item[1]['modified_ns'],
+        reverse=True,
+
+    )
+
+
+def get_latest_recording_path():
+    """Return path of the recording saved last."""
+
+    recordings = get_recordings()
+
+    if not recordings:
+        raise FileNotFoundError(f"There are no recordings in {RECORDINGS_DIR}")
+
+    return recordings[0][0]
+
+
+### listing recordings
+
+def print_recordings():
+    """Print data about each recording, newest first."""
+
+    for path, recording_data in get_recordings():
+
+        print(
+            f"{path.name}"
+            f"  {recording_data['recording_title']}"
+            f"  {recording_data['duration']:.1f}s"
+            f" ({recording_data['last_frame_index']} frames)"
+            f"  {recording_data['checksum']:08x}"
+        )
+
+
+if __name__ == '__main__':
+    print_recordings()
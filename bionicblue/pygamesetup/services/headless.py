@@ -0,0 +1,136 @@
+"""Services for running the game without display or frame cap.
+
+Meant to measure how fast the game is simulated, mainly on
+machines without a display. Nothing is shown on the screen
+(though everything is still drawn on it) and frames aren't
+paced, so the game runs as fast as the CPU allows.
+
+Instead of real input, the events and pressed keys of each
+frame are taken from the maps in this module, which must be
+filled beforehand (see set_input_script()). For the display
+to be absent, the dummy SDL video/audio drivers must be set
+in the environment before pygame is initialized, that is,
+before the constants module of the pygamesetup package is
+imported.
+"""
+
+### third-party imports
+
+from pygame.locals import KMOD_NONE
+
+from pygame.event import Event, set_allowed
+
+
+### local imports
+
+from ...ourstdlibs.behaviour import do_nothing
+
+from ..constants import GENERAL_NS, GENERAL_SERVICE_NAMES
+
+from .normal import (
+    get_mouse_pos,
+    get_mouse_pressed,
+    set_mouse_pos,
+    set_mouse_visibility,
+)
+
+
+
+### maps associating frame indices to the events generated and keys
+### pressed in that frame
+EVENTS_MAP = {}
+PRESSED_KEYS_MAP = {}
+
+
+### special frozenset class
+
+class GetterFrozenSet(frozenset):
+    """frozenset subclass where "obj[item]" works like "item in obj"."""
+    __getitem__ = frozenset.__contains__
+
+## create an empty special frozenset
+EMPTY_GETTER_FROZENSET = GetterFrozenSet()
+
+
+### create and use function to activate headless behaviour
+
+def set_behaviour(services_namespace):
+    """Setup headless mode."""
+
+    ### set headless services as current ones
+
+    our_globals = globals()
+
+    for attr_name in GENERAL_SERVICE_NAMES:
+
+        value = our_globals[attr_name]
+        setattr(services_namespace, attr_name, value)
+
+    ### real events are ignored anyway, so block them
+    set_allowed(None)
+
+    ### set frame index to -1 (so when it is incremented at the beginning
+    ### of the loop it is set to 0, the first frame)
+    GENERAL_NS.frame_index = -1
+
+
+def set_input_script(frame_to_events, frame_to_pressed_keys):
+    """Set input used in each frame.
+
+    frame_to_events (dict)
+        maps frame indices to lists of (event_type, event_dict)
+        pairs to be turned into events generated in that frame.
+    frame_to_pressed_keys (dict)
+        maps frame indices to iterables of keys pressed in that
+        frame.
+    """
+    EVENTS_MAP.clear()
+    PRESSED_KEYS_MAP.clear()
+
+    EVENTS_MAP.update(
+
+        (
+            frame_index,
+            [
+                Event(event_type, event_dict)
+                for event_type, event_dict in events
+            ]
+        )
+
+        for frame_index, events in frame_to_events.items()
+
+    )
+
+    PRESSED_KEYS_MAP.update(
+        (frame_index, GetterFrozenSet(keys))
+        for frame_index, keys in frame_to_pressed_keys.items()
+    )
+
+
+### session behaviours
+
+def get_events():
+    """Return events scripted for current frame."""
+    return EVENTS_MAP.get(GENERAL_NS.frame_index, ())
+
+def get_pressed_keys():
+    """Emulates pygame.key.get_pressed() with keys scripted for frame."""
+    return PRESSED_KEYS_MAP.get(GENERAL_NS.frame_index, EMPTY_GETTER_FROZENSET)
+
+def get_pressed_mod_keys():
+    """Emulates pygame.key.get_mods(); modifiers are never pressed."""
+    return KMOD_NONE
+
+### nothing is shown on the screen
+update_screen = do_nothing
+
+
+def frame_checkups():
+    """Perform various checkups.
+
+    Meant to be used at the beginning of each frame in the
+    app loop. Unlike in other modes, the framerate isn't
+    maintained, so frames are processed as fast as possible.
+    """
+    ### increment frame number
+    GENERAL_NS.frame_index += 1
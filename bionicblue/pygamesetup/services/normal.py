@@ -1,7 +1,7 @@
 
 ### third-party imports
 
-from pygame.event import get as get_events, set_allowed
+from pygame.event import get as get_pygame_events, set_allowed
 
 from pygame.key import (
     get_pressed as get_pressed_keys,
@@ -32,6 +32,10 @@ from ..constants import (
 
 from ..gamepaddirect import GAMEPAD_NS
 
+from ...instrumentation import check_toggling_key
+
+from ...profiling import filter_profiling_key_events
+
 
 
 ### create and use function to activate normal behaviour
@@ -56,6 +60,16 @@ def set_behaviour(services_namespace, reset_window_mode=True):
     stop_text_input()
 
 
+def get_events():
+    """Extends pygame.event.get(), handling the profiling key.
+
+    Events are retrieved right away, rather than when iterated
+    over, since some states rely on events being retrieved before
+    the state of pressed keys.
+    """
+    return filter_profiling_key_events(get_pygame_events())
+
+
 def frame_checkups():
     """Perform various checkups.
 
@@ -71,3 +85,6 @@ def frame_checkups():
     ### store data and post custom events for gamepad
     ### directional triggers
     GAMEPAD_NS.prepare_data_and_events()
+
+    ### toggle frame timers if requested
+    check_toggling_key()
@@ -1,16 +1,10 @@
 
 ### standard library imports
 
-from pathlib import Path
-
-from collections import defaultdict
-
-from functools import reduce
+from collections import deque
 
 from itertools import cycle, repeat
 
-from operator import or_ as bitwise_or
-
 
 ### third-party imports
 
@@ -21,6 +15,8 @@ from pygame.locals import (
     KEYDOWN,
     K_F7, K_F8, K_F9,
 
+    BUTTON_LEFT,
+
     MOUSEMOTION, MOUSEBUTTONDOWN, MOUSEBUTTONUP,
 
     KMOD_NONE,
@@ -29,8 +25,6 @@ from pygame.locals import (
 
 from pygame.color import THECOLORS
 
-from pygame import locals as pygame_locals
-
 from pygame.math import Vector2
 
 from pygame.event import Event, get, set_allowed, set_blocked
@@ -44,12 +38,16 @@ from pygame.draw import rect as draw_rect
 
 ### local imports
 
-from ...config import quit_game
-
-from ...ourstdlibs.pyl import load_pyl
+from ...config import (
+    PLAYBACK_SNAPSHOT_INTERVAL,
+    PLAYBACK_MAX_SNAPSHOTS,
+    quit_game,
+)
 
 from ...exceptions import SwitchModeException
 
+from ...ourstdlibs.behaviour import do_nothing
+
 from ...classes2d.single import UIObject2D
 
 from ...textman import render_text
@@ -64,39 +62,30 @@ from ..constants import (
 
     CancelWhenPaused, pause,
 
-    EVENT_KEY_STRIP_MAP,
-    EVENT_COMPACT_NAME_MAP,
-    EVENT_KEY_COMPACT_NAME_MAP,
-    KEYS_MAP,
-    SCANCODE_NAMES_MAP,
     MOD_KEYS_MAP,
 
 )
 
+from ..sessionfile import open_session
+
+from ..recordings import get_latest_recording_path
 
 
-### dictionary to store session data
-SESSION_DATA = {}
 
 ### custom namespace for playing mode
 PLAY_REFS = type("Object", (), {})()
 
-### map to store events
-EVENTS_MAP = {}
+### namespace to store the input of the frame being played (pressed
+### keys, pressed modifier keys bitmask and events), decoded from the
+### session file by the session reader (stored in PLAY_REFS.reader)
+FRAME_INPUT_NS = type("Object", (), {})()
 
-## create a map to associate each frame index to the keys that were
-## pressed at that frame
-GETTER_FROZENSET_MAP = {}
+### create a deque to hold mouse position requests not yet played
+MOUSE_POSITIONS = deque()
 
-### create a map that associates each frame index to the modifier
-### keys that were pressed in that frame
-BITMASK_MAP = {}
-
-### create a list to hold all mouse position requests;
-MOUSE_POSITIONS = []
-
-### create list to hold all mouse key pressed state requests
-MOUSE_PRESSED_TUPLES = []
+### create deque to hold mouse key pressed state requests not yet
+### played
+MOUSE_PRESSED_TUPLES = deque()
 
 ### create virtual mouse
 MOUSE_POS = Vector2(0, 0)
@@ -105,137 +94,64 @@ MOUSE_POS = Vector2(0, 0)
 ### of virtual one
 PLAY_REFS.mouse_tracing = True
 
-### special frozenset class
-
-class GetterFrozenSet(frozenset):
-    """frozenset subclass where "obj[item]" works like "item in obj"."""
-    __getitem__ = frozenset.__contains__
-
-## create an empty special frozenset
-EMPTY_GETTER_FROZENSET = GetterFrozenSet()
-
-
-
-### TODO collections defined below lack proper commenting
-
-
-REVERSE_EVENT_COMPACT_NAME_MAP = {
-    value: key
-    for key, value in EVENT_COMPACT_NAME_MAP.items()
-}
-
-REVERSE_SCANCODE_NAMES_MAP = {
-    value: key
-    for key, value in SCANCODE_NAMES_MAP.items()
-}
-
-
-##
-
-def get_resulting_bitmask(mod_key_names):
-    """Return bitmask by reducing all modifier keys with bitwise OR."""
-
-    ### return iterable reduced to a single value...
-
-    return reduce(
-
-        ## with the bitwise OR operation
-        bitwise_or,
-
-        ## where the iterable contained the values
-        ## of the named modifier keys
-
-        (
-            # modifier key value obtained from its name
-            getattr(pygame_locals, mod_key_name)
-
-            # modifier key names
-            for mod_key_name in mod_key_names
-        ),
-
-    )
-
-
-## event map
-
-
-def get_ready_events(events):
-    """Return preprocessed objects as pygame.event.Event instances."""
-
-    for event_name, event_dict in events:
-
-        ### restore the event name if it was in a custom compact form
-
-        if event_name in REVERSE_EVENT_COMPACT_NAME_MAP:
-            event_name = REVERSE_EVENT_COMPACT_NAME_MAP[event_name]
-
-        ### restore names of keys in the event name if they were in a
-        ### custom compact form
-
-        if event_name in EVENT_KEY_COMPACT_NAME_MAP:
-
-            for full_key, compact_key in (
-                EVENT_KEY_COMPACT_NAME_MAP[event_name].items()
-            ):
-
-                if compact_key in event_dict:
-                    event_dict[full_key] = event_dict.pop(compact_key)
+### map to store snapshots of the game state by the index of the
+### frame they were taken at (before the frame was processed)
+SNAPSHOTS = {}
 
-        ### restore missing keys in the event using default values
+### number of frames between snapshots; doubled whenever there are too
+### many snapshots (see thin_snapshots()); if 0, no snapshots are taken
+### and seeking frames isn't possible
+PLAY_REFS.snapshot_interval = PLAYBACK_SNAPSHOT_INTERVAL
 
-        if event_name in EVENT_KEY_STRIP_MAP:
+### index of frame to seek at the beginning of the next frame, if any
+PLAY_REFS.seek_target = None
 
-            for key, default in EVENT_KEY_STRIP_MAP[event_name].items():
-                event_dict.setdefault(key, default)
+### flag indicating whether the timeline scrubber is being dragged
+PLAY_REFS.scrubbing = False
 
-        ### if dealing with KEY_... events, perform extra preprocessing
-        ### in the event dict
+### operations for taking snapshots and simulating frames, provided by
+### the game with set_snapshot_operations(); until then, seeking frames
+### isn't possible
 
-        if event_name in ('KEYUP', 'KEYDOWN'):
+PLAY_REFS.take_snapshot = None
+PLAY_REFS.simulate_frames = None
 
-            ## turn key name and scan code name into the respective
-            ## values
+### height of area at the top of the screen where clicking/dragging
+### seeks frames
+SCRUBBER_HEIGHT = 8
 
-            for key, treatment_operation in (
-
-                ('key', KEYS_MAP.__getitem__),
-                ('scancode', REVERSE_SCANCODE_NAMES_MAP.__getitem__),
-
-            ):
-                event_dict[key] = treatment_operation(event_dict[key])
-
-            ## if the 'mod' key is a tuple, it contains names of
-            ## modifiers, so replace it by the respective bitmask
-            ## that represent the modifiers
-
-            if type(event_dict['mod']) is tuple:
-
-                ## get names
-                mod_key_names = event_dict['mod']
-
-                ## reassign value to 'mod'
-                event_dict['mod'] = (
-
-                    # if there's only one name, just use the key value
-                    getattr(pygame_locals, mod_key_names[0])
-                    if len(mod_key_names) == 1
-
-                    # otherwise build the bitmask with all modifier
-                    # values
-                    else get_resulting_bitmask(mod_key_names)
-
-                )
+### special frozenset class
 
-        ### obtain the event type
-        event_type = getattr(pygame_locals, event_name)
+class GetterFrozenSet(frozenset):
+    """frozenset subclass where "obj[item]" works like "item in obj"."""
+    __getitem__ = frozenset.__contains__
 
-        ### yield a pygame.event.Event object
-        yield Event(event_type, event_dict)
+## create an empty special frozenset
+EMPTY_GETTER_FROZENSET = GetterFrozenSet()
 
 
 
-def set_behaviour(services_namespace):
-    """Setup play services and data."""
+def set_behaviour(
+    services_namespace,
+    session_path=None,
+    playback_speed=FPS,
+    take_snapshots=True,
+):
+    """Setup play services and data.
+
+    session_path (pathlib.Path or None)
+        path of the recorded session to play; if None, the latest
+        session in the recordings directory is played (chosen from
+        its index, without opening the other sessions).
+    playback_speed (integer)
+        frames per second used to play the session; if 0, the
+        session is played as fast as possible (uncapped speed).
+    take_snapshots (boolean)
+        whether snapshots of the game state are taken during
+        playback, which is what allows seeking frames; can be
+        disabled so the playback only does the work of the
+        game itself (as when measuring its performance).
+    """
 
     ### set play services as current ones
 
@@ -246,29 +162,32 @@ def set_behaviour(services_namespace):
         value = our_globals[attr_name]
         setattr(services_namespace, attr_name, value)
 
-    ### load session data
+    ### open session file
 
-    path = str(
-        next(
-            item
-            for item in Path.home().iterdir()
-            if item.name.endswith('.pyl')
-            if not item.name.startswith('.')
-        )
-    )
+    if session_path is None:
 
-    SESSION_DATA.update(load_pyl(path))
+        session_path = get_latest_recording_path()
 
-    ### retrieve playback speed and last frame index
+    ### frames are decoded from the session file as they are played
+    reader = PLAY_REFS.reader = open_session(session_path)
 
-    playback_speed = FPS
-    last_frame_index = SESSION_DATA['last_frame_index']
+    ### retrieve last frame index
+
+    last_frame_index = reader.last_frame_index
 
     ### store playback speed, last frame index and recording width
 
     PLAY_REFS.fps = playback_speed
     PLAY_REFS.last_frame_index = last_frame_index
-    PLAY_REFS.recording_width = SESSION_DATA['recording_size'][0]
+    PLAY_REFS.recording_width = reader.header['recording_size'][0]
+
+    ### store interval between snapshots; 0 means no snapshots are taken
+
+    PLAY_REFS.snapshot_interval = (
+        PLAYBACK_SNAPSHOT_INTERVAL
+        if take_snapshots
+        else 0
+    )
 
     ### create and store title and duration label, then reposition
     ### all labels
@@ -276,7 +195,7 @@ def set_behaviour(services_namespace):
     new_title_label = (
         UIObject2D.from_surface(
             render_text(
-                text = SESSION_DATA['recording_title'],
+                text = reader.header['recording_title'],
                 style = 'regular',
                 size = 12,
                 padding = 0,
@@ -333,102 +252,13 @@ def set_behaviour(services_namespace):
     ### just a few that we may use to during playback
 
     set_blocked(None)
-    set_allowed([QUIT, KEYDOWN])
-
-    ### prepare events
-
-    EVENTS_MAP.update(
-
-        (frame_index, list(get_ready_events(compact_events)))
-
-        for frame_index, compact_events
-        in SESSION_DATA['events_map'].items()
-
-    )
-
-
-    ### prepare key states
-
-    ## convert from compact to suitable format to use
-
-    frame_to_keys_map = defaultdict(list)
-
-    for key_name, frames in SESSION_DATA['key_name_to_frames_map'].items():
-
-        for frame in frames:
-            frame_to_keys_map[frame].append(key_name)
-
-
-    ## update map with frozensets
-
-    GETTER_FROZENSET_MAP.update(
-
-        (
-            frame_index,
-
-            GetterFrozenSet(
-                getattr(pygame_locals, key_name)
-                for key_name in pressed_key_names
-            )
-
-        )
-
-        for frame_index, pressed_key_names
-        in frame_to_keys_map.items()
-
-    )
-
-
-    ### prepare modifier key states
+    set_allowed([QUIT, KEYDOWN, MOUSEBUTTONDOWN, MOUSEMOTION, MOUSEBUTTONUP])
 
-    ## convert from compact to suitable format to use
+    ### no keys are pressed before the first frame
 
-    frame_to_mod_key_names = defaultdict(list)
-
-    for mod_key_name, frames in SESSION_DATA['mod_key_name_to_frames_map'].items():
-
-        for frame in frames:
-            frame_to_mod_key_names[frame].append(mod_key_name)
-
-    ## update map with bitmasks
-
-    BITMASK_MAP.update(
-
-        (
-            frame_index,
-
-            (
-
-                ## if there's only one modifier key pressed, get its value
-                ## from pygame.locals
-                getattr(pygame_locals, mod_key_names[0])
-                if len(mod_key_names) == 1
-
-                ## otherwise get the bitmask that results from combining
-                ## the values of all pressed modifiers
-                else get_resulting_bitmask(mod_key_names)
-
-            )
-
-        )
-
-        for frame_index, mod_key_names
-        in frame_to_mod_key_names.items()
-    )
-
-    ### update list containing all mouse position requests;
-    ###
-    ### then reverse its orders so the first ones are the first
-    ### ones to be popped from the list
-
-    MOUSE_POSITIONS.extend(SESSION_DATA['mouse_pos_requests'])
-    MOUSE_POSITIONS.reverse()
-
-    ### do the same as above to list of all mouse key pressed
-    ### state requests (create and reverse it)
-
-    MOUSE_PRESSED_TUPLES.extend(SESSION_DATA['mouse_key_state_requests'])
-    MOUSE_PRESSED_TUPLES.reverse()
+    FRAME_INPUT_NS.pressed_keys = EMPTY_GETTER_FROZENSET
+    FRAME_INPUT_NS.mods_bitmask = KMOD_NONE
+    FRAME_INPUT_NS.events = ()
 
     ### set frame index to -1 (so when it is incremented at the beginning
     ### of the loop it is set to 0, the first frame)
@@ -462,6 +292,7 @@ LABELS = [
         "F7: leave playing mode",
         "F8: play/pause",
         "F9: toggle mouse control",
+        "Click/drag top bar: seek",
     )
 
 ]
@@ -491,9 +322,28 @@ def get_events():
     if GENERAL_NS.frame_index == PLAY_REFS.last_frame_index:
         leave_playing_mode()
 
-    ### process QUIT or KEYDOWN event (for the F9 key) if
-    ### they are thrown
+    ### process events from the user
+    PLAY_REFS.process_user_events()
+
+    ### play the recorded events of the current frame, if any
+
+    for event_type, event_items in FRAME_INPUT_NS.events:
+
+        event = Event(event_type, dict(event_items))
+
+        ## if we have a mouse event, we use it to position the mouse
+        if event.type in MOUSE_EVENTS:
+            set_mouse_pos(event.pos)
+
+        ## finally yield the event, regardless of its type
+        yield event
 
+def process_user_events():
+    """Process events from the user controlling the playback.
+
+    That is, QUIT and KEYDOWN events (for the F7, F8 and F9 keys)
+    and mouse events over the timeline scrubber.
+    """
     for event in get():
 
         if event.type == QUIT:
@@ -529,21 +379,32 @@ def get_events():
             elif event.key == K_F7:
                 leave_playing_mode()
 
-    ### play the recorded events
+        ### seek frames by clicking/dragging the timeline scrubber
+
+        elif event.type == MOUSEBUTTONDOWN:
+
+            if event.button == BUTTON_LEFT and event.pos[1] < SCRUBBER_HEIGHT:
+
+                PLAY_REFS.scrubbing = True
+                seek(get_scrubbed_frame_index(event.pos[0]))
+
+        elif event.type == MOUSEMOTION:
 
-    ## if there are events for the current frame index in the event map,
-    ## iterate over them
+            if PLAY_REFS.scrubbing:
+                seek(get_scrubbed_frame_index(event.pos[0]))
 
-    if GENERAL_NS.frame_index in EVENTS_MAP:
+        elif event.type == MOUSEBUTTONUP:
 
-        for event in EVENTS_MAP[GENERAL_NS.frame_index]:
+            if event.button == BUTTON_LEFT:
+                PLAY_REFS.scrubbing = False
 
-            ## if we have a mouse event, we use it to position the mouse
-            if event.type in MOUSE_EVENTS:
-                set_mouse_pos(event.pos)
+PLAY_REFS.process_user_events = process_user_events
 
-            ## finally yield the event, regardless of its type
-            yield event
+def get_scrubbed_frame_index(x):
+    """Return index of frame at x coordinate of timeline scrubber."""
+    return round(
+        x / PLAY_REFS.recording_width * PLAY_REFS.last_frame_index
+    )
 
 
 ## processing key pressed states
@@ -554,18 +415,7 @@ def get_pressed_keys():
     That is, the return value despite being a different object, works
     just like the return value of pygame.key.get_pressed().
     """
-
-    return (
-
-        ### return a GetterFrozenSet for the current
-        ### frame index if there's one
-        GETTER_FROZENSET_MAP[GENERAL_NS.frame_index]
-        if GENERAL_NS.frame_index in GETTER_FROZENSET_MAP
-
-        ### otherwise return an empty GetterFrozenSet
-        else EMPTY_GETTER_FROZENSET
-
-    )
+    return FRAME_INPUT_NS.pressed_keys
 
 
 ## processing modifier key pressed states
@@ -575,17 +425,7 @@ def get_pressed_mod_keys():
 
     That is, the return value is also a bitmask or pygame.locals.KMOD_NONE.
     """
-
-    return (
-
-        ### return a bitmask for the current frame index if there's one
-        BITMASK_MAP[GENERAL_NS.frame_index]
-        if GENERAL_NS.frame_index in BITMASK_MAP
-
-        ### otherwise return pygame.locals.KMOD_NONE
-        else KMOD_NONE
-
-    )
+    return FRAME_INPUT_NS.mods_bitmask
 
 
 ## processing mouse position getting and setting
@@ -593,7 +433,7 @@ def get_pressed_mod_keys():
 def get_mouse_pos():
     """Emulates pygame.mouse.get_pos(); performs additional setups."""
     ### grab recorded position
-    pos = MOUSE_POSITIONS.pop()
+    pos = MOUSE_POSITIONS.popleft()
 
     ### set mouse pointer to the position
     set_mouse_pos(pos)
@@ -620,21 +460,24 @@ def set_mouse_pos(pos):
 ## this get_mouse_pressed() callable is used to emulate the
 ## pygame.mouse.get_pressed() function and return the same kind
 ## of value
-get_mouse_pressed = MOUSE_PRESSED_TUPLES.pop
+get_mouse_pressed = MOUSE_PRESSED_TUPLES.popleft
 
 
 ### screen updating
 
 def update_screen():
     """Extends pygame.display.update()."""
-    ### draw progress
+    ### draw progress over the track of the timeline scrubber, along
+    ### with the scrubber handle
 
     width = round(
         abs(GENERAL_NS.frame_index / PLAY_REFS.last_frame_index) # progress
         * PLAY_REFS.recording_width                              # full width
     )
 
+    draw_rect(SCREEN, 'grey20', (0, 0, PLAY_REFS.recording_width, 3))
     draw_rect(SCREEN, 'red', (0, 0, width, 3))
+    draw_rect(SCREEN, 'white', (width - 1, 0, 3, 5))
 
     ### blit labels
 
@@ -656,17 +499,24 @@ def leave_playing_mode():
 
 def clear_data():
 
+    ### close session file
+
+    PLAY_REFS.reader.close()
+    del PLAY_REFS.reader
+
     ### clear collections
 
     for collection in (
-        EVENTS_MAP,
-        GETTER_FROZENSET_MAP,
-        BITMASK_MAP,
         MOUSE_POSITIONS,
         MOUSE_PRESSED_TUPLES,
+        SNAPSHOTS,
     ):
         collection.clear()
 
+    PLAY_REFS.seek_target = None
+    PLAY_REFS.scrubbing = False
+    PLAY_REFS.snapshot_interval = PLAYBACK_SNAPSHOT_INTERVAL
+
     ### remove title and duration labels
 
     del LABELS[0]
@@ -687,6 +537,164 @@ def frame_checkups():
     ### increment frame number
     GENERAL_NS.frame_index += 1
 
+    ### seek frame if requested
+
+    if PLAY_REFS.seek_target is not None:
+        seek_target_frame()
+
+    ### take snapshot if due
+    take_due_snapshot(GENERAL_NS.frame_index)
+
+    ### decode input of frame
+    play_frame(GENERAL_NS.frame_index)
+
+
+def play_frame(frame_index):
+    """Make input of given frame of the session the current one."""
+
+    frame_data = PLAY_REFS.reader.pop_frame(frame_index)
+
+    ### frames without data have no events and keep the keys pressed
+    ### in the previous ones
+
+    if frame_data is None:
+
+        FRAME_INPUT_NS.events = ()
+        return
+
+    (
+        _,
+        keys,
+        FRAME_INPUT_NS.mods_bitmask,
+        FRAME_INPUT_NS.events,
+        mouse_positions,
+        mouse_pressed_tuples,
+    ) = frame_data
+
+    FRAME_INPUT_NS.pressed_keys = GetterFrozenSet(keys)
+
+    MOUSE_POSITIONS.extend(mouse_positions)
+    MOUSE_PRESSED_TUPLES.extend(mouse_pressed_tuples)
+
+
+### seeking frames
+
+def set_snapshot_operations(take_snapshot, simulate_frames):
+    """Set operations used to seek frames of the played session.
+
+    take_snapshot (callable)
+        receives objects whose state must be stored along with
+        the game state and returns a snapshot, an object whose
+        restore() method puts the stored state back.
+    simulate_frames (callable)
+        receives an iterable of frame indices and processes the
+        game for each of them, as fast as possible and without
+        showing anything.
+    """
+    PLAY_REFS.take_snapshot = take_snapshot
+    PLAY_REFS.simulate_frames = simulate_frames
+
+def seek(frame_index):
+    """Make playback jump to given frame at the beginning of next frame.
+
+    Seeking backwards restores the nearest snapshot taken before the
+    frame, while seeking forwards continues from the current frame
+    (unless there's a nearer snapshot); either way, the remaining
+    frames are simulated as fast as possible.
+    """
+    if (
+        PLAY_REFS.take_snapshot is None
+        or not PLAY_REFS.snapshot_interval
+    ):
+        return
+
+    PLAY_REFS.seek_target = max(
+        0, min(frame_index, PLAY_REFS.last_frame_index - 1)
+    )
+
+def take_due_snapshot(frame_index):
+    """Take snapshot of game state if due at the given frame."""
+
+    if (
+        PLAY_REFS.take_snapshot is not None
+        and PLAY_REFS.snapshot_interval
+        and not frame_index % PLAY_REFS.snapshot_interval
+        and frame_index not in SNAPSHOTS
+    ):
+
+        ### besides the game state, store the state of the playback
+        ### (the position of the reader in the session file, the
+        ### input of the frame and the mouse requests not yet played)
+
+        SNAPSHOTS[frame_index] = PLAY_REFS.take_snapshot(
+            PLAY_REFS.reader,
+            FRAME_INPUT_NS,
+            MOUSE_POSITIONS,
+            MOUSE_PRESSED_TUPLES,
+            MOUSE_POS,
+        )
+
+        while len(SNAPSHOTS) > PLAYBACK_MAX_SNAPSHOTS:
+            thin_snapshots()
+
+def thin_snapshots():
+    """Discard every other snapshot, doubling the interval between them.
+
+    Snapshots are always taken at multiples of the interval, so those
+    kept are the ones taken at multiples of the doubled interval.
+    """
+    interval = PLAY_REFS.snapshot_interval = PLAY_REFS.snapshot_interval * 2
+
+    for frame_index in [
+        frame_index
+        for frame_index in SNAPSHOTS
+        if frame_index % interval
+    ]:
+        del SNAPSHOTS[frame_index]
+
+def seek_target_frame():
+    """Put game in the state it is at the beginning of the target frame."""
+
+    target = PLAY_REFS.seek_target
+    PLAY_REFS.seek_target = None
+
+    current = GENERAL_NS.frame_index
+
+    start = max(
+        (frame_index for frame_index in SNAPSHOTS if frame_index <= target),
+        default=current,
+    )
+
+    ### restore snapshot, unless the target can be reached faster by
+    ### simulating frames from the current one
+
+    if not start <= current <= target:
+
+        SNAPSHOTS[start].restore()
+        current = start
+
+    ### simulate remaining frames without processing events from the
+    ### user, which are left for the next frame
+
+    PLAY_REFS.process_user_events = do_nothing
+
+    try:
+        PLAY_REFS.simulate_frames(yield_simulated_frames(current, target))
+
+    finally:
+        PLAY_REFS.process_user_events = process_user_events
+
+    GENERAL_NS.frame_index = target
+
+def yield_simulated_frames(start, stop):
+    """Yield frame indices to simulate, taking snapshots due."""
+
+    for frame_index in range(start, stop):
+
+        take_due_snapshot(frame_index)
+        play_frame(frame_index)
+
+        yield frame_index
 
 
 ### small utility
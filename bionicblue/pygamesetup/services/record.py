@@ -3,8 +3,6 @@
 
 from pathlib import Path
 
-from collections import defaultdict
-
 from datetime import datetime
 
 
@@ -44,7 +42,7 @@ from pygame.display import update
 
 ### local imports
 
-from ...ourstdlibs.pyl import save_pyl
+from ...config import RECORDINGS_DIR
 
 from ...exceptions import SwitchModeException
 
@@ -71,6 +69,10 @@ from ..constants import (
 
 )
 
+from ..sessionfile import SessionWriter, SESSION_FILE_SUFFIX
+
+from ..recordings import add_recording
+
 
 
 ### control and data-recording objects
@@ -82,13 +84,12 @@ from ..constants import (
 REC_REFS = type("Object", (), {})()
 
 
-EVENTS_MAP = defaultdict(list)
+## data recorded in the current frame; it is handed to the session
+## writer at the beginning of the next frame (along with the last key
+## states and modifier keys bitmask requested, stored in REC_REFS)
 
-KEY_STATE_REQUESTS = []
-append_key_states = KEY_STATE_REQUESTS.append
-
-MOD_KEY_BITMASK_REQUESTS = []
-append_mod_key_states = MOD_KEY_BITMASK_REQUESTS.append
+FRAME_EVENTS = []
+append_event = FRAME_EVENTS.append
 
 MOUSE_POS_REQUESTS = []
 append_mouse_pos_request = MOUSE_POS_REQUESTS.append
@@ -185,7 +186,8 @@ def set_behaviour(services_namespace):
     now = datetime.now().strftime(TIMESTAMP_FORMAT_STRING)
     title = home.name + '_at_' + now
 
-    filepath = home / 'my_recording.pyl'
+    RECORDINGS_DIR.mkdir(parents=True, exist_ok=True)
+    filepath = RECORDINGS_DIR / f'my_recording{SESSION_FILE_SUFFIX}'
 
     for name, value in (
         ('recording_title', title),
@@ -228,6 +230,12 @@ def set_behaviour(services_namespace):
     ## record beginning of recording session
     REC_REFS.session_start_datetime = datetime.now()
 
+    ## start writing session file
+    REC_REFS.writer = get_session_writer()
+
+    ## reset data of current frame
+    clear_frame_data()
+
     ## set frame index to -1 (so it is set to 0 at the beginning
     ## of the loop, the first frame)
     GENERAL_NS.frame_index = -1
@@ -306,10 +314,10 @@ def get_events():
 
         ### record event
 
-        EVENTS_MAP[GENERAL_NS.frame_index].append([
-            event.type,
-            event.__dict__
-        ])
+        ## the event dict is copied since it is processed later in
+        ## the writing thread, which changes it
+
+        append_event((event.type, event.__dict__.copy()))
 
         ### yield it
         yield event
@@ -322,7 +330,7 @@ def get_pressed_keys():
     key_states = get_pressed()
 
     # record them
-    append_key_states((GENERAL_NS.frame_index, key_states))
+    REC_REFS.key_states = key_states
 
     # return them
     return key_states
@@ -332,7 +340,7 @@ def get_pressed_mod_keys():
     mods_bitmask = get_mods()
 
     # record it
-    append_mod_key_states((GENERAL_NS.frame_index, mods_bitmask))
+    REC_REFS.mods_bitmask = mods_bitmask
 
     # return it
     return mods_bitmask
@@ -354,7 +362,7 @@ def get_mouse_pressed():
     pressed_tuple = mouse_get_pressed()
 
     # record it
-    append_mouse_key_state_request.append(pressed_tuple)
+    append_mouse_key_state_request(pressed_tuple)
 
     # return it
     return pressed_tuple
@@ -383,106 +391,158 @@ def frame_checkups():
     ### keep constants fps
     maintain_fps(FPS)
 
+    ### hand data of last frame to the session writer
+    hand_frame_data()
+
     ### increment frame number
     GENERAL_NS.frame_index += 1
 
 
 ### session data saving operations
 
-def save_session_data():
+def get_session_writer():
+    """Return session writer for a new session file."""
 
-    session_data = {}
+    parent, stem = (
+        getattr(REC_REFS.recording_path, attr_name)
+        for attr_name in ('parent', 'stem')
+    )
 
-    ### process event map
+    timestamp = (
+        REC_REFS.session_start_datetime.strftime(TIMESTAMP_FORMAT_STRING)
+    )
 
-    ## create
+    return SessionWriter(
 
-    events_map = session_data['events_map'] = {
+        parent / f"{stem}.{timestamp}{SESSION_FILE_SUFFIX}",
 
-        frame_index : list(yield_treated_events(events))
-        for frame_index, events in EVENTS_MAP.items()
+        {
+            'recording_size': REC_REFS.recording_size,
+            'recording_title': REC_REFS.recording_title,
+        },
 
-    }
+        get_frame_record,
 
-    ## remove keys whose values (a list of events) ended up empty,
-    ## (if there)
+    )
 
-    keys_to_pop = [
-        # item
-        key
-        # source
-        for key, event_list in events_map.items()
-        # filtering condition
-        if not event_list
-    ]
+def hand_frame_data():
+    """Hand data recorded in current frame to the session writer.
 
-    for key in keys_to_pop:
-        events_map.pop(key)
+    Only references to the data are handed; it is processed in the
+    thread of the writer (see get_frame_record()).
+    """
+    REC_REFS.writer.add_frame((
+        GENERAL_NS.frame_index,
+        tuple(FRAME_EVENTS),
+        REC_REFS.key_states,
+        REC_REFS.mods_bitmask,
+        tuple(MOUSE_POS_REQUESTS),
+        tuple(MOUSE_KEY_STATE_REQUESTS),
+    ))
 
-    ### store data
+    clear_frame_data()
 
-    session_data['key_name_to_frames_map'] = (
-        get_key_to_frames_map(KEY_STATE_REQUESTS)
-    )
+def clear_frame_data():
 
-    session_data['mod_key_name_to_frames_map'] = (
-        get_mod_key_to_frames_map(MOD_KEY_BITMASK_REQUESTS)
-    )
+    for a_collection in (
+        FRAME_EVENTS,
+        MOUSE_POS_REQUESTS,
+        MOUSE_KEY_STATE_REQUESTS,
+    ):
+        a_collection.clear()
 
-    session_data['mouse_pos_requests'] = tuple(MOUSE_POS_REQUESTS)
+    REC_REFS.key_states = None
+    REC_REFS.mods_bitmask = KMOD_NONE
 
-    session_data['mouse_key_state_requests'] = tuple(MOUSE_KEY_STATE_REQUESTS)
+def get_frame_record(frame_data):
+    """Return compact record of frame data or None if there's no data.
 
-    ### store last frame index as well
-    session_data['last_frame_index'] = GENERAL_NS.frame_index + 1
+    Called in the thread of the session writer.
+    """
+    (
+        frame_index,
+        events,
+        key_states,
+        mods_bitmask,
+        mouse_positions,
+        mouse_pressed_tuples,
+    ) = frame_data
+
+    events = list(yield_treated_events(events))
+
+    key_names = (
+
+        ()
+        if key_states is None
+
+        else tuple(
+            key_name # item
+            for key_name, key in KEYS_MAP.items() # source
+            if key_states[key] # filtering condition
+        )
 
-    ### store recording size and title
+    )
 
-    session_data['recording_size'] = REC_REFS.recording_size
+    mod_key_names = (
+        get_mod_key_names_tuple(mods_bitmask)
+        if mods_bitmask != KMOD_NONE
+        else ()
+    )
 
-    session_data['recording_title'] = REC_REFS.recording_title
+    if (
+        events
+        or key_names
+        or mod_key_names
+        or mouse_positions
+        or mouse_pressed_tuples
+    ):
 
-    ### save session data in file or its rotated version
+        return (
+            frame_index,
+            events,
+            key_names,
+            mod_key_names,
+            mouse_positions,
+            mouse_pressed_tuples,
+        )
 
-    parent, stem = (
-        getattr(REC_REFS.recording_path, attr_name)
-        for attr_name in ('parent', 'stem')
-    )
+def save_session_data():
 
-    timestamp = (
-        REC_REFS.session_start_datetime.strftime(TIMESTAMP_FORMAT_STRING)
-    )
+    ### hand data recorded so far in the current frame
+    hand_frame_data()
 
-    final_path = parent / f"{stem}.{timestamp}.pyl"
-    save_pyl(session_data, final_path, width=125, compact=True)
+    ### wait for the writer to write all data, storing the last
+    ### frame index in the file as well
+    writer = REC_REFS.writer
+    last_frame_index = GENERAL_NS.frame_index + 1
 
-    ### clear collections created in this function (not really needed,
-    ### but in our experience memory is freed faster when collections
-    ### are cleared)
+    writer.finish(last_frame_index)
 
-    events_map.clear()
-    session_data.clear()
+    ### add recording to the index of the recordings directory, so
+    ### it can be listed/chosen without being read again
+
+    add_recording(
+        writer.filepath,
+        REC_REFS.recording_title,
+        REC_REFS.recording_size,
+        last_frame_index,
+        writer.checksum,
+    )
 
 def cancel_recording():
 
+    REC_REFS.writer.cancel()
+
     clear_data()
     raise SwitchModeException(mode_name='normal')
 
 def clear_data():
 
-    ### clear collections
-
-    for a_collection in (
-
-        EVENTS_MAP,
-        KEY_STATE_REQUESTS,
-        MOD_KEY_BITMASK_REQUESTS,
-
-        MOUSE_POS_REQUESTS,
-        MOUSE_KEY_STATE_REQUESTS,
+    ### clear data of current frame
+    clear_frame_data()
 
-    ):
-        a_collection.clear()
+    ### the writer isn't needed anymore
+    REC_REFS.writer = None
 
     ### remove title label
     del LABELS[0]
@@ -607,88 +667,6 @@ def get_compact_event_dict(name, a_dict):
     return a_dict
 
 
-def get_key_to_frames_map(time_obj_pairs):
-
-    ### this format is okay, but it can be more compact
-
-    frame_to_key_names_map = {
-        
-        item[0]: item[1]
-
-        for item in (
-
-            (
-
-                ## item 0
-                frame_index,
-
-                ## item 1
-                tuple(
-                    key_name # item
-                    for key_name, key in KEYS_MAP.items() # source
-                    if wrapper[key] # filtering condition
-                )
-
-
-            )
-
-            for frame_index, wrapper in time_obj_pairs
-
-        )
-
-        if item[1]
-
-    }
-
-    ### the format below, the one we actually return, is used
-    ### because it is more compact
-
-    key_name_to_frames_map = defaultdict(list)
-
-    for frame, key_names in frame_to_key_names_map.items():
-
-        for key_name in key_names:
-            key_name_to_frames_map[key_name].append(frame)
-
-    ###
-    return dict(key_name_to_frames_map)
-
-def get_mod_key_to_frames_map(frame_bitmask_pairs):
-
-    ### this format is okay, but it can be more compact
-
-    frame_to_mod_key_names_map = {
-        frame_index: mod_key_names
-        for frame_index, mod_key_names
-        in yield_frame_and_mod_keys_names(frame_bitmask_pairs)
-    }
-
-    ### the format below, the one we actually return, is used
-    ### because it is more compact
-
-    mod_key_name_to_frames_map = defaultdict(list)
-
-    for frame, mod_key_names in frame_to_mod_key_names_map.items():
-
-        for key in mod_key_names:
-            mod_key_name_to_frames_map[key].append(frame)
-
-    ###
-    return dict(mod_key_name_to_frames_map)
-
-
-def yield_frame_and_mod_keys_names(frame_bitmask_pairs):
-
-    for frame_index, bitmask in frame_bitmask_pairs:
-
-        if bitmask != KMOD_NONE:
-
-            yield (
-                frame_index,
-                get_mod_key_names_tuple(bitmask),
-            )
-
-
 def get_mod_key_names_tuple(bitmask):
 
     return tuple(
@@ -0,0 +1,1397 @@
+"""Facility for writing/reading recorded sessions in session files.
+
+Rather than keeping the whole session in memory and saving it
+all at once when the recording finishes, the record mode hands
+the data of each frame to a SessionWriter, whose thread encodes
+it and appends it to an open session file. The number of frames
+waiting to be written is limited, so memory used while recording
+doesn't grow with the length of the session.
+
+Session files are binary. Rather than storing the keys pressed in
+each frame, only the frames wherein keys (and modifier keys) are
+pressed and released are stored, so holding a key costs nothing.
+Events, key transitions and mouse requests are all stored as
+fixed-size records (see RECORD_STRUCT), which are grouped in
+chunks of up to RECORDING_CHUNK_FRAMES frames, each compressed
+on its own.
+
+A session file is laid out like this:
+
+    header
+        MAGIC bytes, format version and the header data (a dict
+        with the recording title and size and the compression
+        used) marshalled and preceded by its length
+    chunks
+        each with its first frame index, size and number of
+        records (see CHUNK_STRUCT), followed by its records,
+        compressed
+    index
+        first frame indices and offsets of all chunks
+    footer
+        offset of the index, number of chunks, last frame index
+        and FOOTER_MAGIC bytes
+
+The index and footer are written when the recording finishes.
+Files without them (for instance, because the app was closed
+while recording) can still be read, since chunks can be found
+by reading them one after the other.
+
+For playing, a SessionReader decodes frames on demand from the
+memory-mapped file, instead of loading the whole session, so
+playback starts right away and the memory used doesn't grow with
+the length of the session.
+
+Sessions can be converted to and from .pyl files, the format
+used by earlier versions of the record mode:
+
+    python -m bionicblue.pygamesetup.sessionfile SOURCE [DESTINATION]
+"""
+
+### standard library imports
+
+from sys import argv
+
+from pathlib import Path
+
+from collections import defaultdict, deque
+
+from array import array
+
+from marshal import dumps, loads
+
+from struct import Struct
+
+from queue import Queue
+
+from threading import Thread
+
+from mmap import mmap, ACCESS_READ
+
+from tempfile import TemporaryDirectory
+
+from functools import reduce
+
+from operator import or_ as bitwise_or
+
+import zlib, lzma
+
+
+### third-party imports
+
+from pygame import locals as pygame_locals
+
+from pygame.locals import KMOD_NONE
+
+
+### local imports
+
+from ..config import (
+    RECORDING_BUFFER_FRAMES,
+    RECORDING_CHUNK_FRAMES,
+    RECORDING_COMPRESSION,
+    PLAYBACK_LOOKAHEAD_FRAMES,
+)
+
+from ..ourstdlibs.pyl import load_pyl, save_pyl
+
+from .constants import (
+    EVENT_KEY_STRIP_MAP,
+    EVENT_COMPACT_NAME_MAP,
+    EVENT_KEY_COMPACT_NAME_MAP,
+    KEYS_MAP,
+    SCANCODE_NAMES_MAP,
+    MOD_KEYS_MAP,
+)
+
+
+
+### suffix of session files
+SESSION_FILE_SUFFIX = '.bbrec'
+
+### suffixes of files with recorded sessions, which can be played
+SESSION_SUFFIXES = frozenset((SESSION_FILE_SUFFIX, '.pyl'))
+
+### bytes at the start of session files and at the end of their
+### footer
+MAGIC = b'BBREC'
+FOOTER_MAGIC = b'BBEND'
+
+### must be incremented whenever the format of session files changes
+FORMAT_VERSION = 2
+
+### structs of the version number, of the length of the header, of
+### chunks and of the footer
+
+VERSION_STRUCT = Struct('<H')
+LENGTH_STRUCT = Struct('<I')
+CHUNK_STRUCT = Struct('<qII')
+FOOTER_STRUCT = Struct(f'<QQq{len(FOOTER_MAGIC)}s')
+
+### struct of records: frame index relative to the first one of the
+### chunk, kind of record, flags and four integer arguments
+RECORD_STRUCT = Struct('<HBBiiii')
+
+### typecode of arrays in the index (signed 64-bit integers)
+INDEX_TYPECODE = 'q'
+
+### compression and decompression operations of chunks
+
+COMPRESSION_MAP = {
+    None: (bytes, bytes),
+    'zlib': (zlib.compress, zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+}
+
+
+### kinds of records and their arguments
+
+## key pressed/released (key)
+KEY_PRESSED = 0
+KEY_RELEASED = 1
+
+## modifier keys changed (bitmask)
+MODS_CHANGED = 2
+
+## mouse position requested (x, y)
+MOUSE_POS = 3
+
+## mouse buttons state requested (number of buttons; the state of
+## each button is a bit of the flags)
+MOUSE_PRESSED = 4
+
+## key events (key, scancode, modifier keys bitmask, length of text)
+KEYDOWN_EVENT = 5
+KEYUP_EVENT = 6
+
+## mouse motion event (x, y, relative x, relative y; flags hold the
+## state of each button and the touch value in TOUCH_FLAG)
+MOUSEMOTION_EVENT = 7
+
+## mouse button events (x, y, button; flags hold the touch value)
+MOUSEBUTTONDOWN_EVENT = 8
+MOUSEBUTTONUP_EVENT = 9
+
+## text input event (length of text)
+TEXTINPUT_EVENT = 10
+
+## characters of the text of the preceding event (up to four
+## character codes)
+CHARS = 11
+
+TOUCH_FLAG = 1 << 7
+
+### kinds of records of events with text (whose last argument is the
+### length of the text)
+TEXT_EVENT_KINDS = frozenset((KEYDOWN_EVENT, KEYUP_EVENT, TEXTINPUT_EVENT))
+
+### names of events stored as each kind of record and the fields
+### of each event, which are all stored
+
+EVENT_KIND_MAP = {
+    'KEYDOWN': KEYDOWN_EVENT,
+    'KEYUP': KEYUP_EVENT,
+    'MOUSEMOTION': MOUSEMOTION_EVENT,
+    'MOUSEBUTTONDOWN': MOUSEBUTTONDOWN_EVENT,
+    'MOUSEBUTTONUP': MOUSEBUTTONUP_EVENT,
+    'TEXTINPUT': TEXTINPUT_EVENT,
+}
+
+EVENT_NAME_MAP = {
+    kind: name
+    for name, kind in EVENT_KIND_MAP.items()
+}
+
+EVENT_TYPE_MAP = {
+    kind: getattr(pygame_locals, name)
+    for kind, name in EVENT_NAME_MAP.items()
+}
+
+EVENT_FIELDS_MAP = {
+    'KEYDOWN': frozenset(('key', 'scancode', 'mod', 'unicode', 'window')),
+    'KEYUP': frozenset(('key', 'scancode', 'mod', 'unicode', 'window')),
+    'MOUSEMOTION': frozenset(('pos', 'rel', 'buttons', 'touch', 'window')),
+    'MOUSEBUTTONDOWN': frozenset(('pos', 'button', 'touch', 'window')),
+    'MOUSEBUTTONUP': frozenset(('pos', 'button', 'touch', 'window')),
+    'TEXTINPUT': frozenset(('text', 'window')),
+}
+
+### maps between names in session data and values stored
+
+REVERSE_EVENT_COMPACT_NAME_MAP = {
+    value: key
+    for key, value in EVENT_COMPACT_NAME_MAP.items()
+}
+
+REVERSE_EVENT_KEY_COMPACT_NAME_MAP = {
+
+    event_name: {
+        value: key
+        for key, value in compact_name_map.items()
+    }
+
+    for event_name, compact_name_map in EVENT_KEY_COMPACT_NAME_MAP.items()
+
+}
+
+## the record mode names keys in events after the last name with the
+## same value
+REVERSE_KEYS_MAP = {
+    value: key
+    for key, value in KEYS_MAP.items()
+}
+
+## ...but stores all names of each key pressed
+KEY_NAMES_MAP = defaultdict(tuple)
+
+for key_name, key in KEYS_MAP.items():
+    KEY_NAMES_MAP[key] += (key_name,)
+
+REVERSE_SCANCODE_NAMES_MAP = {
+    value: key
+    for key, value in SCANCODE_NAMES_MAP.items()
+}
+
+
+### session writing
+
+class SessionWriter:
+    """Writes frames of a session in a file from its own thread."""
+
+    def __init__(
+        self,
+        filepath,
+        header,
+        get_record,
+        compression=RECORDING_COMPRESSION,
+    ):
+        """Open file, write header and start writing thread.
+
+        filepath (pathlib.Path)
+            path of the session file.
+        header (dict)
+            data describing the recording, like its title.
+        get_record (callable)
+            receives the data of a frame as given to add_frame()
+            and returns its record (see SessionEncoder.add_record())
+            or None, if there's nothing worth recording; called in
+            the writing thread, so the recording mode can leave the
+            processing of the data to it.
+        compression (None or string)
+            compression of chunks; a key of COMPRESSION_MAP.
+        """
+        self.filepath = filepath
+        self.get_record = get_record
+
+        self.file = open(filepath, 'wb')
+
+        ### CRC-32 checksum of all bytes written
+        self.checksum = 0
+
+        header_bytes = dumps({**header, 'compression': compression})
+
+        self.write(
+            MAGIC
+            + VERSION_STRUCT.pack(FORMAT_VERSION)
+            + LENGTH_STRUCT.pack(len(header_bytes))
+            + header_bytes
+        )
+
+        self.encoder = SessionEncoder(
+            self.write_chunk,
+            COMPRESSION_MAP[compression][0],
+        )
+
+        ### first frame indices and offsets of the chunks written
+        self.frames = array(INDEX_TYPECODE)
+        self.offsets = array(INDEX_TYPECODE)
+
+        ### exception raised while writing, if any
+        self.error = None
+
+        ### once full, adding frames waits for the thread to write
+        ### the ones already added
+        self.queue = Queue(RECORDING_BUFFER_FRAMES)
+
+        ### frames are added by putting them in the queue
+        self.add_frame = self.queue.put
+
+        self.thread = Thread(target=self.encode_frames, daemon=True)
+        self.thread.start()
+
+    def encode_frames(self):
+        """Encode records of frames added until None is added."""
+
+        get_frame = self.queue.get
+        get_record = self.get_record
+        add_record = self.encoder.add_record
+
+        while True:
+
+            frame_data = get_frame()
+
+            if frame_data is None:
+                break
+
+            ### once an error happens, frames are just taken from the
+            ### queue, so adding them doesn't block
+
+            if self.error is not None:
+                continue
+
+            try:
+
+                record = get_record(frame_data)
+
+                if record is not None:
+                    add_record(record)
+
+            except Exception as err:
+                self.error = err
+
+    def write_chunk(self, first_frame_index, data, no_of_records):
+        """Write chunk and store its first frame index and offset."""
+
+        self.frames.append(first_frame_index)
+        self.offsets.append(self.file.tell())
+
+        self.write(
+            CHUNK_STRUCT.pack(first_frame_index, len(data), no_of_records)
+            + data
+        )
+
+    def finish(self, last_frame_index):
+        """Wait for all frames to be written, then write index/footer.
+
+        last_frame_index (integer)
+            index of frame wherein the recording finished (the
+            session is played up to it).
+
+        If an error happened while writing frames, it is raised
+        here.
+        """
+        self.stop()
+
+        file = self.file
+
+        try:
+
+            if self.error is not None:
+                raise self.error
+
+            self.encoder.finish(last_frame_index)
+
+            index_offset = file.tell()
+
+            self.write(self.frames.tobytes() + self.offsets.tobytes())
+
+            self.write(
+                FOOTER_STRUCT.pack(
+                    index_offset,
+                    len(self.frames),
+                    last_frame_index,
+                    FOOTER_MAGIC,
+                )
+            )
+
+        finally:
+            file.close()
+
+    def write(self, data):
+        """Write data in file, updating the checksum."""
+
+        self.file.write(data)
+        self.checksum = zlib.crc32(data, self.checksum)
+
+    def cancel(self):
+        """Stop writing and delete the file."""
+
+        self.stop()
+        self.file.close()
+
+        ### Path.unlink() only accepts missing_ok in Python 3.8+
+
+        try:
+            self.filepath.unlink()
+
+        except FileNotFoundError:
+            pass
+
+    def stop(self):
+        """Wait for the thread to write all added frames and end."""
+
+        self.add_frame(None)
+        self.thread.join()
+
+
+class SessionEncoder:
+    """Encodes records of frames into chunks of fixed-size records."""
+
+    def __init__(self, write_chunk, compress):
+        """Store operations and set initial state.
+
+        write_chunk (callable)
+            receives the first frame index of a chunk, its data and
+            its number of records.
+        compress (callable)
+            receives the records of a chunk (bytes) and returns
+            them compressed.
+        """
+        self.write_chunk = write_chunk
+        self.compress = compress
+
+        self.chunk_start = None
+        self.chunk_data = bytearray()
+        self.no_of_records = 0
+
+        ### keys and modifiers pressed in the last frame recorded
+
+        self.last_frame_index = None
+
+        self.keys = frozenset()
+        self.mods_bitmask = KMOD_NONE
+
+    def add_record(self, record):
+        """Encode record of frame.
+
+        record (tuple)
+            frame index, events, names of pressed keys, names of
+            pressed modifier keys, mouse positions and mouse button
+            states requested in the frame; events are as stored
+            by the record mode (compact names and stripped values).
+        """
+        (
+            frame_index,
+            events,
+            key_names,
+            mod_key_names,
+            mouse_positions,
+            mouse_pressed_tuples,
+        ) = record
+
+        ### keys and modifiers are only recorded in frames wherein they
+        ### are pressed, so they were released in any frames skipped
+        ### since the last one recorded
+
+        last_frame_index = self.last_frame_index
+
+        if (
+            last_frame_index is not None
+            and frame_index > last_frame_index + 1
+        ):
+            self.set_input_state(last_frame_index + 1, frozenset(), KMOD_NONE)
+
+        self.set_input_state(
+            frame_index,
+            frozenset(KEYS_MAP[key_name] for key_name in key_names),
+            get_bitmask(mod_key_names),
+        )
+
+        self.last_frame_index = frame_index
+
+        ### events
+
+        for compact_name, compact_dict in events:
+            self.add_event(frame_index, compact_name, compact_dict)
+
+        ### mouse requests
+
+        add = self.add
+
+        for x, y in mouse_positions:
+            add(frame_index, MOUSE_POS, 0, x, y)
+
+        for pressed_tuple in mouse_pressed_tuples:
+
+            add(
+                frame_index,
+                MOUSE_PRESSED,
+                get_bits(pressed_tuple),
+                len(pressed_tuple),
+            )
+
+    def set_input_state(self, frame_index, keys, mods_bitmask):
+        """Add records for keys and modifiers pressed/released."""
+
+        add = self.add
+
+        for key in sorted(self.keys - keys):
+            add(frame_index, KEY_RELEASED, 0, key)
+
+        for key in sorted(keys - self.keys):
+            add(frame_index, KEY_PRESSED, 0, key)
+
+        if mods_bitmask != self.mods_bitmask:
+            add(frame_index, MODS_CHANGED, 0, mods_bitmask)
+
+        self.keys = keys
+        self.mods_bitmask = mods_bitmask
+
+    def add_event(self, frame_index, compact_name, compact_dict):
+        """Add records for event as stored by the record mode."""
+
+        name = REVERSE_EVENT_COMPACT_NAME_MAP.get(compact_name, compact_name)
+
+        if name not in EVENT_KIND_MAP:
+            raise ValueError(f"{name} events can't be stored")
+
+        ### restore full names of values and values stripped
+
+        full_name_map = REVERSE_EVENT_KEY_COMPACT_NAME_MAP[name]
+
+        values = {
+            **EVENT_KEY_STRIP_MAP[name],
+            **{
+                full_name_map.get(key, key): value
+                for key, value in compact_dict.items()
+            },
+        }
+
+        if (
+            values.keys() != EVENT_FIELDS_MAP[name]
+            or values['window'] is not None
+        ):
+            raise ValueError(f"Can't store {name} event with {compact_dict}")
+
+        kind = EVENT_KIND_MAP[name]
+        add = self.add
+
+        if kind in (KEYDOWN_EVENT, KEYUP_EVENT):
+
+            text = values['unicode']
+
+            add(
+                frame_index,
+                kind,
+                0,
+                KEYS_MAP[values['key']],
+                REVERSE_SCANCODE_NAMES_MAP[values['scancode']],
+                (
+                    get_bitmask(values['mod'])
+                    if type(values['mod']) is tuple
+                    else values['mod']
+                ),
+                len(text),
+            )
+
+        elif kind == MOUSEMOTION_EVENT:
+
+            text = ''
+
+            add(
+                frame_index,
+                kind,
+                get_bits(values['buttons']) | TOUCH_FLAG * values['touch'],
+                *values['pos'],
+                *values['rel'],
+            )
+
+        elif kind == TEXTINPUT_EVENT:
+
+            text = values['text']
+            add(frame_index, kind, 0, 0, 0, 0, len(text))
+
+        ## mouse button events
+
+        else:
+
+            text = ''
+
+            add(
+                frame_index,
+                kind,
+                TOUCH_FLAG * values['touch'],
+                *values['pos'],
+                values['button'],
+            )
+
+        ### text is stored in the following records
+
+        for index in range(0, len(text), 4):
+
+            char_codes = list(map(ord, text[index:index+4]))
+            char_codes.extend((0,) * (4 - len(char_codes)))
+
+            add(frame_index, CHARS, 0, *char_codes)
+
+    def add(self, frame_index, kind, flags=0, a=0, b=0, c=0, d=0):
+        """Add record, starting a new chunk if needed."""
+
+        if (
+            self.chunk_start is None
+            or frame_index - self.chunk_start >= RECORDING_CHUNK_FRAMES
+        ):
+            self.write_current_chunk()
+            self.chunk_start = frame_index
+
+        self.chunk_data += RECORD_STRUCT.pack(
+            frame_index - self.chunk_start,
+            kind,
+            flags,
+            a,
+            b,
+            c,
+            d,
+        )
+
+        self.no_of_records += 1
+
+    def write_current_chunk(self):
+        """Write chunk with records added so far, if any."""
+
+        if not self.no_of_records:
+            return
+
+        self.write_chunk(
+            self.chunk_start,
+            self.compress(self.chunk_data),
+            self.no_of_records,
+        )
+
+        self.chunk_data.clear()
+        self.no_of_records = 0
+
+    def finish(self, last_frame_index):
+        """Release keys/modifiers pressed and write last chunk."""
+
+        if self.last_frame_index is not None:
+
+            self.set_input_state(
+                min(self.last_frame_index + 1, last_frame_index),
+                frozenset(),
+                KMOD_NONE,
+            )
+
+        self.write_current_chunk()
+
+
+def get_bitmask(mod_key_names):
+    """Return bitmask of modifier keys from their names.
+
+    The record mode names every modifier key whose bits are set in
+    the bitmask, including modifiers for both sides, like KMOD_SHIFT,
+    so such modifiers are only used when there's no other way to
+    obtain the same names.
+    """
+    single_bit_values = [
+
+        value
+
+        for value in map(MOD_KEYS_MAP.__getitem__, mod_key_names)
+        if not value & (value - 1)
+
+    ]
+
+    bitmask = reduce(bitwise_or, single_bit_values, KMOD_NONE)
+
+    if set(get_mod_key_names_tuple(bitmask)) == set(mod_key_names):
+        return bitmask
+
+    return reduce(
+        bitwise_or,
+        map(MOD_KEYS_MAP.__getitem__, mod_key_names),
+        KMOD_NONE,
+    )
+
+
+def get_mod_key_names_tuple(bitmask):
+    """Return names of modifier keys in bitmask."""
+
+    return tuple(
+        mod_key_name
+        for mod_key_name, mod_key in MOD_KEYS_MAP.items()
+        if bitmask & mod_key
+    )
+
+
+def get_bits(booleans):
+    """Return integer with a bit set for each true boolean."""
+
+    return sum(
+        1 << index
+        for index, value in enumerate(booleans)
+        if value
+    )
+
+
+### session reading
+
+def load_session(filepath):
+    """Return data of recorded session in file.
+
+    The data is the same stored in .pyl files by earlier versions
+    of the record mode, regardless of the kind of file.
+
+    filepath (pathlib.Path)
+        path of a session file or .pyl file.
+    """
+    filepath = Path(filepath)
+
+    if filepath.suffix == '.pyl':
+        return load_pyl(str(filepath))
+
+    return load_session_file(filepath)
+
+
+def load_session_file(filepath):
+    """Return data of recorded session in session file."""
+
+    data = Path(filepath).read_bytes()
+
+    header, chunks_offset = read_header(data, filepath)
+
+    decompress = COMPRESSION_MAP[header['compression']][1]
+
+    footer = read_footer(data)
+
+    if footer is None:
+
+        chunk_offsets = list(yield_unindexed_chunk_offsets(data, chunks_offset))
+        last_frame_index = None
+
+    else:
+
+        index_offset, no_of_chunks, last_frame_index = footer
+
+        chunk_offsets = array(INDEX_TYPECODE)
+        chunk_offsets.frombytes(
+            data[
+                index_offset + no_of_chunks * chunk_offsets.itemsize
+                : index_offset + 2 * no_of_chunks * chunk_offsets.itemsize
+            ]
+        )
+
+    ### decode records into the maps and sequences of the data of
+    ### sessions, where keys and modifier keys are mapped to the
+    ### frames wherein they were pressed
+
+    events_map = {}
+
+    key_name_to_frames_map = defaultdict(list)
+    mod_key_name_to_frames_map = defaultdict(list)
+
+    mouse_pos_requests = []
+    mouse_key_state_requests = []
+
+    ## frames wherein pressed keys and current modifier keys were
+    ## pressed
+
+    key_press_frames = {}
+
+    mods_bitmask = KMOD_NONE
+    mods_start = None
+
+    frame_index = None
+
+    for chunk_offset in chunk_offsets:
+
+        chunk_start, chunk_data = read_chunk(data, chunk_offset, decompress)
+
+        records = RECORD_STRUCT.iter_unpack(chunk_data)
+
+        for relative_index, kind, flags, a, b, c, d in records:
+
+            frame_index = chunk_start + relative_index
+
+            if kind == KEY_PRESSED:
+                key_press_frames[a] = frame_index
+
+            elif kind == KEY_RELEASED:
+
+                frames = range(key_press_frames.pop(a), frame_index)
+
+                for key_name in KEY_NAMES_MAP[a]:
+                    key_name_to_frames_map[key_name].extend(frames)
+
+            elif kind == MODS_CHANGED:
+
+                if mods_bitmask != KMOD_NONE:
+
+                    frames = range(mods_start, frame_index)
+
+                    for mod_key_name in get_mod_key_names_tuple(mods_bitmask):
+                        mod_key_name_to_frames_map[mod_key_name].extend(frames)
+
+                mods_bitmask = a
+                mods_start = frame_index
+
+            elif kind == MOUSE_POS:
+                mouse_pos_requests.append((a, b))
+
+            elif kind == MOUSE_PRESSED:
+
+                mouse_key_state_requests.append(
+                    tuple(bool(flags & (1 << index)) for index in range(a))
+                )
+
+            else:
+
+                name = EVENT_NAME_MAP[kind]
+
+                values = get_event_values(
+                    kind, flags, a, b, c, d,
+                    read_text(records, d) if kind in TEXT_EVENT_KINDS else '',
+                )
+
+                ## keys and modifiers are named in session data
+
+                if kind in (KEYDOWN_EVENT, KEYUP_EVENT):
+
+                    values['key'] = REVERSE_KEYS_MAP[a]
+                    values['scancode'] = SCANCODE_NAMES_MAP[b]
+                    values['mod'] = (
+                        get_mod_key_names_tuple(c)
+                        if c != KMOD_NONE
+                        else c
+                    )
+
+                if frame_index not in events_map:
+                    events_map[frame_index] = []
+
+                events_map[frame_index].append(
+                    get_compact_event(name, values)
+                )
+
+    ### if the file wasn't finished, the session ends after the last
+    ### frame recorded, wherein keys and modifiers still pressed are
+    ### released
+
+    if last_frame_index is None:
+
+        last_frame_index = 0 if frame_index is None else frame_index + 1
+
+        for key, start in key_press_frames.items():
+
+            for key_name in KEY_NAMES_MAP[key]:
+                key_name_to_frames_map[key_name].extend(
+                    range(start, last_frame_index)
+                )
+
+        for mod_key_name in get_mod_key_names_tuple(mods_bitmask):
+            mod_key_name_to_frames_map[mod_key_name].extend(
+                range(mods_start, last_frame_index)
+            )
+
+    return {
+        'events_map': events_map,
+        'key_name_to_frames_map': dict(key_name_to_frames_map),
+        'mod_key_name_to_frames_map': dict(mod_key_name_to_frames_map),
+        'mouse_pos_requests': tuple(mouse_pos_requests),
+        'mouse_key_state_requests': tuple(mouse_key_state_requests),
+        'last_frame_index': last_frame_index,
+        'recording_size': header['recording_size'],
+        'recording_title': header['recording_title'],
+    }
+
+
+def get_event_values(kind, flags, a, b, c, d, text):
+    """Return values of event stored in record of given kind.
+
+    text (string)
+        text of the event, stored in the records following it,
+        if the event has text (see TEXT_EVENT_KINDS).
+    """
+    if kind in (KEYDOWN_EVENT, KEYUP_EVENT):
+        return {'key': a, 'scancode': b, 'mod': c, 'unicode': text}
+
+    elif kind == MOUSEMOTION_EVENT:
+
+        return {
+            'pos': (a, b),
+            'rel': (c, d),
+            'buttons': tuple(
+                int(bool(flags & (1 << index)))
+                for index in range(3)
+            ),
+            'touch': bool(flags & TOUCH_FLAG),
+        }
+
+    elif kind == TEXTINPUT_EVENT:
+        return {'text': text}
+
+    ### mouse button events
+
+    return {
+        'pos': (a, b),
+        'button': c,
+        'touch': bool(flags & TOUCH_FLAG),
+    }
+
+
+def read_text(records, length):
+    """Return text of given length from the next records."""
+
+    text = ''.join(
+
+        chr(char_code)
+
+        for _ in range(-(-length // 4))
+        for char_code in next(records)[3:]
+
+    )
+
+    return text[:length]
+
+
+def read_text_at(data, offset, length):
+    """Return text of given length from records at offset of data."""
+
+    text = ''.join(
+
+        chr(char_code)
+
+        for record_offset in range(
+            offset,
+            offset + RECORD_STRUCT.size * -(-length // 4),
+            RECORD_STRUCT.size,
+        )
+
+        for char_code in RECORD_STRUCT.unpack_from(data, record_offset)[3:]
+
+    )
+
+    return text[:length]
+
+
+def get_compact_event(name, values):
+    """Return event as stored by the record mode."""
+
+    values_to_strip = EVENT_KEY_STRIP_MAP[name]
+    compact_name_map = EVENT_KEY_COMPACT_NAME_MAP[name]
+
+    return [
+
+        EVENT_COMPACT_NAME_MAP.get(name, name),
+
+        {
+            compact_name_map.get(key, key): value
+
+            for key, value in values.items()
+
+            if key not in values_to_strip
+            or values_to_strip[key] != value
+        },
+
+    ]
+
+
+def read_header(data, filepath):
+    """Return header data and offset of first chunk."""
+
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{filepath} isn't a session file")
+
+    offset = len(MAGIC)
+
+    (version,) = VERSION_STRUCT.unpack_from(data, offset)
+
+    if version != FORMAT_VERSION:
+
+        raise ValueError(
+            f"{filepath} has format version {version}"
+            f" (expected {FORMAT_VERSION})"
+        )
+
+    offset += VERSION_STRUCT.size
+
+    (length,) = LENGTH_STRUCT.unpack_from(data, offset)
+    offset += LENGTH_STRUCT.size
+
+    return loads(data[offset:offset+length]), offset + length
+
+
+def read_footer(data):
+    """Return (index offset, number of chunks, last frame index).
+
+    If there's no footer, None is returned instead.
+    """
+    if len(data) < FOOTER_STRUCT.size:
+        return
+
+    *footer, footer_magic = FOOTER_STRUCT.unpack_from(
+        data,
+        len(data) - FOOTER_STRUCT.size,
+    )
+
+    if footer_magic == FOOTER_MAGIC:
+        return footer
+
+
+def read_chunk(data, offset, decompress):
+    """Return first frame index and records of chunk at offset."""
+
+    first_frame_index, size, _ = CHUNK_STRUCT.unpack_from(data, offset)
+    offset += CHUNK_STRUCT.size
+
+    return first_frame_index, decompress(data[offset:offset+size])
+
+
+def yield_unindexed_chunk_offsets(data, offset):
+    """Yield offsets of chunks from offset.
+
+    Used when the session file has no index, so chunks are read
+    one after the other up to the last complete one.
+    """
+    while offset + CHUNK_STRUCT.size <= len(data):
+
+        _, size, _ = CHUNK_STRUCT.unpack_from(data, offset)
+
+        chunk_end = offset + CHUNK_STRUCT.size + size
+
+        if chunk_end > len(data):
+            break
+
+        yield offset
+
+        offset = chunk_end
+
+
+### session playing
+
+def open_session(filepath):
+    """Return SessionReader for recorded session in file.
+
+    filepath (pathlib.Path)
+        path of a session file or .pyl file; .pyl files are
+        converted into a session file first, which is read
+        from memory.
+    """
+    filepath = Path(filepath)
+
+    if filepath.suffix == '.pyl':
+
+        with TemporaryDirectory() as dirpath:
+
+            session_path = Path(dirpath) / f'session{SESSION_FILE_SUFFIX}'
+            save_session_file(load_pyl(str(filepath)), session_path)
+
+            return SessionReader(session_path.read_bytes(), filepath)
+
+    with open(filepath, 'rb') as file:
+        data = mmap(file.fileno(), 0, access=ACCESS_READ)
+
+    return SessionReader(data, filepath)
+
+
+class SessionReader:
+    """Decodes frames of a session file on demand, in order.
+
+    Only the header and the index of chunks are read when the
+    reader is created. Chunks are decompressed once the frames
+    played reach them and their records are decoded a few frames
+    at a time, ahead of the frame played (the lookahead window),
+    so only the decoded frames not yet played are kept.
+
+    All data changing while frames are read are attributes with
+    immutable values or deques of them, so the state of the reader
+    can be stored in snapshots (see ourstdlibs/statesnapshot.py).
+    """
+
+    def __init__(self, data, filepath, lookahead=PLAYBACK_LOOKAHEAD_FRAMES):
+        """Read header and index of chunks.
+
+        data (bytes-like object)
+            contents of session file, usually memory-mapped.
+        filepath (pathlib.Path)
+            path of the file, used in error messages.
+        lookahead (positive integer)
+            number of frames decoded ahead of the one requested
+            whenever decoded frames run out.
+        """
+        self.data = data
+        self.lookahead = lookahead
+
+        self.header, chunks_offset = read_header(data, filepath)
+        self.decompress = COMPRESSION_MAP[self.header['compression']][1]
+
+        footer = read_footer(data)
+
+        if footer is None:
+
+            self.chunk_offsets = tuple(
+                yield_unindexed_chunk_offsets(data, chunks_offset)
+            )
+
+            ### the session ends after the last frame recorded
+
+            if self.chunk_offsets:
+
+                chunk_start, chunk_data = read_chunk(
+                    data, self.chunk_offsets[-1], self.decompress
+                )
+
+                self.last_frame_index = (
+                    chunk_start
+                    + RECORD_STRUCT.unpack_from(
+                        chunk_data, len(chunk_data) - RECORD_STRUCT.size
+                    )[0]
+                    + 1
+                )
+
+            else:
+                self.last_frame_index = 0
+
+        else:
+
+            index_offset, no_of_chunks, self.last_frame_index = footer
+
+            chunk_offsets = array(INDEX_TYPECODE)
+            chunk_offsets.frombytes(
+                data[
+                    index_offset + no_of_chunks * chunk_offsets.itemsize
+                    : index_offset + 2 * no_of_chunks * chunk_offsets.itemsize
+                ]
+            )
+
+            self.chunk_offsets = tuple(chunk_offsets)
+
+        ### index of next chunk to decompress, first frame index and
+        ### records of current chunk and offset of next record in it
+
+        self.next_chunk_index = 0
+        self.chunk_start = 0
+        self.chunk_data = b''
+        self.record_offset = 0
+
+        ### keys and modifiers pressed as of the last frame decoded
+        self.keys = frozenset()
+        self.mods_bitmask = KMOD_NONE
+
+        ### decoded frames not yet played and index of the last frame
+        ### decoded (frames without records aren't stored)
+
+        self.window = deque()
+        self.decoded_frame_index = -1
+
+    def pop_frame(self, frame_index):
+        """Return data of frame if it has records, otherwise None.
+
+        The data is a tuple with the frame index, the keys and the
+        modifier keys bitmask pressed, the events (pairs with the
+        event type and the items of its dict), the mouse positions
+        and the mouse button states requested in the frame.
+
+        Frames must be requested in order; frames skipped are
+        discarded.
+        """
+        if self.decoded_frame_index < frame_index:
+            self.decode_frames(frame_index + self.lookahead)
+
+        window = self.window
+
+        while window and window[0][0] < frame_index:
+            window.popleft()
+
+        if window and window[0][0] == frame_index:
+            return window.popleft()
+
+    def decode_frames(self, last_frame_index):
+        """Decode records of frames up to given one into the window."""
+
+        data = self.chunk_data
+        offset = self.record_offset
+
+        chunk_start = self.chunk_start
+
+        unpack_record = RECORD_STRUCT.unpack_from
+        record_size = RECORD_STRUCT.size
+
+        keys = self.keys
+        mods_bitmask = self.mods_bitmask
+
+        ### data of frames decoded, as lists with the frame index,
+        ### keys, modifiers bitmask, events, mouse positions and
+        ### mouse button states
+        frames = []
+        frame = [None]
+
+        while True:
+
+            ### load next chunk when the current one ends
+
+            if offset == len(data):
+
+                if self.next_chunk_index == len(self.chunk_offsets):
+                    break
+
+                chunk_start, data = read_chunk(
+                    self.data,
+                    self.chunk_offsets[self.next_chunk_index],
+                    self.decompress,
+                )
+
+                self.next_chunk_index += 1
+                offset = 0
+
+                continue
+
+            relative_index, kind, flags, a, b, c, d = (
+                unpack_record(data, offset)
+            )
+
+            frame_index = chunk_start + relative_index
+
+            if frame_index > last_frame_index:
+                break
+
+            offset += record_size
+
+            if frame_index != frame[0]:
+
+                frame = [frame_index, keys, mods_bitmask, [], [], []]
+                frames.append(frame)
+
+            ###
+
+            if kind == KEY_PRESSED:
+                keys = frame[1] = keys | {a}
+
+            elif kind == KEY_RELEASED:
+                keys = frame[1] = keys - {a}
+
+            elif kind == MODS_CHANGED:
+                mods_bitmask = frame[2] = a
+
+            elif kind == MOUSE_POS:
+                frame[4].append((a, b))
+
+            elif kind == MOUSE_PRESSED:
+
+                frame[5].append(
+                    tuple(bool(flags & (1 << index)) for index in range(a))
+                )
+
+            else:
+
+                ## text of event is in the following records
+
+                if kind in TEXT_EVENT_KINDS:
+
+                    text = read_text_at(data, offset, d)
+                    offset += record_size * -(-d // 4)
+
+                else:
+                    text = ''
+
+                name = EVENT_NAME_MAP[kind]
+
+                frame[3].append((
+                    EVENT_TYPE_MAP[kind],
+                    tuple({
+                        **EVENT_KEY_STRIP_MAP[name],
+                        **get_event_values(kind, flags, a, b, c, d, text),
+                    }.items()),
+                ))
+
+        self.window.extend(
+            (frame_index, keys, mods_bitmask, *map(tuple, lists))
+            for frame_index, keys, mods_bitmask, *lists in frames
+        )
+
+        ### store state
+
+        self.chunk_start = chunk_start
+        self.chunk_data = data
+        self.record_offset = offset
+
+        self.keys = keys
+        self.mods_bitmask = mods_bitmask
+
+        self.decoded_frame_index = last_frame_index
+
+    def close(self):
+        """Close memory-mapped file, if it is one."""
+
+        if isinstance(self.data, mmap):
+            self.data.close()
+
+
+### conversion between session files and .pyl files
+
+def convert_session(source_path, destination_path):
+    """Convert session file into .pyl file or vice-versa."""
+
+    session_data = load_session(source_path)
+
+    if Path(destination_path).suffix == '.pyl':
+        save_pyl(session_data, destination_path, width=125, compact=True)
+
+    else:
+        save_session_file(session_data, destination_path)
+
+
+def save_session_file(session_data, filepath):
+    """Save session data (as in .pyl files) in a session file.
+
+    Since .pyl files don't store the frames wherein the mouse was
+    requested, all mouse requests are stored in the first frame,
+    so they are used in the same order when played.
+    """
+    ### gather data of each frame
+
+    frame_data_map = defaultdict(lambda: ([], [], []))
+
+    for frame_index, events in session_data['events_map'].items():
+        frame_data_map[frame_index][0].extend(events)
+
+    for data_index, map_name in (
+        (1, 'key_name_to_frames_map'),
+        (2, 'mod_key_name_to_frames_map'),
+    ):
+
+        for name, frames in session_data[map_name].items():
+
+            for frame_index in frames:
+                frame_data_map[frame_index][data_index].append(name)
+
+    mouse_requests = (
+        tuple(session_data['mouse_pos_requests']),
+        tuple(session_data['mouse_key_state_requests']),
+    )
+
+    ## make sure there's a first frame to store mouse requests in
+
+    if any(mouse_requests) and not frame_data_map:
+        frame_data_map[0]
+
+    ### write them
+
+    writer = SessionWriter(
+        Path(filepath),
+        {
+            'recording_size': tuple(session_data['recording_size']),
+            'recording_title': session_data['recording_title'],
+        },
+        lambda record: record,
+    )
+
+    for frame_index in sorted(frame_data_map):
+
+        writer.add_frame(
+            (frame_index, *frame_data_map[frame_index], *mouse_requests)
+        )
+
+        mouse_requests = ((), ())
+
+    writer.finish(session_data['last_frame_index'])
+
+
+if __name__ == '__main__':
+
+    source_path = Path(argv[1])
+
+    destination_path = (
+
+        Path(argv[2])
+        if len(argv) > 2
+
+        else source_path.with_suffix(
+
+            '.pyl'
+            if source_path.suffix == SESSION_FILE_SUFFIX
+            else SESSION_FILE_SUFFIX
+
+        )
+
+    )
+
+    convert_session(source_path, destination_path)
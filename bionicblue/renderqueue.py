@@ -0,0 +1,36 @@
+"""Facility for batching blits in a render queue.
+
+Instead of blitting each surface as soon as it is drawn, which
+costs a Python-level call into pygame per surface, objects
+submit (surface, position) pairs to a render queue. When the
+queue is flushed, all pairs are blitted at once with a single
+call to Surface.blits(), in the same order they were submitted,
+so the result is exactly the same.
+"""
+
+
+class RenderQueue(list):
+    """List of (surface, position) pairs waiting to be blitted."""
+
+    def __init__(self, target_surface):
+        """Store target surface and its batch blitting method.
+
+        target_surface (pygame.Surface)
+            surface on which the queued surfaces are blitted when
+            the queue is flushed.
+        """
+        super().__init__()
+
+        self.target_surface = target_surface
+        self.blits = target_surface.blits
+
+        ### alias list method for quick access by submitters
+        self.submit = self.append
+
+    def flush(self):
+        """Blit all queued surfaces on target and empty queue."""
+
+        if self:
+
+            self.blits(self, doreturn=False)
+            self.clear()
@@ -8,8 +8,6 @@ from pygame import (
 
 from pygame.color import THECOLORS
 
-from pygame.display import update
-
 from pygame.mixer import music
 
 
@@ -19,18 +17,22 @@ from ...config import (
     REFS,
     LEVELS_DIR,
     MUSIC_DIR,
-    BACK_PROPS, BACK_PROPS_ON_SCREEN,
-    MIDDLE_PROPS, MIDDLE_PROPS_ON_SCREEN,
-    BLOCKS, BLOCKS_ON_SCREEN,
-    ACTORS, ACTORS_ON_SCREEN,
+    BACK_PROPS, BACK_PROPS_ON_SCREEN, BACK_PROPS_GRID,
+    MIDDLE_PROPS, MIDDLE_PROPS_ON_SCREEN, MIDDLE_PROPS_GRID,
+    BLOCKS, BLOCKS_ON_SCREEN, BLOCKS_GRID,
+    ACTORS, ACTORS_ON_SCREEN, ACTORS_GRID,
     PROJECTILES,
     FRONT_PROPS,
+    PACK_SPRITES_IN_ATLASES,
+    FRAME_SCHEDULER,
     execute_tasks
 )
 
-from ...pygamesetup.constants import (
-    screen_colliderect, blit_on_screen, SCREEN_RECT, SCREEN
-)
+from ...pygamesetup import SERVICES_NS
+
+from ...pygamesetup.services.play import set_snapshot_operations
+
+from ...pygamesetup.constants import blit_on_screen, SCREEN_RECT, SCREEN
 
 from ...ourstdlibs.behaviour import do_nothing
 
@@ -38,8 +40,24 @@ from ...ourstdlibs.pyl import load_pyl
 
 from ...textman import render_text
 
+from ...atlasman import pack_surfaces
+
+from ...ani2d.processing import preload_animations
+
+from ...instrumentation import TIMERS_NS
+
+from .camera import CAMERA
+
+from .collision import update_broad_phase
+
 from .player import Player
 
+from .player.projectiles.default import DEFAULT_PROJECTILE_POOL
+
+from .player.projectiles.chargedshot import CHARGED_SHOT_POOLS
+
+from .frontprops.defaultexplosion import EXPLOSION_POOL
+
 from .backprops.citywall import CityWall
 
 from .middleprops.ladder import Ladder
@@ -50,14 +68,33 @@ from .actors.gruntbot import GruntBot
 
 from .prototypemessage import message
 
+from .snapshots import take_level_snapshot, simulate_level_frames
+
+
+### pools of objects reused during gameplay, by name
 
-LAYER_DATA_PAIRS = [
-    (BACK_PROPS, 'backprops'),
-    (MIDDLE_PROPS, 'middleprops'),
-    (BLOCKS, 'blocks'),
-    (ACTORS, 'actors'),
+OBJECT_POOLS = {
+    'default_projectile': DEFAULT_PROJECTILE_POOL,
+    'middle_charged_shot': CHARGED_SHOT_POOLS['middle'],
+    'full_charged_shot': CHARGED_SHOT_POOLS['full'],
+    'default_explosion': EXPLOSION_POOL,
+}
+
+LAYER_DATA_TRIPLETS = [
+    (BACK_PROPS, BACK_PROPS_GRID, 'backprops'),
+    (MIDDLE_PROPS, MIDDLE_PROPS_GRID, 'middleprops'),
+    (BLOCKS, BLOCKS_GRID, 'blocks'),
+    (ACTORS, ACTORS_GRID, 'actors'),
 ]
 
+### classes of tiles, whose instances reuse surfaces from the
+### surface map of their class
+TILE_CLASSES = (CityWall, Ladder, CityBlock)
+
+### let the play mode take snapshots of the level, so it can seek
+### frames of the sessions played
+set_snapshot_operations(take_level_snapshot, simulate_level_frames)
+
 
 class LevelManager:
 
@@ -107,6 +144,11 @@ class LevelManager:
         if not hasattr(self, 'player'):
             self.player = Player()
 
+        CAMERA.reset()
+
+        ### discard callbacks scheduled in previous plays of the level
+        FRAME_SCHEDULER.clear()
+
         self.player.prepare()
 
         self.state = self
@@ -118,6 +160,15 @@ class LevelManager:
         level_data_path = LEVELS_DIR / level_name
         level_data = load_pyl(level_data_path)
 
+        ### process animations the level declares it uses, so they
+        ### don't need to be processed during gameplay
+        preload_animations(level_data.get('preloaded_animations', ()))
+
+        ### create objects reused during gameplay in advance
+
+        for pool in OBJECT_POOLS.values():
+            pool.fill()
+
         ### bg
 
         self.bg = Surface((320, 180)).convert()
@@ -126,100 +177,163 @@ class LevelManager:
         ###
         layered_objects = level_data['layered_objects']
 
-        for layer, layer_name in LAYER_DATA_PAIRS:
+        ### objects are registered in the grids using their rects,
+        ### which are in level coordinates and thus never change
+        ### when the camera moves
+
+        for layer, grid, layer_name in LAYER_DATA_TRIPLETS:
 
             try: objs_data = layered_objects[layer_name]
             except KeyError: continue
 
             for obj_data in objs_data:
-                layer.add(instantiate(obj_data))
+
+                obj = instantiate(obj_data)
+
+                layer.add(obj)
+                grid.add(obj)
 
         ###
+
         BACK_PROPS.add(message)
+        BACK_PROPS_GRID.add(message)
+
+        ###
+
+        if PACK_SPRITES_IN_ATLASES:
+            pack_tile_surfaces()
 
     def control_player(self):
         self.player.control()
 
     def update(self):
 
+        ### timers do nothing unless enabled (see the
+        ### instrumentation module)
+
+        start_timer = TIMERS_NS.start
+        stop_timer = TIMERS_NS.stop
+
         ### must update player first, since it may move and cause the
-        ### camera to move as well, which causes the level to move
+        ### camera to move as well
+
+        start_timer('update.player')
 
         self.player.update()
         self.camera_tracking_routine()
 
-        ### now that the level may or may not have moved, we
-        ### update what ended up on the screen
+        stop_timer('update.player')
+
+        ### now that the camera may or may not have moved, we
+        ### update what ended up on the screen;
+        ###
+        ### the grids let us check only the objects near the
+        ### area of the level on the screen, rather than all
+        ### objects in the level
+
+        camera_area = CAMERA.area
+        camera_colliderect = CAMERA.colliderect
+
+        start_timer('update.back_props')
 
         BACK_PROPS_ON_SCREEN.clear()
         BACK_PROPS_ON_SCREEN.update(
             prop
-            for prop in BACK_PROPS
-            if screen_colliderect(prop.rect)
+            for prop in BACK_PROPS_GRID.query(camera_area)
+            if camera_colliderect(prop.rect)
         )
 
         for prop in BACK_PROPS_ON_SCREEN:
             prop.update()
 
+        stop_timer('update.back_props')
+        start_timer('update.middle_props')
+
         MIDDLE_PROPS_ON_SCREEN.clear()
         MIDDLE_PROPS_ON_SCREEN.update(
             prop
-            for prop in MIDDLE_PROPS
-            if screen_colliderect(prop.rect)
+            for prop in MIDDLE_PROPS_GRID.query(camera_area)
+            if camera_colliderect(prop.rect)
         )
 
         for prop in MIDDLE_PROPS_ON_SCREEN:
             prop.update()
-        
+
+        stop_timer('update.middle_props')
+        start_timer('update.blocks')
+
         BLOCKS_ON_SCREEN.clear()
         BLOCKS_ON_SCREEN.update(
             block
-            for block in BLOCKS
-            if screen_colliderect(block.rect)
+            for block in BLOCKS_GRID.query(camera_area)
+            if camera_colliderect(block.rect)
         )
 
         for block in BLOCKS_ON_SCREEN:
             block.update()
 
+        stop_timer('update.blocks')
+        start_timer('update.actors')
+
         ACTORS_ON_SCREEN.clear()
         ACTORS_ON_SCREEN.update(
             actor
-            for actor in ACTORS
-            if screen_colliderect(actor.rect)
+            for actor in ACTORS_GRID.query(camera_area)
+            if camera_colliderect(actor.rect)
         )
 
+        ### now that we know which blocks and actors are on the
+        ### screen, index them for collision checks
+        update_broad_phase(self.player)
+
         for actor in ACTORS_ON_SCREEN:
             actor.update()
 
+        stop_timer('update.actors')
+        start_timer('update.projectiles')
+
         for projectile in PROJECTILES:
             projectile.update()
 
+        stop_timer('update.projectiles')
+        start_timer('update.front_props')
+
         for prop in FRONT_PROPS:
             prop.update()
 
+        stop_timer('update.front_props')
 
         ###
+
+        start_timer('update.execute_tasks')
         execute_tasks()
+        stop_timer('update.execute_tasks')
 
         ###
         self.floor_level_routine()
 
     def track_player(self):
 
-        player_rect = self.player.rect
+        player_rect = CAMERA.get_screen_rect(self.player.rect)
 
         clamped_rect = player_rect.clamp(self.camera_tracking_area)
 
         if clamped_rect != player_rect:
 
-            diff = tuple(a - b for a, b in zip(clamped_rect.topleft, player_rect.topleft))
-            self.move_level(diff)
+            CAMERA.move(
+                player_rect.x - clamped_rect.x,
+                player_rect.y - clamped_rect.y,
+            )
 
     def floor_level_routine(self):
 
         if self.player.midair: return
 
-        y_diff = self.player.rect.bottom - self.floor_level
+        y_diff = (
+            self.player.rect.bottom
+            - CAMERA.area.top
+            - self.floor_level
+        )
 
         if y_diff:
             
@@ -229,56 +343,79 @@ class LevelManager:
                 else 2
             )
 
-            dy = (-1 if y_diff > 0 else 1) * multiplier
-
-            self.move_level((0, dy))
+            dy = (1 if y_diff > 0 else -1) * multiplier
 
-    def move_level(self, diff):
+            CAMERA.move(0, dy)
 
-        for prop in BACK_PROPS:
-            prop.rect.move_ip(diff)
-
-        for prop in MIDDLE_PROPS:
-            prop.rect.move_ip(diff)
-
-        for block in BLOCKS:
-            block.rect.move_ip(diff)
-
-        for actor in ACTORS:
-            actor.rect.move_ip(diff)
+    def draw(self):
 
-        self.player.rect.move_ip(diff)
+        start_timer = TIMERS_NS.start
+        stop_timer = TIMERS_NS.stop
 
-        for projectile in PROJECTILES:
-            projectile.rect.move_ip(diff)
+        blit_on_screen(self.bg, (0, 0))
 
-        for prop in FRONT_PROPS:
-            prop.rect.move_ip(diff)
+        ### when level drawing is batched, objects only queue their
+        ### surfaces, so each layer is blitted at once by flushing
+        ### the queue of the camera afterwards (when it isn't, the
+        ### queue is always empty and flushing does nothing)
 
-    def draw(self):
+        flush = CAMERA.flush
 
-        blit_on_screen(self.bg, (0, 0))
+        start_timer('draw.back_props')
 
         for prop in BACK_PROPS_ON_SCREEN:
             prop.draw()
 
+        flush()
+
+        stop_timer('draw.back_props')
+        start_timer('draw.middle_props')
+
         for prop in MIDDLE_PROPS_ON_SCREEN:
             prop.draw()
 
+        flush()
+
+        stop_timer('draw.middle_props')
+        start_timer('draw.projectiles')
+
         for projectile in PROJECTILES:
             projectile.draw()
 
+        flush()
+
+        stop_timer('draw.projectiles')
+        start_timer('draw.blocks')
+
         for block in BLOCKS_ON_SCREEN:
             block.draw()
 
+        flush()
+
+        stop_timer('draw.blocks')
+        start_timer('draw.player')
+
         self.player.draw()
+        flush()
+
+        stop_timer('draw.player')
+        start_timer('draw.actors')
 
         for actor in ACTORS_ON_SCREEN:
             actor.draw()
 
+        flush()
+
+        stop_timer('draw.actors')
+        start_timer('draw.front_props')
+
         for prop in FRONT_PROPS:
             prop.draw()
 
+        flush()
+
+        stop_timer('draw.front_props')
+
         ############################
 #        from pygame.draw import rect, line
 #
@@ -305,12 +442,54 @@ class LevelManager:
 
         self.player.health_column.draw()
 
-        update()
+        start_timer('draw.update_screen')
+        SERVICES_NS.update_screen()
+        stop_timer('draw.update_screen')
 
     def next(self):
         return self.state
 
 
+def get_pool_stats():
+    """Return map with usage statistics of each object pool."""
+
+    return {
+        name: pool.get_stats()
+        for name, pool in OBJECT_POOLS.items()
+    }
+
+
+def pack_tile_surfaces():
+    """Pack surfaces of tiles into atlas pages.
+
+    Since the surface maps of tile classes persist between
+    levels, only the surfaces not packed yet are packed.
+    """
+    items = [
+        (cls.surf_map, size, surf)
+        for cls in TILE_CLASSES
+        for size, surf in cls.surf_map.items()
+        if surf.get_parent() is None
+    ]
+
+    if not items:
+        return
+
+    packed_surfaces = pack_surfaces(surf for _, _, surf in items)
+
+    for (surf_map, size, _), packed_surf in zip(items, packed_surfaces):
+        surf_map[size] = packed_surf
+
+    ### make tiles use the packed surfaces
+
+    for layer in (BACK_PROPS, MIDDLE_PROPS, BLOCKS):
+
+        for obj in layer:
+
+            if isinstance(obj, TILE_CLASSES):
+                obj.image = obj.surf_map[obj.rect.size]
+
+
 def instantiate(obj_data):
 
     name = obj_data['name']
@@ -4,17 +4,25 @@ from functools import partial
 
 ### local imports
 
-from ....config import REFS, ACTORS, FRONT_PROPS, append_task
-
-from ....pygamesetup.constants import GENERAL_NS
+from ....config import (
+    REFS,
+    ACTORS,
+    ACTORS_GRID,
+    FRONT_PROPS,
+    SHARE_ENEMY_ANIMATION_CLOCKS,
+    append_task,
+    schedule_callback,
+)
 
 from ....constants import DAMAGE_WHITENING_FRAMES
 
 from ....ani2d.player import AnimationPlayer2D
 
-from ....ourstdlibs.behaviour import do_nothing
+from ..frontprops.defaultexplosion import get_default_explosion
+
+from ..camera import blit_on_level
 
-from ..frontprops.defaultexplosion import DefaultExplosion
+from ..collision import PLAYER_CONTACTS
 
 
 
@@ -31,30 +39,20 @@ class GruntBot:
 
         self.aniplayer = (
             AnimationPlayer2D(
-                self, name, 'idle_left', 'midbottom', pos
+                self, name, 'idle_left', 'midbottom', pos,
+                blit_surface=blit_on_level,
+                shared_clock=SHARE_ENEMY_ANIMATION_CLOCKS,
             )
         )
 
-        self.last_damage = GENERAL_NS.frame_index
-        self.routine_check = do_nothing
+        ### scheduled end of the whitening caused by damage, if any
+        self.whitening_end = None
 
     def update(self):
 
-        if self.player.rect.colliderect(self.rect):
+        if self in PLAYER_CONTACTS:
             self.player.damage(3)
 
-        self.routine_check()
-
-    def check_damage_whitening(self):
-
-        if (
-            GENERAL_NS.frame_index - self.last_damage
-            > DAMAGE_WHITENING_FRAMES
-        ):
-
-            self.aniplayer.restore_surface_cycling()
-            self.routine_check = do_nothing
-
     def draw(self):
         self.aniplayer.draw()
 
@@ -62,13 +60,23 @@ class GruntBot:
 
         self.health += -amount
 
+        ### damage either kills the bot or restarts the whitening
+
+        if self.whitening_end is not None:
+            self.whitening_end.cancel()
+
         if self.health <= 0:
 
             center = self.rect.center
 
-            FRONT_PROPS.add(DefaultExplosion('center', center))
+            FRONT_PROPS.add(get_default_explosion('center', center))
             append_task(partial(ACTORS.remove, self,))
+            append_task(partial(ACTORS_GRID.remove, self,))
 
         else:
             self.aniplayer.set_custom_surface_cycling(('whitened', 'default'))
-            self.routine_check = self.check_damage_whitening
+
+            self.whitening_end = schedule_callback(
+                DAMAGE_WHITENING_FRAMES,
+                self.aniplayer.restore_surface_cycling,
+            )
@@ -0,0 +1,68 @@
+"""Facility for the camera showing the level on the screen."""
+
+### local imports
+
+from ...config import BATCH_LEVEL_DRAWING
+
+from ...pygamesetup.constants import SCREEN, SCREEN_RECT, blit_on_screen
+
+from ...renderqueue import RenderQueue
+
+
+
+class Camera:
+    """Area of the level shown on the screen.
+
+    Level objects keep their rects in level coordinates, which
+    don't change when the level scrolls. Instead, the camera
+    moves over the level and its offset is applied only when
+    drawing objects and checking which ones are visible.
+    """
+
+    def __init__(self):
+
+        ### area of the level on the screen, in level coordinates
+        self.area = SCREEN_RECT.copy()
+
+        ### store collision method of area for quick access
+        self.colliderect = self.area.colliderect
+
+        ### queue for surfaces blitted in batches, and its method
+        ### for submitting them, for quick access
+        self.render_queue = RenderQueue(SCREEN)
+        self.submit = self.render_queue.submit
+
+    def reset(self):
+        """Place camera back on the origin of the level."""
+        self.area.topleft = (0, 0)
+
+    def move(self, dx, dy):
+        """Move camera over the level by the given amounts."""
+        self.area.move_ip(dx, dy)
+
+    def get_screen_rect(self, rect):
+        """Return copy of rect in level coordinates moved to the screen."""
+        area = self.area
+        return rect.move(-area.x, -area.y)
+
+    def blit(self, surf, rect):
+        """Blit surface on screen at rect in level coordinates."""
+        area = self.area
+        blit_on_screen(surf, (rect.x - area.x, rect.y - area.y))
+
+    def queue_blit(self, surf, rect):
+        """Queue surface to be blitted at rect in level coordinates.
+
+        Queued surfaces are only blitted when flush() is called.
+        """
+        area = self.area
+        self.submit((surf, (rect.x - area.x, rect.y - area.y)))
+
+    def flush(self):
+        """Blit queued surfaces on screen, in the order queued."""
+        self.render_queue.flush()
+
+
+CAMERA = Camera()
+
+blit_on_level = CAMERA.queue_blit if BATCH_LEVEL_DRAWING else CAMERA.blit
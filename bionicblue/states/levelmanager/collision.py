@@ -0,0 +1,101 @@
+"""Facility for broad-phase collision detection in the level.
+
+Once per frame, right after the level manager finds which
+blocks and actors are on the screen, they are indexed in
+fine-grained grids, so that collision queries only check the
+objects near the rect being tested, instead of every object
+on the screen.
+"""
+
+### local imports
+
+from ...config import BLOCKS_ON_SCREEN, ACTORS_ON_SCREEN
+
+from ...ourstdlibs.spatialgrid import SpatialGrid
+
+
+
+### width and height of cells of broad-phase grids; small enough
+### for each cell to hold only a few objects
+CELL_SIZE = 32
+
+BLOCKS_BROAD_PHASE = SpatialGrid(CELL_SIZE)
+ACTORS_BROAD_PHASE = SpatialGrid(CELL_SIZE)
+
+### actors touching the player in the current frame
+PLAYER_CONTACTS = set()
+
+
+def update_broad_phase(player):
+    """Index objects on the screen and find player contacts.
+
+    Must be called once per frame, after the objects on the
+    screen are known.
+    """
+    for broad_phase, objs in (
+        (BLOCKS_BROAD_PHASE, BLOCKS_ON_SCREEN),
+        (ACTORS_BROAD_PHASE, ACTORS_ON_SCREEN),
+    ):
+
+        broad_phase.clear()
+
+        for obj in objs:
+            broad_phase.add(obj)
+
+    ###
+
+    PLAYER_CONTACTS.clear()
+
+    PLAYER_CONTACTS.update(
+        actor
+        for _, actor in get_collision_pairs((player,), ACTORS_BROAD_PHASE)
+    )
+
+
+def get_colliding_objects(rect, broad_phase):
+    """Return list of objects in broad phase colliding with rect."""
+
+    colliderect = rect.colliderect
+
+    return [
+        obj
+        for obj in broad_phase.query(rect)
+        if colliderect(obj.rect)
+    ]
+
+
+def get_colliding_blocks(rect):
+    """Return list of blocks on the screen colliding with rect."""
+    return get_colliding_objects(rect, BLOCKS_BROAD_PHASE)
+
+
+def get_colliding_actors(rect):
+    """Return list of actors on the screen colliding with rect."""
+    return get_colliding_objects(rect, ACTORS_BROAD_PHASE)
+
+
+def get_collision_pairs(objs, broad_phase):
+    """Return list of (obj, other) pairs of colliding objects.
+
+    objs (iterable)
+        objects with a rect, for which we want to find the
+        objects from the broad phase colliding with them.
+    broad_phase (ourstdlibs.spatialgrid.SpatialGrid instance)
+        broad phase whose objects are checked for collision.
+    """
+    query = broad_phase.query
+
+    pairs = []
+
+    for obj in objs:
+
+        rect = obj.rect
+        colliderect = rect.colliderect
+
+        pairs.extend(
+            (obj, other)
+            for other in query(rect)
+            if colliderect(other.rect)
+        )
+
+    return pairs
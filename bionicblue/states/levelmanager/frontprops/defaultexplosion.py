@@ -1,36 +1,55 @@
-
-### standard library import
-from functools import partial
-
-
 ### local imports
 
-from ....config import append_task, FRONT_PROPS, SOUND_MAP
+from ....config import (
+    append_task,
+    FRONT_PROPS,
+    SOUND_MAP,
+    EXPLOSION_POOL_CAPACITY,
+)
+
+from ....ourstdlibs.objectpool import ObjectPool
 
 from ....ani2d.player import AnimationPlayer2D
 
+from ..camera import blit_on_level
+
 
 class DefaultExplosion:
 
-    def __init__(self, pos_name, pos_value):
+    def __init__(self):
 
         self.name = 'explosion'
 
         self.aniplayer = (
             AnimationPlayer2D(
-                self, self.name, 'default_explosion', pos_name, pos_value
+                self, self.name, 'default_explosion',
+                blit_surface=blit_on_level,
             )
         )
 
+    def reset(self, pos_name, pos_value):
+
+        self.aniplayer.switch_animation('default_explosion')
+        setattr(self.rect, pos_name, pos_value)
+
         SOUND_MAP['default_explosion.wav'].play()
 
     def update(self):
 
-        if self.aniplayer.main_timing.peek_loops_no(1) == 1:
+        if self.aniplayer.peek_loops_no(1) == 1:
+            append_task(self.remove)
 
-            append_task(
-                partial(FRONT_PROPS.remove, self)
-            )
+    def remove(self):
+
+        FRONT_PROPS.remove(self)
+        EXPLOSION_POOL.release(self)
 
     def draw(self):
         self.aniplayer.draw()
+
+
+### explosions are reused, rather than created for each one
+
+EXPLOSION_POOL = ObjectPool(DefaultExplosion, EXPLOSION_POOL_CAPACITY)
+
+get_default_explosion = EXPLOSION_POOL.acquire
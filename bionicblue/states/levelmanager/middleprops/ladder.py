@@ -7,10 +7,10 @@ from pygame import Surface
 
 from ....config import SURF_MAP
 
-from ....pygamesetup.constants import blit_on_screen
-
 from ....surfsman import get_larger_surf_by_repeating
 
+from ..camera import blit_on_level
+
 
 class Ladder:
 
@@ -37,4 +37,4 @@ class Ladder:
     def update(self): pass
 
     def draw(self):
-        blit_on_screen(self.image, self.rect)
+        blit_on_level(self.image, self.rect)
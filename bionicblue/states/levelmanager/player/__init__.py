@@ -9,7 +9,6 @@ from ....config import (
     REFS,
     SOUND_MAP,
     MIDDLE_PROPS_ON_SCREEN,
-    BLOCKS_ON_SCREEN,
 )
 
 from ....constants import (
@@ -20,12 +19,7 @@ from ....constants import (
     FULL_CHARGE_FRAMES,
 )
 
-from ....pygamesetup.constants import (
-    GENERAL_NS,
-    SCREEN_RECT,
-    SCREEN,
-    blit_on_screen,
-)
+from ....pygamesetup.constants import GENERAL_NS, SCREEN_RECT
 
 from ....ourstdlibs.behaviour import do_nothing
 
@@ -33,6 +27,10 @@ from ....ourstdlibs.behaviour import do_nothing
 
 from ....ani2d.player import AnimationPlayer2D
 
+from ..camera import blit_on_level
+
+from ..collision import get_colliding_blocks
+
 from .healthcolumn import HealthColumn
 
 
@@ -78,12 +76,15 @@ class Player(
         self.ladder = None
 
         self.death_rings_aniplayer = (
-            AnimationPlayer2D(self, 'death_rings', 'expanding')
+            AnimationPlayer2D(
+                self, 'death_rings', 'expanding', blit_surface=blit_on_level,
+            )
         )
 
         self.blue_shooter_man_aniplayer = (
             AnimationPlayer2D(
-                self, 'blue_shooter_man', 'teleporting', 'center', (SCREEN_RECT.centerx, -122)
+                self, 'blue_shooter_man', 'teleporting', 'center', (SCREEN_RECT.centerx, -122),
+                blit_surface=blit_on_level,
             )
         )
 
@@ -94,6 +95,9 @@ class Player(
 
         self.last_shot = self.last_damage = self.charge_start = 0
 
+        ### whether the charge is full (and its sound is looping)
+        self.fully_charged = False
+
         ###
 
         self.x_speed = 0
@@ -134,19 +138,17 @@ class Player(
 
         rect = self.rect
 
-        for block in BLOCKS_ON_SCREEN:
-
-            if block.colliderect(rect):
+        for block in get_colliding_blocks(rect):
 
-                if rect.left < block.rect.left:
-                    rect.right = block.rect.left
+            if rect.left < block.rect.left:
+                rect.right = block.rect.left
 
-                else:
-                    rect.left = block.rect.right
+            else:
+                rect.left = block.rect.right
 
-                x_speed = 0
+            x_speed = 0
 
-                break
+            break
 
     def react_to_gravity(self):
 
@@ -162,21 +164,19 @@ class Player(
 
         self.midair = True
 
-        for block in BLOCKS_ON_SCREEN:
-
-            if block.colliderect(rect):
+        for block in get_colliding_blocks(rect):
 
-                if rect.bottom < block.rect.bottom:
+            if rect.bottom < block.rect.bottom:
 
-                    rect.bottom = block.rect.top
-                    self.midair = False
+                rect.bottom = block.rect.top
+                self.midair = False
 
-                else:
-                    rect.top = block.rect.bottom
+            else:
+                rect.top = block.rect.bottom
 
-                y_speed = 0
+            y_speed = 0
 
-                break
+            break
 
         self.y_speed = y_speed
 
@@ -359,6 +359,7 @@ class Player(
                 )
 
                 self.draw_charging_fx = do_nothing
+                self.fully_charged = True
                 SOUND_MAP['blue_shooter_man_full_charge.wav'].play(-1)
 
         elif diff >= MIDDLE_CHARGE_FRAMES:
@@ -391,6 +392,7 @@ class Player(
             self.aniplayer.restore_surface_cycling()
 
         self.charge_start = 0
+        self.fully_charged = False
         SOUND_MAP['blue_shooter_man_full_charge.wav'].stop()
         SOUND_MAP['blue_shooter_man_middle_charge.wav'].stop()
         self.draw_charging_fx = do_nothing
@@ -401,6 +403,21 @@ class Player(
         elif diff >= MIDDLE_CHARGE_FRAMES:
             return 'middle'
 
+    def restore_charge_sound(self):
+        """Loop full charge sound if fully charged, stop it otherwise.
+
+        Used when the player is put in a state reached without
+        playing sounds, like when frames are simulated by the
+        play mode.
+        """
+        sound = SOUND_MAP['blue_shooter_man_full_charge.wav']
+
+        if not self.fully_charged:
+            sound.stop()
+
+        elif not sound.get_num_channels():
+            sound.play(-1)
+
     def die(self):
 
         self.stop_charging()
@@ -16,12 +16,12 @@ from pygame.math import Vector2
 
 from ....config import PARTICLES_DIR, COLORKEY
 
-from ....pygamesetup.constants import blit_on_screen
-
 from ....ourstdlibs.pyl import load_pyl
 
 from ....ourstdlibs.wdeque.main import WalkingDeque
 
+from ..camera import blit_on_level
+
 
 rect = Rect(0, 0, 0, 0)
 surfs = []
@@ -80,7 +80,7 @@ surfs.clear()
 def draw_charging_particles():
 
     rect.center = draw_charging_particles.player.rect.center
-    blit_on_screen(surfs_wdeque[0], rect)
+    blit_on_level(surfs_wdeque[0], rect)
     walk_surfs(1)
 
 draw_charging_particles.restore_animation = surfs_wdeque.restore_walking
@@ -10,7 +10,7 @@ from pygame.draw import rect as draw_rect, circle as draw_circle
 
 from ....config import SURF_MAP
 
-from ....pygamesetup.constants import blit_on_screen
+from ....pygamesetup.constants import SCREEN, blit_on_screen
 
 
 
@@ -58,13 +58,20 @@ class HealthColumn:
         draw_rect(image, 'grey80', hbg.inflate(4, 4))
         draw_circle(image, 'grey80', head_rect.center, 7)
 
-        draw_rect(image, 'brown', hbg)
-        draw_rect(image, 'gold', hfg)
-
         image.blit(self.head_surf, head_rect)
 
         self.rect.bottomleft = (3, 74)
 
+        ### the health bars are drawn straight on the screen, rather
+        ### than on the image, so the image never changes and the
+        ### bars only depend on the rects (which is what allows
+        ### level snapshots to restore them)
+
+        offset = self.rect.topleft
+
+        for rect in (hbg, hfg):
+            rect.move_ip(offset)
+
     def damage(self, amount):
 
         self.health += -amount
@@ -72,11 +79,12 @@ class HealthColumn:
         self.health_fg.height = max(self.health, 0)
         self.health_fg.bottom = self.health_bg.bottom
 
-        draw_rect(self.image, 'brown', self.health_bg)
-        draw_rect(self.image, 'gold', self.health_fg)
-
     def is_depleted(self):
         return self.health <= 0
 
     def draw(self):
+
         blit_on_screen(self.image, self.rect)
+
+        draw_rect(SCREEN, 'brown', self.health_bg)
+        draw_rect(SCREEN, 'gold', self.health_fg)
@@ -12,23 +12,26 @@ from pygame import Surface
 from .....config import (
     SOUND_MAP,
     PROJECTILES,
-    ACTORS_ON_SCREEN,
-    BLOCKS_ON_SCREEN,
+    CHARGED_SHOT_POOL_CAPACITY,
     append_task,
 )
 
-from .....pygamesetup.constants import SCREEN_RECT, blit_on_screen
+from .....ourstdlibs.objectpool import ObjectPool
 
 from .....constants import CHARGED_SHOT_SPEED
 
 from .....ani2d.player import AnimationPlayer2D
 
+from ...camera import CAMERA, blit_on_level
+
+from ...collision import get_colliding_actors, get_colliding_blocks
+
 
 class ChargedShot:
 
-    def __init__(self, charge_type, x_orientation, pos_name, pos_value):
+    def __init__(self, charge_type):
 
-        self.x_speed = x_orientation * CHARGED_SHOT_SPEED
+        self.charge_type = charge_type
 
         animation_data_key = (
             'full_charged_shot'
@@ -36,14 +39,13 @@ class ChargedShot:
             else 'middle_charged_shot'
         )
 
-        initial_animation = (
-            'appearing_right'
-            if x_orientation > 0
-            else 'appearing_left'
-        )
-
         self.aniplayer = (
-            AnimationPlayer2D(self, animation_data_key, initial_animation)
+            AnimationPlayer2D(
+                self,
+                animation_data_key,
+                'appearing_right',
+                blit_surface=blit_on_level,
+            )
         )
 
         self.firing_sound_name = (
@@ -59,18 +61,33 @@ class ChargedShot:
 
         self.damage_to_inflict = 5 if charge_type == 'full' else 3
 
+    def reset(self, x_orientation, pos_name, pos_value):
+
+        self.x_speed = x_orientation * CHARGED_SHOT_SPEED
+
+        self.aniplayer.switch_animation(
+            'appearing_right'
+            if x_orientation > 0
+            else 'appearing_left'
+        )
+
         setattr(self.rect, pos_name, pos_value)
 
         self.update = self.appearing_update
 
     def trigger_kill(self):
-        append_task(partial(PROJECTILES.remove, self))
+        append_task(self.remove)
+
+    def remove(self):
+
+        PROJECTILES.remove(self)
+        CHARGED_SHOT_POOLS[self.charge_type].release(self)
 
     def appearing_update(self):
 
         ap = self.aniplayer
 
-        if ap.main_timing.peek_loops_no(1) == 1:
+        if ap.peek_loops_no(1) == 1:
 
             self.update = self.moving_update
 
@@ -84,31 +101,25 @@ class ChargedShot:
 
     def moving_update(self):
         
-        colliderect = self.rect.colliderect
-
-        if not colliderect(SCREEN_RECT):
+        if not self.rect.colliderect(CAMERA.area):
             self.trigger_kill()
             return
 
-        for actor in ACTORS_ON_SCREEN:
-
-            if colliderect(actor.rect):
+        for actor in get_colliding_actors(self.rect):
 
-                if actor.health > 0:
-
-                    try: actor.damage(self.damage_to_inflict)
-                    except AttributeError:
-                        pass
+            if actor.health > 0:
 
-                    if actor.health > 0:
-                        self.trigger_disappearing(actor)
-                        return
+                try: actor.damage(self.damage_to_inflict)
+                except AttributeError:
+                    pass
 
-        for block in BLOCKS_ON_SCREEN:
+                if actor.health > 0:
+                    self.trigger_disappearing(actor)
+                    return
 
-            if colliderect(block.rect):
-                self.trigger_disappearing(block)
-                return
+        for block in get_colliding_blocks(self.rect):
+            self.trigger_disappearing(block)
+            return
 
         self.rect.x += self.x_speed
 
@@ -134,8 +145,33 @@ class ChargedShot:
 
         ap = self.aniplayer
 
-        if ap.main_timing.peek_loops_no(1) == 1:
+        if ap.peek_loops_no(1) == 1:
             self.trigger_kill()
 
     def draw(self):
         self.aniplayer.draw()
+
+
+### shots are reused, rather than created for each shot; since the
+### type of charge determines the animation used, each type has its
+### own pool
+
+CHARGED_SHOT_POOLS = {
+
+    charge_type: ObjectPool(
+        partial(ChargedShot, charge_type),
+        CHARGED_SHOT_POOL_CAPACITY,
+    )
+
+    for charge_type in ('middle', 'full')
+
+}
+
+def get_charged_shot(charge_type, x_orientation, pos_name, pos_value):
+    """Return charged shot of given type from its pool."""
+
+    return CHARGED_SHOT_POOLS[charge_type].acquire(
+        x_orientation,
+        pos_name,
+        pos_value,
+    )
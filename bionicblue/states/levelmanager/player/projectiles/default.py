@@ -1,8 +1,4 @@
 
-### standard library import
-from functools import partial
-
-
 ### third-party import
 from pygame import Surface
 
@@ -12,12 +8,15 @@ from pygame import Surface
 from .....config import (
     SOUND_MAP,
     PROJECTILES,
-    ACTORS_ON_SCREEN,
-    BLOCKS_ON_SCREEN,
+    DEFAULT_PROJECTILE_POOL_CAPACITY,
     append_task,
 )
 
-from .....pygamesetup.constants import SCREEN_RECT, blit_on_screen
+from .....ourstdlibs.objectpool import ObjectPool
+
+from ...camera import CAMERA, blit_on_level
+
+from ...collision import get_colliding_actors, get_colliding_blocks
 
 
 class DefaultProjectile:
@@ -27,46 +26,57 @@ class DefaultProjectile:
 
     abs_speed = 10
 
-    def __init__(self, x_orientation, pos_name, pos_value):
-
-        self.x_speed = x_orientation * self.abs_speed
+    def __init__(self):
 
         self.image = self.surf
         self.rect = self.image.get_rect()
+
+    def reset(self, x_orientation, pos_name, pos_value):
+
+        self.x_speed = x_orientation * self.abs_speed
+
         setattr(self.rect, pos_name, pos_value)
         SOUND_MAP['default_projectile_shot.wav'].play()
 
     def trigger_kill(self):
-        append_task(partial(PROJECTILES.remove, self))
+        append_task(self.remove)
+
+    def remove(self):
+
+        PROJECTILES.remove(self)
+        DEFAULT_PROJECTILE_POOL.release(self)
 
     def update(self):
 
         self.rect.x += self.x_speed
-        colliderect = self.rect.colliderect
 
-        if not colliderect(SCREEN_RECT):
+        if not self.rect.colliderect(CAMERA.area):
             self.trigger_kill()
             return
 
-        for actor in ACTORS_ON_SCREEN:
-
-            if colliderect(actor.rect):
-
-                if actor.health > 0:
+        for actor in get_colliding_actors(self.rect):
 
-                    try: actor.damage(1)
-                    except AttributeError:
-                        pass
+            if actor.health > 0:
 
-                    self.trigger_kill()
-                    SOUND_MAP['default_projectile_hit.wav'].play()
-                    return
+                try: actor.damage(1)
+                except AttributeError:
+                    pass
 
-        for block in BLOCKS_ON_SCREEN:
-
-            if colliderect(block.rect):
                 self.trigger_kill()
+                SOUND_MAP['default_projectile_hit.wav'].play()
                 return
 
+        if get_colliding_blocks(self.rect):
+            self.trigger_kill()
+
     def draw(self):
-        blit_on_screen(self.image, self.rect)
+        blit_on_level(self.image, self.rect)
+
+
+### projectiles are reused, rather than created for each shot
+
+DEFAULT_PROJECTILE_POOL = (
+    ObjectPool(DefaultProjectile, DEFAULT_PROJECTILE_POOL_CAPACITY)
+)
+
+get_default_projectile = DEFAULT_PROJECTILE_POOL.acquire
@@ -46,12 +46,10 @@ class TeleportingIn:
 
         if ap.anim_name == 'materializing':
 
-            main_timing = ap.main_timing
-
-            if main_timing.get_original_index(0) == 0:
+            if ap.get_main_index() == 0:
                 SOUND_MAP['blue_shooter_man_materialization.wav'].play()
 
-            if main_timing.peek_loops_no(1) == 1:
+            if ap.peek_loops_no(1) == 1:
 
                 self.set_state('idle_right')
                 self.aniplayer.switch_animation('idle_right')
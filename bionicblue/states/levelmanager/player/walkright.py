@@ -37,8 +37,8 @@ from ....pygamesetup.gamepaddirect import GAMEPAD_NS, setup_gamepad_if_existent
 
 from ....userprefsman.main import KEYBOARD_CONTROLS, GAMEPAD_CONTROLS
 
-from .projectiles.default import DefaultProjectile
-from .projectiles.chargedshot import ChargedShot
+from .projectiles.default import get_default_projectile
+from .projectiles.chargedshot import get_charged_shot
 
 
 
@@ -177,7 +177,7 @@ class WalkRight:
         pos_value = self.rect.move(2, -2).midright
 
         PROJECTILES.add(
-            DefaultProjectile(
+            get_default_projectile(
                 x_orientation=1,
                 pos_name='center',
                 pos_value=pos_value,
@@ -192,7 +192,7 @@ class WalkRight:
         pos_value = self.rect.move(10, -2).midright
 
         PROJECTILES.add(
-            ChargedShot(
+            get_charged_shot(
                 charge_type,
                 x_orientation=1,
                 pos_name='center',
@@ -8,12 +8,12 @@ from pygame.draw import rect as draw_rect
 
 ### local imports
 
-from ...pygamesetup.constants import blit_on_screen
-
 from ...textman import render_text
 
 from ...ourstdlibs.behaviour import do_nothing
 
+from .camera import blit_on_level
+
 
 def get_message_surf():
 
@@ -61,4 +61,4 @@ message.image = get_message_surf()
 message.rect = message.image.get_rect()
 message.rect.move_ip(1026, 50)
 message.update = do_nothing
-message.draw = lambda: blit_on_screen(message.image, message.rect)
+message.draw = lambda: blit_on_level(message.image, message.rect)
@@ -0,0 +1,205 @@
+"""Facility for taking snapshots of the level and simulating frames.
+
+Snapshots store the state of everything that changes during
+gameplay in the level (the level manager and its player, the
+level objects and the collections holding them, the camera,
+scheduled callbacks, object pools, etc.), so restoring one puts
+the level back exactly as it was when the snapshot was taken.
+
+They are used by the play mode to seek to any frame of a recorded
+session without replaying it from the beginning: the nearest
+snapshot before the frame is restored and the remaining frames
+are simulated as fast as possible.
+"""
+
+### third-party imports
+
+from pygame import Rect, FRect
+
+from pygame.math import Vector2
+
+
+### local imports
+
+from ...config import (
+    REFS,
+    SOUND_MAP,
+    ANIM_DATA_MAP,
+    BACK_PROPS, BACK_PROPS_ON_SCREEN, BACK_PROPS_GRID,
+    MIDDLE_PROPS, MIDDLE_PROPS_ON_SCREEN, MIDDLE_PROPS_GRID,
+    BLOCKS, BLOCKS_ON_SCREEN, BLOCKS_GRID,
+    ACTORS, ACTORS_ON_SCREEN, ACTORS_GRID,
+    PROJECTILES,
+    FRONT_PROPS,
+    TASKS,
+    FRAME_SCHEDULER,
+)
+
+from ...pygamesetup import SERVICES_NS
+
+from ...pygamesetup.constants import GENERAL_NS
+
+from ...ourstdlibs.behaviour import do_nothing
+
+from ...ourstdlibs.statesnapshot import StateSnapshot, register_type
+
+from ...ourstdlibs.wdeque.main import WalkingDeque
+
+from .camera import CAMERA
+
+from .collision import BLOCKS_BROAD_PHASE, ACTORS_BROAD_PHASE, PLAYER_CONTACTS
+
+from .player.chargingparticles import surfs_wdeque
+
+from .player.projectiles.default import DEFAULT_PROJECTILE_POOL
+
+from .player.projectiles.chargedshot import CHARGED_SHOT_POOLS
+
+from .frontprops.defaultexplosion import EXPLOSION_POOL
+
+
+### rects and vectors are changed in place all the time
+
+def set_rect_state(rect, state):
+    rect.update(*state)
+
+def set_vector_state(vector, state):
+    vector.update(state)
+
+register_type(Rect, tuple, set_rect_state)
+register_type(FRect, tuple, set_rect_state)
+register_type(Vector2, tuple, set_vector_state)
+
+
+### walking deques can't be emptied, but their items only ever
+### rotate, so walking them back to their former rotation suffices
+
+def get_walking_state(wdeque):
+    return (wdeque.total_walking,)
+
+def set_walking_state(wdeque, state):
+    wdeque.walk(state[0] - wdeque.total_walking)
+
+register_type(WalkingDeque, get_walking_state, set_walking_state)
+
+
+### collections holding level objects and other gameplay data
+
+LEVEL_COLLECTIONS = (
+    BACK_PROPS, BACK_PROPS_ON_SCREEN, BACK_PROPS_GRID,
+    MIDDLE_PROPS, MIDDLE_PROPS_ON_SCREEN, MIDDLE_PROPS_GRID,
+    BLOCKS, BLOCKS_ON_SCREEN, BLOCKS_GRID,
+    ACTORS, ACTORS_ON_SCREEN, ACTORS_GRID,
+    PROJECTILES,
+    FRONT_PROPS,
+    TASKS,
+    FRAME_SCHEDULER,
+    BLOCKS_BROAD_PHASE,
+    ACTORS_BROAD_PHASE,
+    PLAYER_CONTACTS,
+    surfs_wdeque,
+    DEFAULT_PROJECTILE_POOL,
+    CHARGED_SHOT_POOLS,
+    EXPLOSION_POOL,
+)
+
+### items of animation data which change during gameplay; the
+### other ones (surfaces, timing, etc.) never change after the
+### animation is processed, so they are left out of snapshots
+CHANGING_ANIMATION_DATA_KEYS = frozenset(('shared_clocks',))
+
+
+def take_level_snapshot(*extra_roots):
+    """Return snapshot of the level.
+
+    extra_roots (objects)
+        other objects to store in the snapshot, like the data
+        the play mode uses to play the session.
+    """
+    ### the queue of the camera is always empty between frames,
+    ### so it is left out along with the data of animations which
+    ### never changes
+
+    excluded = [CAMERA.render_queue]
+
+    for anim_data in ANIM_DATA_MAP.values():
+
+        excluded.append(anim_data)
+
+        excluded.extend(
+            value
+            for key, value in anim_data.items()
+            if key not in CHANGING_ANIMATION_DATA_KEYS
+        )
+
+    return StateSnapshot(
+
+        (
+            REFS.states.level_manager,
+            CAMERA,
+            *LEVEL_COLLECTIONS,
+            *extra_roots,
+        ),
+
+        excluded,
+
+    )
+
+
+class MutedSound:
+    """Stands in for every sound while frames are simulated."""
+
+    def play(self, *args, **kwargs):
+        pass
+
+    def stop(self):
+        pass
+
+MUTED_SOUND = MutedSound()
+
+
+def simulate_level_frames(frame_indices):
+    """Run the level for each given frame without showing it.
+
+    Frames are still drawn, since drawing advances animations,
+    which affects gameplay, but surfaces aren't actually blitted,
+    the screen isn't updated and sounds aren't played.
+    """
+    level_manager = REFS.states.level_manager
+    render_queue = CAMERA.render_queue
+
+    ### discard queued surfaces instead of blitting them and don't
+    ### update the screen
+
+    render_queue.flush = render_queue.clear
+
+    update_screen = SERVICES_NS.update_screen
+    SERVICES_NS.update_screen = do_nothing
+
+    ### mute sounds, so sounds of all simulated frames aren't played
+    ### at once, while those already playing keep playing
+
+    sounds = SOUND_MAP.copy()
+    SOUND_MAP.update(dict.fromkeys(sounds, MUTED_SOUND))
+
+    try:
+
+        for frame_index in frame_indices:
+
+            GENERAL_NS.frame_index = frame_index
+
+            level_manager.control()
+            level_manager.update()
+            level_manager.draw()
+
+    finally:
+
+        del render_queue.flush
+        SERVICES_NS.update_screen = update_screen
+
+        SOUND_MAP.update(sounds)
+
+        ### the level may have been restored to (or simulated up to)
+        ### a point where the looping sound of the charge must be
+        ### playing or not, regardless of whether it is
+        level_manager.player.restore_charge_sound()
@@ -273,7 +273,7 @@ class MainMenu:
 
         ap = REFS.middle_shot.ap
 
-        if ap.main_timing.peek_loops_no(1) == 1:
+        if ap.peek_loops_no(1) == 1:
 
             ap.switch_animation('idle_right')
             SOUND_MAP['middle_charged_shot_shot.wav'].play()
@@ -1,7 +1,14 @@
 
 ### standard library imports
+
 from itertools import repeat, chain
 
+from functools import partial
+
+from concurrent.futures import ThreadPoolExecutor
+
+from queue import SimpleQueue, Empty
+
 
 ### third-party imports
 
@@ -15,6 +22,8 @@ from pygame.display import update
 
 from pygame.image import load as load_image
 
+from pygame.draw import rect as draw_rect
+
 from pygame.mixer import Sound
 
 
@@ -30,19 +39,34 @@ from ..config import (
     NO_ALPHA_IMAGES_DIR,
     ANIMATIONS_DIR,
     SOUNDS_DIR,
+    LAZY_ANIMATION_LOADING,
+    LOAD_RESOURCES_IN_PARALLEL,
+    RESOURCE_LOADING_WORKERS,
     quit_game,
 )
 
 from ..pygamesetup import SERVICES_NS
 
-from ..pygamesetup.constants import FPS, WHITE_BG, SCREEN_RECT, blit_on_screen
+from ..pygamesetup.constants import (
+    FPS,
+    WHITE_BG,
+    SCREEN,
+    SCREEN_RECT,
+    blit_on_screen,
+)
 
 from ..textman import render_text
 
 from ..surfsman import combine_surfaces
 
 from ..ani2d.player import AnimationPlayer2D
-from ..ani2d.processing import process_animation_data
+from ..ani2d.processing import (
+    load_animation_data,
+    get_animation_data_size,
+    is_animation_data_in_use,
+    load_animation_sources,
+    process_animation_data,
+)
 
 from ..classes2d.single import UIObject2D
 
@@ -54,6 +78,10 @@ ALLOWED_SOUND_FILE_EXTENSIONS = frozenset(('.ogg', '.wav'))
 
 MSECS_PER_FRAME = 1000 / FPS
 
+PROGRESS_BAR_RECT = SCREEN_RECT.inflate(-20, 0)
+PROGRESS_BAR_RECT.h = 6
+PROGRESS_BAR_RECT.top = 30
+
 
 
 ### gather animation resources
@@ -66,38 +94,85 @@ class ResourceLoader:
             render_text('loading...', 'regular', 16, 0, 'black', 'white')
         )
 
-        self.resources_to_process = chain(
-
-            zip(
-                repeat(SURF_MAP),
-                ALPHA_IMAGES_DIR.iterdir(),
-                repeat(load_alpha_image_from_filepath),
-            ),
-
-            zip(
-                repeat(SURF_MAP),
-                NO_ALPHA_IMAGES_DIR.iterdir(),
-                repeat(load_image_from_filepath),
-            ),
-
-            zip(
-                repeat(ANIM_DATA_MAP),
-                (path for path in ANIMATIONS_DIR.iterdir() if path.is_dir()),
-                repeat(load_anim_from_dir),
-            ),
-
-            zip(
-                repeat(SOUND_MAP),
-                (
-                    path for path in SOUNDS_DIR.iterdir()
-                    if path.is_file()
-                    if path.suffix.lower() in ALLOWED_SOUND_FILE_EXTENSIONS
+        ### set how animations missing from their map are processed,
+        ### measured and checked for usage
+
+        ANIM_DATA_MAP.set_value_loader(
+            load_animation_data,
+            get_animation_data_size,
+            is_animation_data_in_use,
+        )
+
+        ### each resource is listed alongside the map wherein to store
+        ### it and two operations: one that reads its data without
+        ### creating surfaces, so it can be used from worker threads,
+        ### and another that finishes the resource on the main thread
+
+        resources = list(
+
+            chain(
+
+                zip(
+                    repeat(SURF_MAP),
+                    ALPHA_IMAGES_DIR.iterdir(),
+                    repeat(read_image_from_filepath),
+                    repeat(finish_alpha_image),
+                ),
+
+                zip(
+                    repeat(SURF_MAP),
+                    NO_ALPHA_IMAGES_DIR.iterdir(),
+                    repeat(read_image_from_filepath),
+                    repeat(finish_image),
                 ),
-                repeat(load_sound_from_filepath),
-            ),
+
+                ## when animations are loaded lazily, they are processed
+                ## only when first requested, so they aren't listed here
+
+                zip(
+                    repeat(ANIM_DATA_MAP),
+                    (
+                        ()
+                        if LAZY_ANIMATION_LOADING
+                        else (
+                            path for path in ANIMATIONS_DIR.iterdir()
+                            if path.is_dir()
+                        )
+                    ),
+                    repeat(load_animation_sources),
+                    repeat(process_animation_data),
+                ),
+
+                zip(
+                    repeat(SOUND_MAP),
+                    (
+                        path for path in SOUNDS_DIR.iterdir()
+                        if path.is_file()
+                        if path.suffix.lower() in ALLOWED_SOUND_FILE_EXTENSIONS
+                    ),
+                    repeat(read_nothing),
+                    repeat(load_sound_from_filepath),
+                ),
+
+            )
 
         )
 
+        self.resources_to_process = iter(resources)
+
+        self.no_of_resources = len(resources)
+        self.no_of_finished_resources = 0
+
+        ### define how resources are processed
+
+        self.process_next_resource = (
+
+            self.start_processing_in_parallel
+            if LOAD_RESOURCES_IN_PARALLEL
+
+            else self.process_next_resource_serially
+
+        )
 
     def control(self):
 
@@ -106,24 +181,85 @@ class ResourceLoader:
             if event.type == QUIT:
                 quit_game()
 
-    def update(self):
+    def process_next_resource_serially(self):
+        """Read and finish next resource on the main thread."""
+
+        a_map, filepath, read_op, finish_op = next(self.resources_to_process)
+        a_map[filepath.name] = finish_op(filepath, read_op(filepath))
+        self.no_of_finished_resources += 1
+
+    def start_processing_in_parallel(self):
+        """Submit reading of all resources to worker threads.
+
+        As each resource is read, it is put in a completion queue,
+        from which the main thread finishes it.
+        """
+        self.executor = ThreadPoolExecutor(RESOURCE_LOADING_WORKERS)
+        self.completion_queue = SimpleQueue()
 
-        now = get_msecs()
+        for a_map, filepath, read_op, finish_op in self.resources_to_process:
 
-        resources_to_process = self.resources_to_process
+            future = self.executor.submit(read_op, filepath)
+
+            future.add_done_callback(
+                partial(
+                    self.put_read_resource,
+                    a_map,
+                    filepath,
+                    finish_op,
+                )
+            )
+
+        self.process_next_resource = self.finish_next_resource_read
+        self.finish_next_resource_read()
+
+    def put_read_resource(self, a_map, filepath, finish_op, future):
+        """Put resource in completion queue once read.
+
+        Called from the worker thread which read the resource.
+        """
+        self.completion_queue.put((a_map, filepath, finish_op, future))
+
+    def finish_next_resource_read(self):
+        """Finish next resource read by the worker threads.
+
+        Waits for a resource to be read, but no longer than the
+        time remaining in the current frame.
+        """
+        if self.no_of_finished_resources == self.no_of_resources:
+
+            self.executor.shutdown()
+            raise StopIteration
+
+        ###
+
+        remaining_msecs = MSECS_PER_FRAME - (get_msecs() - self.now)
 
         try:
+            a_map, filepath, finish_op, future = self.completion_queue.get(
+                timeout=max(remaining_msecs, 0) / 1000
+            )
 
-            while True:
+        except Empty:
+            return
 
-                a_map, filepath, processing_op = next(resources_to_process)
-                a_map[filepath.name] = processing_op(filepath)
+        ### calling result() raises any error which happened while
+        ### reading the resource
+        a_map[filepath.name] = finish_op(filepath, future.result())
 
-                if (get_msecs() - now) >= MSECS_PER_FRAME:
+        self.no_of_finished_resources += 1
+
+    def update(self):
 
-                    blit_on_screen(WHITE_BG, (0, 0))
-                    blit_on_screen(self.loading_surf, (10, 10))
+        self.now = now = get_msecs()
 
+        try:
+
+            while True:
+
+                self.process_next_resource()
+
+                if (get_msecs() - now) >= MSECS_PER_FRAME:
                     break
 
         except StopIteration:
@@ -170,26 +306,46 @@ class ResourceLoader:
             raise SwitchStateException(logo_screen)
 
     def draw(self):
+
+        blit_on_screen(WHITE_BG, (0, 0))
+        blit_on_screen(self.loading_surf, (10, 10))
+
+        ### draw progress bar
+
+        progress_rect = PROGRESS_BAR_RECT.copy()
+
+        progress_rect.w = round(
+            progress_rect.w
+            * self.no_of_finished_resources
+            / max(self.no_of_resources, 1)
+        )
+
+        draw_rect(SCREEN, 'dodgerblue', progress_rect)
+        draw_rect(SCREEN, 'black', PROGRESS_BAR_RECT, 1)
+
         update()
 
 
 ### utility functions
 
-def load_alpha_image_from_filepath(filepath):
-    image = load_image(str(filepath)).convert_alpha()
+def read_image_from_filepath(filepath):
+    return load_image(str(filepath))
+
+def read_nothing(filepath):
+    pass
+
+def finish_alpha_image(filepath, image):
+    image = image.convert_alpha()
     surf = Surface(image.get_size()).convert()
     surf.set_colorkey(COLORKEY)
     surf.fill(COLORKEY)
     surf.blit(image, (0, 0))
     return surf
 
-def load_image_from_filepath(filepath):
-    return load_image(str(filepath)).convert()
-
-def load_anim_from_dir(dirpath):
-    return process_animation_data(dirpath)
+def finish_image(filepath, image):
+    return image.convert()
 
-def load_sound_from_filepath(filepath):
+def load_sound_from_filepath(filepath, _):
     sound = Sound(str(filepath))
     sound.set_volume(.2)
     return sound